@@ -0,0 +1,219 @@
+"""Concurrent-session load generator for the app.
+
+Simulates N users on one server process: each session is an in-process
+AppTest instance of app.py driven from its own thread, doing a random walk
+through the sidebar pages and the current page's widgets. All sessions
+share the process-wide caches and figure pools exactly as browser sessions
+on one Streamlit server do. Runs fully offline.
+
+Reports throughput, rerun latency percentiles, RSS growth per session and
+an RSS timeline (sampled in the background), so a steadily climbing RSS
+under constant load is visible. Each run is appended to a JSON-lines file.
+
+Usage::
+
+    python benchmarks/load.py --sessions 8 --duration 60
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+PAGE_SELECT = "Choose a section:"
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Peak rather than current RSS where /proc is unavailable
+    return maxrss / 1024 / 1024 if sys.platform == "darwin" else maxrss / 1024
+
+
+def random_interaction(at, rng, page_switch_prob):
+    """Set one random widget of the session to a random value; returns a short description."""
+    page_select = next(w for w in at.sidebar.selectbox if w.label == PAGE_SELECT)
+    candidates = [w for kind in ("slider", "radio", "checkbox", "number_input")
+                  for w in getattr(at.main, kind)]
+    candidates += [w for w in at.main.selectbox]
+    if not candidates or rng.random() < page_switch_prob:
+        page = rng.choice(page_select.options)
+        page_select.set_value(page)
+        return f"page={page}"
+
+    widget = rng.choice(candidates)
+    kind = type(widget).__name__
+    if kind == "Slider":
+        steps = int(round((widget.max - widget.min) / widget.step))
+        value = widget.min + rng.randint(0, steps) * widget.step
+        value = int(value) if isinstance(widget.value, int) else round(value, 6)
+    elif kind in ("Radio", "Selectbox"):
+        value = rng.choice(widget.options)
+    elif kind == "Checkbox":
+        value = not widget.value
+    else:  # NumberInput: sides up to 100x the default
+        low = widget.min if widget.min is not None else 0.0
+        value = round(rng.uniform(low, low + 100 * max(widget.value, 1.0)), 2)
+    widget.set_value(value)
+    return f"{widget.label}={value}"
+
+
+def _serialize_script_compiles():
+    """Make concurrent AppTest runs compile app.py one at a time.
+
+    Every AppTest run recompiles the script, and ast.parse is not safe to
+    call from several threads at once on CPython 3.11 ("AST constructor
+    recursion depth mismatch"). A real server compiles it once into a
+    shared cache, so this lock only removes a test-harness artefact.
+    """
+    from streamlit.runtime.scriptrunner import script_cache
+
+    get_bytecode = script_cache.ScriptCache.get_bytecode
+    if getattr(get_bytecode, "_serialized", False):
+        return
+    lock = threading.Lock()
+
+    def locked(self, script_path):
+        with lock:
+            return get_bytecode(self, script_path)
+
+    locked._serialized = True
+    script_cache.ScriptCache.get_bytecode = locked
+
+
+class Session:
+    """One simulated user: an AppTest instance and its latency samples."""
+
+    def __init__(self, index, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.rng = random.Random(seed + index)
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.latencies = []
+        self.errors = []
+        self.at.run()
+
+    def walk(self, deadline, page_switch_prob, think_time, completed):
+        while time.monotonic() < deadline:
+            try:
+                action = random_interaction(self.at, self.rng, page_switch_prob)
+            except StopIteration:
+                self.errors.append("page selector missing from the rendered app")
+                return self
+            start = time.perf_counter()
+            self.at.run()
+            self.latencies.append(time.perf_counter() - start)
+            completed.append(1)
+            if self.at.exception:
+                self.errors.append(f"{action}: {self.at.exception[0].message}")
+            if think_time:
+                time.sleep(self.rng.uniform(0, 2 * think_time))
+        return self
+
+
+def run(sessions, duration, page_switch_prob=0.2, think_time=0.0, sample_interval=1.0, seed=0, timeout=120):
+    import numpy as np
+    from streamlit.testing.v1 import AppTest  # noqa: F401  (imported before the baseline RSS)
+
+    _serialize_script_compiles()
+
+    start_rss = rss_mb()
+    completed = []  # list.append is atomic; len() gives reruns so far
+    timeline = []
+    stop = threading.Event()
+    t0 = time.monotonic()
+
+    def sample():
+        while not stop.wait(sample_interval):
+            timeline.append({"t": round(time.monotonic() - t0, 2), "rss_mb": rss_mb(), "reruns": len(completed)})
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    users = [Session(i, seed, timeout) for i in range(sessions)]
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(u.walk, deadline, page_switch_prob, think_time, completed) for u in users]
+        for future in futures:
+            future.result()
+    elapsed = time.monotonic() - t0
+    stop.set()
+    sampler.join()
+    end_rss = rss_mb()
+
+    ms = np.array([t for u in users for t in u.latencies]) * 1000
+    peak_rss = max([end_rss] + [s["rss_mb"] for s in timeline])
+    result = {
+        "sessions": sessions, "duration_s": elapsed, "reruns": int(ms.size),
+        "throughput_per_s": ms.size / elapsed,
+        "errors": [e for u in users for e in u.errors][:20],
+        "rss_start_mb": start_rss, "rss_peak_mb": peak_rss, "rss_end_mb": end_rss,
+        "rss_growth_per_session_mb": (peak_rss - start_rss) / sessions,
+        "timeline": timeline,
+    }
+    if ms.size:
+        for p in (50, 95, 99):
+            result[f"p{p}_ms"] = float(np.percentile(ms, p))
+        result["max_ms"] = float(ms.max())
+    # Slope over the second half: near zero once caches and pools have filled
+    late = timeline[len(timeline) // 2:]
+    if len(late) >= 2:
+        t = np.array([s["t"] for s in late])
+        rss = np.array([s["rss_mb"] for s in late])
+        result["rss_slope_mb_per_min"] = float(np.polyfit(t, rss, 1)[0] * 60)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated users (default: 8)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load (default: 60)")
+    parser.add_argument("--page-switch-prob", type=float, default=0.2,
+                        help="chance that a step switches page instead of moving a widget (default: 0.2)")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause between a session's interactions in seconds (default: 0)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="RSS sampling period in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "load.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    args = parser.parse_args(argv)
+
+    result = run(args.sessions, args.duration, args.page_switch_prob, args.think_time,
+                 args.sample_interval, args.seed)
+    result["timestamp"] = time.time()
+
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(f"{result['sessions']} sessions, {result['reruns']} reruns in {result['duration_s']:.1f}s "
+          f"({result['throughput_per_s']:.2f} reruns/s)")
+    if result["reruns"]:
+        print(f"latency: p50 {result['p50_ms']:.0f} ms  p95 {result['p95_ms']:.0f} ms  "
+              f"p99 {result['p99_ms']:.0f} ms  max {result['max_ms']:.0f} ms")
+    print(f"RSS: {result['rss_start_mb']:.0f} MB -> peak {result['rss_peak_mb']:.0f} MB "
+          f"({result['rss_growth_per_session_mb']:.1f} MB per session), end {result['rss_end_mb']:.0f} MB")
+    if "rss_slope_mb_per_min" in result:
+        print(f"RSS slope over the second half: {result['rss_slope_mb_per_min']:+.1f} MB/min")
+    for error in result["errors"]:
+        print(f"ERROR: {error}")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Throughput and accuracy check of trigcalc.precision against plain NumPy.
+
+Evaluates sin, cos and tan of N random angles (in degrees, with a share of
+them on or next to multiples of 15°) both with plain NumPy and with the
+bounded evaluation, reports the throughput ratio and how many elements
+were escalated, and checks a sample of the results against the
+high-precision path: every error must be within its bound. Each run is
+appended to a JSON-lines results file; the exit status is non-zero if a
+bound is violated or the slowdown exceeds --max-slowdown.
+
+Usage::
+
+    python benchmarks/precision.py --size 10000000 --max-slowdown 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trigcalc import precision  # noqa: E402
+
+
+def angles(size, rng):
+    """Uniform angles in [-720°, 720°], a tenth of them at or within 1e-9° of multiples of 15°."""
+    a = rng.uniform(-720, 720, size)
+    special = rng.random(size) < 0.1
+    a[special] = 15.0 * rng.integers(-48, 49, special.sum()) + rng.choice([0.0, 1e-9, -1e-9], special.sum())
+    return a
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5_000_000)
+    parser.add_argument("--sample", type=int, default=20_000, help="results checked against high precision")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-slowdown", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "precision.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    a = angles(args.size, rng)
+
+    def plain():
+        rad = np.radians(a)
+        return np.sin(rad), np.cos(rad), np.tan(rad)
+
+    numpy_seconds = best_of(plain, args.repeat)
+    bounded_seconds = best_of(lambda: precision.trig_values(a), args.repeat)
+    bounded = precision.trig_values(a)
+
+    sample = rng.choice(args.size, min(args.sample, args.size), replace=False)
+    violations = 0
+    for name, b in zip(("sin", "cos", "tan"), bounded):
+        for i in sample:
+            exact = precision.high_precision(name, float(a[i]))
+            if np.isinf(exact):
+                violations += not np.isinf(b.value[i])
+            elif abs(b.value[i] - exact) > b.error[i]:
+                violations += 1
+
+    result = {
+        "size": args.size,
+        "numpy_seconds": numpy_seconds,
+        "bounded_seconds": bounded_seconds,
+        "slowdown": bounded_seconds / numpy_seconds,
+        "escalated": int(sum(b.escalated.sum() for b in bounded)),
+        "checked": 3 * len(sample),
+        "violations": violations,
+        "high_precision": "mpmath" if precision.mpmath else "decimal",
+        "timestamp": time.time(),
+    }
+    failures = []
+    if violations:
+        failures.append(f"{violations} results outside their error bound")
+    if result["slowdown"] > args.max_slowdown:
+        failures.append(f"slowdown {result['slowdown']:.2f}x > {args.max_slowdown}x")
+    result["passed"] = not failures
+
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(f"numpy:   {numpy_seconds:.3f}s for {args.size} angles (sin, cos, tan)")
+    print(f"bounded: {bounded_seconds:.3f}s ({result['slowdown']:.2f}x), {result['escalated']} escalated")
+    print(f"checked: {result['checked']} results against {result['high_precision']}, {violations} outside the bound")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Rerun latency benchmark for every page of the app.
+
+Drives app.py headlessly with Streamlit's AppTest, sweeping each page's
+real widget ranges (every angle slider step, all right-triangle modes and
+general-triangle cases, all wave types at the amplitude/frequency
+extremes, all inverse functions, every parametric curve at every sample
+count and zoom), and records p50/p95/p99 rerun latency
+and peak memory per page. Each page runs in a fresh interpreter, so
+caches and peak RSS do not carry over between pages.
+
+Results are appended to a JSON-lines file and compared with a baseline
+file; the exit status is non-zero if any page's p95 latency or peak memory
+regressed by more than the threshold.
+
+Usage::
+
+    python benchmarks/reruns.py --save-baseline       # record a baseline on this machine
+    python benchmarks/reruns.py --threshold 0.2       # compare against it
+    python benchmarks/reruns.py --page "Wave Functions" --stride 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+PAGES = ["Basic Trig Functions", "Unit Circle Explorer", "Triangle Calculator",
+         "Wave Functions", "Inverse Functions", "Parametric Curves"]
+
+PERCENTILES = (50, 95, 99)
+
+
+def _steps(start, stop, step, stride=1, decimals=None):
+    """Every slider value from start to stop inclusive, keeping every stride-th one and both ends."""
+    count = int(round((stop - start) / step))
+    values = [start + i * step for i in range(count + 1)]
+    if decimals is not None:
+        values = [round(v, decimals) for v in values]
+    kept = values[::stride]
+    if kept[-1] != values[-1]:
+        kept.append(values[-1])
+    return kept
+
+
+def interactions(page, stride=1):
+    """The page's sweep: a list of interactions, each a list of (widget kind, label, value) set before one rerun."""
+    if page == "Basic Trig Functions":
+        return [[("slider", "Angle (degrees)", v)] for v in _steps(-360, 360, 15, stride)]
+
+    if page == "Unit Circle Explorer":
+        sweep = [[("slider", "Angle (degrees)", v)] for v in _steps(0, 360, 5, stride)]
+        for reference in (False, True):
+            for quadrants in (False, True):
+                sweep.append([("checkbox", "Show reference angles", reference),
+                              ("checkbox", "Show quadrant labels", quadrants)])
+        return sweep
+
+    if page == "Triangle Calculator":
+        sweep = []
+        for mode, sides in [("Angle and Hypotenuse", ["Hypotenuse"]),
+                            ("Two Sides", ["Opposite side", "Adjacent side"]),
+                            ("Angle and Adjacent", ["Adjacent side"]),
+                            ("Angle and Opposite", ["Opposite side"])]:
+            sweep.append([("radio", "Calculate using:", mode)])
+            if mode != "Two Sides":
+                sweep += [[("slider", "Angle (degrees)", v)] for v in _steps(1, 89, 1, stride)]
+            for label in sides:
+                sweep += [[("number_input", label, v)] for v in (0.1, 1000.0, 5.0)]
+        sweep.append([("radio", "Triangle", "Oblique")])
+        for case, parts in [("SSS", [("Side a", 5.0), ("Side b", 6.0), ("Side c", 7.0)]),
+                            ("SAS", [("Side a", 5.0), ("Side b", 7.0), ("Angle C (degrees)", 60)]),
+                            ("ASA", [("Angle A (degrees)", 40), ("Side c", 8.0), ("Angle B (degrees)", 60)]),
+                            ("AAS", [("Angle A (degrees)", 40), ("Angle B (degrees)", 60), ("Side a", 5.0)]),
+                            ("SSA", [("Side a", 5.0), ("Side b", 7.0), ("Angle A (degrees)", 35)])]:
+            sweep.append([("selectbox", "Known parts:", case)])
+            for label, default in parts:
+                if label.startswith("Angle"):
+                    sweep += [[("slider", label, v)] for v in _steps(1, 179, 2, stride) + [default]]
+                else:
+                    sweep += [[("number_input", label, v)] for v in (0.1, 1000.0, default)]
+        return sweep
+
+    if page == "Wave Functions":
+        sweep = []
+        for wave_type in ("Sine", "Cosine", "Tangent"):
+            sweep.append([("selectbox", "Wave Type", wave_type)])
+            for amplitude in (0.1, 5.0):
+                for frequency in (0.1, 3.0):
+                    sweep.append([("slider", "Amplitude (A)", amplitude), ("slider", "Frequency (f)", frequency)])
+            sweep += [[("slider", "Phase Shift (φ) degrees", v)] for v in (-180, 180, 0)]
+            sweep.append([("slider", "Vertical Shift (D)", -2.0), ("slider", "Amplitude (A)", 1.0),
+                          ("slider", "Frequency (f)", 1.0)])
+        return sweep
+
+    if page == "Inverse Functions":
+        sweep = []
+        for function, (low, high, step, decimals) in [("arcsin", (-1.0, 1.0, 0.01, 2)),
+                                                      ("arccos", (-1.0, 1.0, 0.01, 2)),
+                                                      ("arctan", (-10.0, 10.0, 0.1, 1))]:
+            sweep.append([("selectbox", "Function", function)])
+            sweep += [[("slider", "Input value", v)] for v in _steps(low, high, step, 10 * stride, decimals)]
+        return sweep
+
+    if page == "Parametric Curves":
+        sweep = []
+        for kind, frequency in [("Lissajous", "x frequency (a)"), ("Rose", "Numerator (n)"),
+                                ("Epicycle", "Epicycle speed (q)")]:
+            sweep.append([("selectbox", "Curve", kind)])
+            # Latency should not grow with the sample count or the zoom
+            for samples in (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000):
+                sweep.append([("select_slider", "Samples", samples)])
+            for zoom in (2, 10, 100, 1000, 1):
+                sweep.append([("select_slider", "Zoom", zoom)])
+            sweep += [[("slider", frequency, v)] for v in (1, 50, 3)]
+        return sweep
+
+    raise ValueError(f"Unknown page: {page!r}")
+
+
+def _widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def _peak_rss_mb():
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return maxrss / 1024 / 1024 if sys.platform == "darwin" else maxrss / 1024
+
+
+def run_page(page, stride=1, timeout=120):
+    """Open page and time every rerun of its sweep (in this process); returns a result dict."""
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    _widget(at, "selectbox", "Choose a section:").set_value(page)
+    at.run()
+    first_render = time.perf_counter() - start
+
+    latencies = []
+    for interaction in interactions(page, stride):
+        for kind, label, value in interaction:
+            _widget(at, kind, label).set_value(value)
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"{page}: {interaction} raised {at.exception[0].message}")
+
+    ms = np.array(latencies) * 1000
+    result = {"reruns": len(latencies), "first_render_ms": first_render * 1000,
+              "max_ms": float(ms.max()), "peak_rss_mb": _peak_rss_mb()}
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = float(np.percentile(ms, p))
+    return result
+
+
+def measure(pages, stride=1):
+    """Run each page in a fresh interpreter; returns {page: result}."""
+    results = {}
+    for page in pages:
+        out = subprocess.run([sys.executable, __file__, "--worker", page, "--stride", str(stride)],
+                             cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        results[page] = json.loads(out.strip().splitlines()[-1])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regressions of p95 latency or peak RSS beyond threshold (a fraction) against baseline."""
+    failures = []
+    for page, result in results.items():
+        base = baseline.get("pages", {}).get(page)
+        if base is None:
+            continue
+        for metric in ("p95_ms", "peak_rss_mb"):
+            limit = base[metric] * (1 + threshold)
+            if result[metric] > limit:
+                failures.append(f"{page}: {metric} {result[metric]:.1f} > {limit:.1f} "
+                                f"(baseline {base[metric]:.1f} + {threshold:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", action="append", choices=PAGES,
+                        help="page to benchmark (repeatable; default: all pages)")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="keep every n-th slider step for a quicker run (default: 1, every step)")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("TRIG_RERUN_REGRESSION", 0.2)),
+                        help="allowed fractional increase over the baseline (default: 0.2)")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "benchmarks", "reruns_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write this run's results as the new baseline instead of comparing")
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "reruns.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    parser.add_argument("--worker", metavar="PAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker, args.stride)))
+        return 0
+
+    pages = args.page or PAGES
+    record = {"timestamp": time.time(), "stride": args.stride, "pages": measure(pages, args.stride)}
+
+    for page, r in record["pages"].items():
+        print(f"{page:22} {r['reruns']:4} reruns  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+              f"p99 {r['p99_ms']:7.1f} ms  peak RSS {r['peak_rss_mb']:6.1f} MB")
+
+    failures = []
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("stride") != args.stride:
+            print(f"warning: baseline used --stride {baseline.get('stride')}, this run {args.stride}")
+        failures = compare(record["pages"], baseline, args.threshold)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+    record["regressions"] = failures
+
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
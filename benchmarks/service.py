@@ -0,0 +1,191 @@
+"""Latency and throughput of the headless computation service.
+
+Starts trigcalc.service in-process on an ephemeral local port and sends it
+single-triangle JSON requests one at a time (latency percentiles), then
+batches of N right triangles as JSON and as .npz archives (triangles per
+second), checking every batch's results against compute. Finally it sends
+malformed, oversized and stalled requests, each of which must get a 4xx
+JSON error. Each run is appended to a JSON-lines results file; the exit
+status is non-zero if a result or an error reply is wrong.
+
+Usage::
+
+    python benchmarks/service.py --requests 500 --batch-size 100000 --workers 2
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trigcalc import compute, service  # noqa: E402
+
+
+def post(conn, path, body, content_type=service.JSON_TYPE, accept=service.JSON_TYPE):
+    conn.request("POST", path, body, {"Content-Type": content_type, "Accept": accept})
+    response = conn.getresponse()
+    data = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"{path}: {response.status} {data[:200]!r}")
+    return data
+
+
+# (description, path, raw body) of requests the service must refuse, and the status it must answer
+MALFORMED = [
+    ("invalid JSON", "/v1/inverse", b'{"function": "arcsin", "x": '),
+    ("body not an object", "/v1/inverse", b"[0.5]"),
+    ("unknown endpoint", "/v1/tangent", b"{}"),
+    ("unknown function", "/v1/inverse", b'{"function": "arcsec", "x": 0.5}'),
+    ("unknown parameter", "/v1/inverse", b'{"function": "arcsin", "x": 0.5, "y": 1}'),
+    ("missing parameter", "/v1/triangle", b'{"mode": "Two Sides", "opposite": 3}'),
+    ("non-numeric array", "/v1/inverse", b'{"function": "arcsin", "x": [0.5, "a"]}'),
+    ("ragged array", "/v1/inverse", b'{"function": "arcsin", "x": [[1, 2], [3]]}'),
+    ("shapes not broadcasting", "/v1/triangle", b'{"mode": "Two Sides", "opposite": [3, 4], "adjacent": [1, 2, 3]}'),
+    ("grid of the wrong length", "/v1/wave", b'{"wave_type": "Sine", "grid": [0, 1]}'),
+    ("fractional grid count", "/v1/wave", b'{"wave_type": "Sine", "grid": [0, 1, 10.5]}'),
+    ("infinite grid count", "/v1/wave", b'{"wave_type": "Sine", "grid": [0, 1, 1e999]}'),
+    ("oversized grid", "/v1/wave", b'{"wave_type": "Sine", "grid": [0, 1, 1e12]}'),
+    ("grid just over the limit", "/v1/wave", b'{"wave_type": "Sine", "grid": [0, 1, 3e6]}'),
+    ("oversized batch", "/v1/batch", json.dumps({"requests": [
+        {"op": "wave", "wave_type": "Sine", "grid": [0, 1, 1_500_000]}] * 2}).encode()),
+    ("batch not a list", "/v1/batch", b'{"requests": {"op": "inverse"}}'),
+]
+# Exchanges check_errors() makes besides MALFORMED
+ERROR_EXCHANGES = 5
+
+MALFORMED_STATUS = {"unknown endpoint": 404, "oversized grid": 413, "grid just over the limit": 413,
+                    "oversized batch": 413}
+
+
+def raw_exchange(port, request, timeout=30.0):
+    """Send raw request bytes and return (status, JSON body or None) of the reply."""
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall(request)
+        response = http.client.HTTPResponse(sock)
+        response.begin()
+        try:
+            return response.status, json.loads(response.read())
+        except ValueError:
+            return response.status, None
+
+
+def check_errors(port):
+    """Send malformed, oversized and stalled requests; returns the descriptions of wrong replies."""
+    stalled = service.READ_TIMEOUT + 5
+    cases = [(description, MALFORMED_STATUS.get(description, 400),
+              f"POST {path} HTTP/1.1\r\nContent-Type: {service.JSON_TYPE}\r\n"
+              f"Content-Length: {len(body)}\r\n\r\n".encode() + body, 30.0)
+             for description, path, body in MALFORMED]
+    cases += [
+        ("oversized body", 413, b"POST /v1/inverse HTTP/1.1\r\nContent-Length: 1000000000000\r\n"
+                                b"Expect: 100-continue\r\n\r\n", 30.0),
+        ("negative Content-Length", 400, b"POST /v1/inverse HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 30.0),
+        ("malformed request line", 400, b"NONSENSE\r\n\r\n", 30.0),
+        ("stalled body", 408, b'POST /v1/inverse HTTP/1.1\r\nContent-Length: 100\r\n\r\n{"x"', stalled),
+        ("stalled headers", 408, b"POST /v1/inverse HTTP/1.1\r\nContent-Le", stalled),
+    ]
+    failures = []
+    for description, wanted, request, timeout in cases:
+        try:
+            status, reply = raw_exchange(port, request, timeout)
+        except (http.client.HTTPException, OSError) as e:
+            failures.append(f"{description}: no reply ({type(e).__name__}), expected {wanted}")
+            continue
+        if status != wanted or not isinstance(reply, dict) or "error" not in reply:
+            failures.append(f"{description}: got {status} {reply!r}, expected {wanted} with an error")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="single-triangle requests timed one by one")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--batches", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--read-timeout", type=float, default=1.0,
+                        help="service read timeout in seconds while checking stalled requests")
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "service.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    # Stalled requests are refused after this long instead of the default
+    service.READ_TIMEOUT = args.read_timeout
+    svc = service.serve_in_background(0, workers=args.workers, limits=service.Limits(max_elements=2_000_000))
+    conn = http.client.HTTPConnection("127.0.0.1", svc.port)  # one keep-alive connection
+
+    latencies = []
+    for _ in range(args.requests):
+        body = json.dumps({"mode": "Angle and Hypotenuse", "angle": rng.uniform(1, 89), "hypotenuse": 10})
+        start = time.perf_counter()
+        post(conn, "/v1/triangle", body)
+        latencies.append(time.perf_counter() - start)
+
+    opposite = rng.uniform(0.1, 100, args.batch_size)
+    adjacent = rng.uniform(0.1, 100, args.batch_size)
+    expected = compute.solve_right_triangle("Two Sides", opposite=opposite, adjacent=adjacent)
+    wrong = 0
+    batch_seconds = {}
+    for fmt in ("json", "npz"):
+        if fmt == "json":
+            body = json.dumps({"mode": "Two Sides", "opposite": opposite.tolist(), "adjacent": adjacent.tolist()})
+            content_type = service.JSON_TYPE
+        else:
+            buf = io.BytesIO()
+            np.savez(buf, mode=np.array("Two Sides"), opposite=opposite, adjacent=adjacent)
+            body, content_type = buf.getvalue(), service.NPZ_TYPE
+        times = []
+        for _ in range(args.batches):
+            start = time.perf_counter()
+            data = post(conn, "/v1/triangle", body, content_type, content_type)
+            if fmt == "json":
+                hypotenuse = np.array(json.loads(data)["hypotenuse"])
+            else:
+                with np.load(io.BytesIO(data)) as archive:
+                    hypotenuse = archive["hypotenuse"]
+            times.append(time.perf_counter() - start)
+            wrong += int((hypotenuse != expected.hypotenuse).sum())
+        batch_seconds[fmt] = min(times)
+    conn.close()
+    failures = check_errors(svc.port)
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    result = {
+        "requests": args.requests,
+        "latency_ms": {"p50": p50, "p95": p95, "p99": p99},
+        "batch_size": args.batch_size,
+        "workers": svc.workers,
+        "triangles_per_second": {fmt: args.batch_size / s for fmt, s in batch_seconds.items()},
+        "wrong": wrong,
+        "error_checks": len(MALFORMED) + ERROR_EXCHANGES,
+        "error_failures": failures,
+        "passed": not wrong and not failures,
+        "timestamp": time.time(),
+    }
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(f"single: p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms over {args.requests} requests")
+    for fmt, rate in result["triangles_per_second"].items():
+        print(f"batch ({fmt}): {rate:,.0f} triangles/s in batches of {args.batch_size}")
+    print(f"errors: {result['error_checks'] - len(failures)}/{result['error_checks']} bad requests refused correctly")
+    if wrong:
+        print(f"FAIL: {wrong} hypotenuses differ from compute")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Startup-time budget check for the app.
+
+Measures, in a fresh interpreter, how long the app's startup imports take
+and the resident memory afterwards, and checks that heavy libraries only
+needed by individual pages are not loaded yet. Each run is appended to a
+JSON-lines results file; the exit status is non-zero if a budget is
+exceeded.
+
+Usage::
+
+    python benchmarks/startup.py --max-import-seconds 1.5 --max-rss-mb 120
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported before a page is selected
+DEFERRED_MODULES = ["matplotlib", "pandas", "seaborn", "pyarrow"]
+
+# Runs in the child interpreter; mirrors the imports at the top of app.py
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+import trigcalc.pages
+import_seconds = time.perf_counter() - start
+
+rss_kb = None
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    rss_kb = maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "rss_mb": rss_kb / 1024,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def measure(repeat=3):
+    """Run the probe repeat times in fresh interpreters; keep the fastest import and largest RSS."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        "import_seconds": min(r["import_seconds"] for r in runs),
+        "rss_mb": max(r["rss_mb"] for r in runs),
+        "loaded": sorted({m for r in runs for m in r["loaded"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-import-seconds", type=float,
+                        default=float(os.environ.get("TRIG_STARTUP_MAX_SECONDS", 1.5)))
+    parser.add_argument("--max-rss-mb", type=float,
+                        default=float(os.environ.get("TRIG_STARTUP_MAX_RSS_MB", 120)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "startup.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    result["timestamp"] = time.time()
+    result["budget"] = {"import_seconds": args.max_import_seconds, "rss_mb": args.max_rss_mb}
+
+    failures = []
+    if result["import_seconds"] > args.max_import_seconds:
+        failures.append(f"import time {result['import_seconds']:.3f}s > {args.max_import_seconds}s")
+    if result["rss_mb"] > args.max_rss_mb:
+        failures.append(f"RSS {result['rss_mb']:.1f} MB > {args.max_rss_mb} MB")
+    if result["loaded"]:
+        failures.append(f"deferred modules loaded at startup: {', '.join(result['loaded'])}")
+    result["passed"] = not failures
+
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(f"import: {result['import_seconds']:.3f}s (budget {args.max_import_seconds}s)")
+    print(f"RSS:    {result['rss_mb']:.1f} MB (budget {args.max_rss_mb} MB)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
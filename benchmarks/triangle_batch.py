@@ -0,0 +1,109 @@
+"""Throughput and row-handling check of the streaming triangle solver.
+
+Solves N random right triangles from a CSV file with trigcalc.triangle_batch
+(rows per second, in-process and with worker processes). Then it solves
+benchmarks/fixtures/triangles_malformed.csv in chunks of a few rows, in
+one chunk and across workers. Every row's status must match the fixture's
+expected_status column (including rows with cells that are not numbers),
+and the three output files must be byte-identical, so a column's format
+does not depend on where the chunk boundaries fall. Each run is appended
+to a JSON-lines results file; the exit status is non-zero if a check fails.
+
+Usage::
+
+    python benchmarks/triangle_batch.py --rows 1000000 --chunk-size 100000 --workers 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trigcalc import triangle_batch  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "triangles_malformed.csv")
+
+# Chunk size of the fixture run: boundaries fall between rows of different columns' formats
+FIXTURE_CHUNK_SIZE = 3
+
+
+def check_fixture(directory):
+    """Solve the fixture three ways; returns the descriptions of failed checks."""
+    failures = []
+    outputs = {}
+    for name, chunk_size, workers in [("chunked", FIXTURE_CHUNK_SIZE, 1), ("whole", 1_000_000, 1),
+                                      ("workers", FIXTURE_CHUNK_SIZE, 2)]:
+        path = os.path.join(directory, f"fixture_{name}.csv")
+        try:
+            triangle_batch.solve_file(FIXTURE, path, chunk_size=chunk_size, workers=workers)
+        except Exception as e:
+            failures.append(f"fixture ({name}): {type(e).__name__}: {e}")
+            continue
+        with open(path, "rb") as f:
+            outputs[name] = f.read()
+    if len(outputs) < 3:
+        return failures
+
+    for name, data in outputs.items():
+        if data != outputs["whole"]:
+            failures.append(f"fixture ({name}): output differs from the single-chunk output")
+    solved = pd.read_csv(os.path.join(directory, "fixture_chunked.csv"))
+    for row in solved.itertuples():
+        if row.status != row.expected_status:
+            failures.append(f"fixture row {row.Index + 2}: status {row.status!r}, expected {row.expected_status!r}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=os.path.join(ROOT, "benchmarks", "results", "triangle_batch.jsonl"),
+                        help="JSON-lines file each run is appended to")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "triangles.csv")
+        pd.DataFrame({"opposite": rng.uniform(0.1, 100, args.rows),
+                      "adjacent": rng.uniform(0.1, 100, args.rows)}).to_csv(source, index=False)
+        rows_per_second = {}
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            triangle_batch.solve_file(source, os.path.join(directory, "solved.csv"), mode="Two Sides",
+                                      chunk_size=args.chunk_size, workers=workers)
+            rows_per_second[workers] = args.rows / (time.perf_counter() - start)
+        failures = check_fixture(directory)
+
+    result = {
+        "rows": args.rows,
+        "chunk_size": args.chunk_size,
+        "rows_per_second": rows_per_second,
+        "fixture_failures": failures,
+        "passed": not failures,
+        "timestamp": time.time(),
+    }
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    with open(args.results, "a") as f:
+        f.write(json.dumps(result) + "\n")
+
+    for workers, rate in rows_per_second.items():
+        print(f"{workers} worker(s): {rate:,.0f} rows/s in chunks of {args.chunk_size}")
+    print(f"fixture: {'ok' if not failures else f'{len(failures)} checks failed'}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Checks that every widget state the pages allow can be served.
+
+The pages' widgets and the tools that enumerate or validate their states
+are defined apart; this script ties them together. It exits non-zero if a
+check fails:
+
+- animation: for each animated page, the widest sweep range at the finest
+  step (the largest sweep the widgets allow) is a valid Sweep
+- export: the states the static site's controls can reach
+  (export.controls()) are exactly the states warmup.states() renders
+
+Usage::
+
+    python benchmarks/widgets.py
+"""
+
+import argparse
+import os
+import sys
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trigcalc import animation, export, warmup  # noqa: E402
+
+
+def check_animation():
+    """Descriptions of the animated pages whose largest sweep is refused."""
+    failures = []
+    for page in animation.PAGES:
+        low, high = animation.SWEEP_RANGES[page]
+        sweep = animation.Sweep(page, low, high, min(animation.STEPS), fps=animation.MAX_FPS)
+        try:
+            sweep.validate()
+        except ValueError as e:
+            failures.append(f"animation ({page}, {low}° to {high}° in {sweep.step}° steps): {e}")
+    return failures
+
+
+def _range_keys(control):
+    """Key parts of every position of a site range input, as the browser steps and prints them."""
+    low, high, step = (Decimal(repr(control[k])) for k in ("min", "max", "step"))
+    # Browsers align range values to min + n * step in decimal; String(Number(v)) prints them shortest
+    values = [float(low + i * step) for i in range(int((high - low) / step) + 1)]
+    return [str(int(v)) if v.is_integer() else repr(v) for v in values]
+
+
+def _reachable_keys(page):
+    """Every state key the site's controls of page can produce, enumerated from the controls alone."""
+    controls = export.controls(page)
+    keys = set()
+
+    def walk(i, parts, values):
+        if i == len(controls):
+            keys.add(",".join(parts))
+            return
+        control = controls[i]
+        if control["type"] == "checkbox":
+            choices = [("1", True), ("0", False)]
+        elif control["type"] == "select":
+            choices = [(option, option) for option in control["options"]]
+        else:
+            bounds = control["ranges"][values[control["follows"]]] if "follows" in control else control
+            choices = [(part, None) for part in _range_keys(bounds)]
+        for part, value in choices:
+            walk(i + 1, parts + [part], {**values, control["name"]: value})
+
+    walk(0, [], {})
+    return keys
+
+
+def check_export():
+    """Descriptions of the pages whose site controls and warm-up states disagree."""
+    failures = []
+    for page in warmup.PAGES:
+        reachable = _reachable_keys(page)
+        rendered = {export.state_key(p, params) for p, params in warmup.states([page])}
+        for what, keys in [("reachable but not rendered", reachable - rendered),
+                           ("rendered but not reachable", rendered - reachable)]:
+            if keys:
+                failures.append(f"export ({page}): {len(keys)} states {what}, e.g. {sorted(keys)[:3]}")
+    return failures
+
+
+CHECKS = {"animation": check_animation, "export": check_export}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="append", choices=CHECKS, help="check to run (default: all)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for name in args.check or CHECKS:
+        found = CHECKS[name]()
+        print(f"{name}: {'ok' if not found else f'{len(found)} failed'}")
+        failures += found
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Support code for the Interactive Trigonometry Calculator Streamlit app."""
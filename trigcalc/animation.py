@@ -0,0 +1,354 @@
+"""Angle-sweep animations of the Basic Trig Functions and Unit Circle figures.
+
+A Sweep names a page, an angle range and step, and the output. Every frame
+is drawn on the page's LayeredFigure, so the static background is
+rasterized once per process and a frame only redraws the moving artists.
+Frames are rendered in chunks of consecutive angles across a process pool
+and come back in order; frames() yields them as they arrive, for showing an
+animation while it renders, and render() encodes them into one animated
+GIF (or WebP or APNG). GIF frames share one palette, and each stores only
+the pixels that changed since the previous frame.
+
+Rendering a sweep takes seconds rather than milliseconds, so the pages
+keep animations in the render cache under Sweep.params(), next to the
+page's figures (and on disk with TRIG_RENDER_CACHE_DIR).
+
+Usage::
+
+    python -m trigcalc.animation "Unit Circle Explorer" sweep.gif --step 1 --fps 30
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image
+
+from . import encoding, instrumentation, settings
+
+# Pages whose figures have an angle-only dynamic layer
+PAGES = ("Basic Trig Functions", "Unit Circle Explorer")
+
+# Output formats: animated GIF (shown in the app), WebP and APNG ("png")
+FORMATS = ("gif", "webp", "png")
+
+# Angle range of each page's sweep widget, and the step options
+SWEEP_RANGES = {"Basic Trig Functions": (-360, 360), "Unit Circle Explorer": (0, 360)}
+STEPS = (0.5, 1, 2, 5, 15)
+
+# The widest sweep the widgets allow, two full turns at the finest step, start and stop included
+MAX_FRAMES = 1441
+MAX_FPS = 50
+
+# Consecutive frames rendered per task
+CHUNK_FRAMES = 24
+
+# GIF palette index of pixels unchanged since the previous frame
+TRANSPARENT = 255
+
+
+class Sweep(NamedTuple):
+    page: str
+    start: float = 0.0
+    stop: float = 360.0  # inclusive
+    step: float = 1.0
+    fps: int = 25
+    show_reference: bool = True   # Unit Circle Explorer only
+    show_quadrants: bool = True   # Unit Circle Explorer only
+    width_px: int = 640
+    format: str = "gif"
+
+    def validate(self):
+        """Raise ValueError if the sweep cannot be rendered."""
+        if self.page not in PAGES:
+            raise ValueError(f"Page {self.page!r} cannot be animated; choose one of {PAGES}")
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown animation format {self.format!r}; choose one of {FORMATS}")
+        if not self.step > 0 or not self.stop >= self.start:
+            raise ValueError("An angle sweep needs step > 0 and stop >= start")
+        if not 1 <= self.fps <= MAX_FPS:
+            raise ValueError(f"fps must be between 1 and {MAX_FPS}")
+        if len(self.angles()) > MAX_FRAMES:
+            raise ValueError(f"A sweep has at most {MAX_FRAMES} frames")
+        return self
+
+    def angles(self):
+        """Angles of the frames, start to stop inclusive; integral angles are ints, as the sliders give them."""
+        count = int(np.floor((self.stop - self.start) / self.step + 1e-9)) + 1
+        angles = [round(self.start + i * self.step, 9) for i in range(count)]
+        return [int(a) if float(a).is_integer() else a for a in angles]
+
+    def params(self):
+        """Render-cache params of the encoded animation."""
+        params = self._asdict()
+        del params["page"]
+        if self.page != "Unit Circle Explorer":
+            del params["show_reference"], params["show_quadrants"]
+        return {"output": "animation", **params}
+
+    def layers(self):
+        """The page's LayeredFigure at the current encoding."""
+        from . import plots
+
+        if self.page == "Basic Trig Functions":
+            return plots.basic_trig_layers()
+        return plots.unit_circle_layers(self.show_reference, self.show_quadrants)
+
+
+def _pixels(sweep, angle):
+    with encoding.use(encoding.Encoding(width_px=sweep.width_px)):
+        return sweep.layers().pixels(angle)
+
+
+def _keys(rgba):
+    """Each RGBA pixel as one uint32, for comparing and looking up colors in one operation."""
+    return np.ascontiguousarray(rgba).view(np.uint32)[..., 0]
+
+
+def _rgb(keys):
+    return keys.astype(np.uint32).view(np.uint8).reshape(-1, 4)[:, :3]
+
+
+def palette(sweep):
+    """The GIF palette of a sweep (768 ints): the first frame's most frequent colors, median-cut colors
+    covering the rest, and the TRANSPARENT entry."""
+    rgba = _pixels(sweep, sweep.start)
+    keys, counts = np.unique(_keys(rgba), return_counts=True)
+    if len(keys) <= TRANSPARENT:
+        frequent, covering = keys, []
+    else:
+        # Exact background, grid and line colors; the antialiased blends
+        # map to their nearest entry
+        frequent = keys[np.argsort(counts)[::-1][:TRANSPARENT // 2]]
+        n = TRANSPARENT - len(frequent)
+        image = Image.fromarray(rgba).convert("RGB")
+        covering = image.quantize(n, method=Image.Quantize.MEDIANCUT).getpalette()[:3 * n]
+    colors = _rgb(frequent).ravel().tolist() + covering
+    return colors + [0] * (3 * TRANSPARENT - len(colors)) + [255, 255, 255]
+
+
+class _Quantizer:
+    """Maps a sweep's frames to indices of its palette, exactly to the nearest entry.
+
+    Only pixels that differ from the first frame are looked up; the rest
+    reuse its indices.
+    """
+
+    def __init__(self, sweep, colors):
+        self.colors = np.array(colors[:3 * TRANSPARENT], dtype=np.int32).reshape(-1, 3)
+        self.reference = _keys(_pixels(sweep, sweep.start))
+        self._keys = np.unique(self.reference)
+        self._lut = self._nearest(self._keys)
+        self.reference_index = self._lookup(self.reference.ravel()).reshape(self.reference.shape)
+
+    def _nearest(self, keys):
+        rgb = _rgb(keys).astype(np.int32)
+        return ((rgb[:, None, :] - self.colors[None, :, :]) ** 2).sum(axis=-1).argmin(axis=1).astype(np.uint8)
+
+    def _lookup(self, keys):
+        i = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        known = self._keys[i] == keys
+        index = self._lut[i]
+        if not known.all():
+            new = np.unique(keys[~known])
+            index[~known] = self._nearest(new)[np.searchsorted(new, keys[~known])]
+        return index
+
+    def __call__(self, rgba):
+        keys = _keys(rgba)
+        changed = keys != self.reference
+        index = self.reference_index.copy()
+        index[changed] = self._lookup(keys[changed])
+        return index
+
+
+_quantizer = None
+
+
+def _quantizer_for(sweep, colors):
+    # The last sweep's quantizer is kept, as chunks of one sweep follow each other
+    global _quantizer
+    key = (sweep.page, sweep.start, sweep.show_reference, sweep.show_quadrants, sweep.width_px, tuple(colors))
+    if _quantizer is None or _quantizer[0] != key:
+        _quantizer = (key, _Quantizer(sweep, colors))
+    return _quantizer[1]
+
+
+def render_frames(sweep, angles, colors=None):
+    """PNG bytes of the frames at angles: palette images on colors for GIF sweeps, RGB otherwise."""
+    quantize = _quantizer_for(sweep, colors) if colors is not None else None
+    frames = []
+    for angle in angles:
+        rgba = _pixels(sweep, angle)
+        if quantize is not None:
+            image = Image.fromarray(quantize(rgba), "P")
+            image.putpalette(colors)
+        else:
+            image = Image.fromarray(rgba).convert("RGB")
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", compress_level=1)
+        frames.append(buf.getvalue())
+    return frames
+
+
+def default_workers():
+    return settings.ANIMATION_WORKERS or os.cpu_count() or 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor(workers):
+    # One pool per process, kept between animations so its workers keep
+    # their imports and rasterized backgrounds
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool[0] != workers:
+            if _pool is not None:
+                _pool[1].shutdown(wait=False, cancel_futures=True)
+            # spawn: forking a threaded server process is unsafe
+            _pool = (workers, ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")))
+        return _pool[1]
+
+
+def _discard_pool():
+    # A worker died: the next sweep starts a new pool
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def frames(sweep, workers=None, colors=None):
+    """Yield (angle, PNG bytes) for every frame of the sweep in order, rendering chunks across workers processes.
+
+    colors is the GIF palette (see palette()); GIF sweeps compute it when it
+    is not given.
+    """
+    sweep.validate()
+    if sweep.format == "gif" and colors is None:
+        colors = palette(sweep)
+    angles = sweep.angles()
+    chunks = [angles[i:i + CHUNK_FRAMES] for i in range(0, len(angles), CHUNK_FRAMES)]
+    workers = min(workers or default_workers(), len(chunks))
+    if workers <= 1:
+        for chunk in chunks:
+            yield from zip(chunk, render_frames(sweep, chunk, colors))
+        return
+    pool = _executor(workers)
+    pending = deque()
+    try:
+        # At most 2 * workers chunks in flight, in input order
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(render_frames, sweep, chunk, colors)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+    except BrokenProcessPool:
+        _discard_pool()
+        raise
+    finally:
+        # The consumer stopped early: drop the chunks not started yet
+        for _, future in pending:
+            future.cancel()
+
+
+def _gif_deltas(images):
+    """The frames with the pixels equal to the previous frame's replaced by TRANSPARENT."""
+    previous = None
+    for image in images:
+        index = np.asarray(image)
+        if previous is not None:
+            delta = Image.fromarray(np.where(index == previous, TRANSPARENT, index).astype(np.uint8), "P")
+            delta.putpalette(image.getpalette())
+            image = delta
+        previous = index
+        yield image
+
+
+def encode(images, sweep):
+    """One animated image of the sweep's format from its frames (PIL images, in order)."""
+    duration = 1000 / sweep.fps
+    buf = io.BytesIO()
+    with instrumentation.stage("encode"):
+        if sweep.format == "gif":
+            images = list(_gif_deltas(images))
+            # The deltas already carry the frame differences; Pillow only crops them
+            images[0].save(buf, format="GIF", save_all=True, append_images=images[1:], duration=duration,
+                           loop=0, optimize=False, transparency=TRANSPARENT, disposal=1)
+        elif sweep.format == "webp":
+            images[0].save(buf, format="WEBP", save_all=True, append_images=images[1:], duration=duration,
+                           loop=0, quality=80, method=0)
+        else:
+            images[0].save(buf, format="PNG", save_all=True, append_images=images[1:], duration=duration,
+                           loop=0)
+    data = buf.getvalue()
+    instrumentation.count("encoded_bytes", len(data))
+    return data
+
+
+def render(sweep, workers=None, on_frame=None):
+    """The sweep encoded as one animated image; on_frame(angle, png_bytes) is called for each frame in order."""
+    images = []
+    with instrumentation.stage("figure"):
+        for angle, data in frames(sweep, workers):
+            if on_frame is not None:
+                on_frame(angle, data)
+            images.append(Image.open(io.BytesIO(data)))
+    instrumentation.count("animation_frames", len(images))
+    return encode(images, sweep)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("page", choices=PAGES)
+    parser.add_argument("output", help="output .gif, .webp or .png (APNG) file")
+    parser.add_argument("--start", type=float, default=0.0, help="first angle in degrees (default: 0)")
+    parser.add_argument("--stop", type=float, default=360.0, help="last angle in degrees (default: 360)")
+    parser.add_argument("--step", type=float, default=1.0, help="degrees between frames (default: 1)")
+    parser.add_argument("--fps", type=int, default=25)
+    parser.add_argument("--width-px", type=int, default=settings.ANIMATION_WIDTH_PX)
+    parser.add_argument("--no-reference", action="store_true", help="Unit Circle: hide the reference angle")
+    parser.add_argument("--no-quadrants", action="store_true", help="Unit Circle: hide the quadrant labels")
+    parser.add_argument("--workers", type=int, help="worker processes (default: TRIG_ANIMATION_WORKERS or one per CPU)")
+    parser.add_argument("--cache-dir", default=settings.RENDER_CACHE_DIR,
+                        help="disk cache directory shared with the app (default: TRIG_RENDER_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    fmt = os.path.splitext(args.output)[1].lower().lstrip(".")
+    sweep = Sweep(args.page, args.start, args.stop, args.step, args.fps, not args.no_reference,
+                  not args.no_quadrants, args.width_px, fmt).validate()
+
+    start = time.perf_counter()
+    data, key, disk = None, None, None
+    if args.cache_dir:
+        from .render_cache import make_key, open_disk_cache
+        disk = open_disk_cache(args.cache_dir, settings.RENDER_CACHE_DIR_MB * 1024 * 1024)
+        key = make_key(sweep.page, sweep.params())
+        data = disk.get(key)
+    cached = data is not None
+    if not cached:
+        data = render(sweep, args.workers)
+        if disk is not None:
+            disk.put(key, data)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"{len(sweep.angles())} frames, {len(data) / 1e6:.2f} MB, "
+          f"{'cached' if cached else f'{time.perf_counter() - start:.1f}s'} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""Client-side chart backend: Vega-Lite specs drawn by the browser.
+
+Instead of rasterizing a matplotlib figure on the server, these builders
+send each page's data series to the client as a Vega-Lite spec. Long
+series are reduced to about two points per horizontal pixel with min/max
+binning first, which keeps every peak and asymptote gap visible while
+bounding the payload by chart width rather than sample count.
+"""
+
+import numpy as np
+
+from . import compute, curves, instrumentation, sampling, special_angles
+
+PANEL_ASPECT = 0.8  # height / width of each panel, as in the 12x10 figures
+DECIMALS = 5        # coordinate precision sent to the client
+
+# Most points of a parametric curve sent to the client; denser paths are
+# decimated over coarser pixel grids until they fit
+MAX_CURVE_POINTS = 8_000
+
+
+def downsample(x, y, width_px):
+    """Reduce a curve sorted by x to at most ~2 points per pixel column.
+
+    Keeps the first/last point, each bucket's min and max, and the first
+    NaN of any bucket containing one so that gaps in the curve survive.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    width_px = max(int(width_px), 1)
+    if n <= 2 * width_px:
+        return x, y
+
+    edges = np.linspace(x[0], x[-1], width_px + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1], side="left"))
+    starts = starts[starts < n]
+    bucket = np.searchsorted(starts, np.arange(n), side="right") - 1
+
+    nan = np.isnan(y)
+    lo_vals = np.where(nan, np.inf, y)
+    hi_vals = np.where(nan, -np.inf, y)
+    lo = np.minimum.reduceat(lo_vals, starts)
+    hi = np.maximum.reduceat(hi_vals, starts)
+
+    def first_per_bucket(mask):
+        positions = np.flatnonzero(mask)
+        _, first = np.unique(bucket[positions], return_index=True)
+        return positions[first]
+
+    keep = np.concatenate([
+        [0, n - 1],
+        first_per_bucket(lo_vals == lo[bucket]),
+        first_per_bucket(hi_vals == hi[bucket]),
+        first_per_bucket(nan),
+    ])
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def _rows(series_name, x, y, width_px=None):
+    if width_px is not None:
+        x, y = downsample(x, y, width_px)
+    x = np.round(np.asarray(x, dtype=float), DECIMALS)
+    y = np.round(np.asarray(y, dtype=float), DECIMALS)
+    # NaN becomes null, which breaks the line at that point
+    return [
+        {"series": series_name, "i": i, "x": float(xv), "y": None if yv != yv else float(yv)}
+        for i, (xv, yv) in enumerate(zip(x.tolist(), y.tolist()))
+    ]
+
+
+def _scale(domain):
+    scale = {"zero": False}
+    if domain is not None:
+        scale["domain"] = [float(domain[0]), float(domain[1])]
+    return scale
+
+
+def panel(title, series, width, x_title="", y_title="", x_domain=None, y_domain=None,
+          rules=(), points=(), texts=(), downsample_curves=True):
+    """One chart panel.
+
+    series: (name, x, y, color[, style dict]) lines, shown in the legend when
+    name does not start with '_'. rules: dicts with 'x' or 'y' plus style.
+    points: (x, y, color, size) markers. texts: (x, y, text) labels.
+    """
+    height = int(width * PANEL_ASPECT)
+    x_enc = {"field": "x", "type": "quantitative", "title": x_title, "scale": _scale(x_domain)}
+    y_enc = {"field": "y", "type": "quantitative", "title": y_title, "scale": _scale(y_domain)}
+
+    values, legend_names, legend_colors, layers = [], [], [], []
+    for entry in series:
+        name, x, y, color = entry[:4]
+        style = entry[4] if len(entry) > 4 else {}
+        values.extend(_rows(name, x, y, width if downsample_curves else None))
+        if not name.startswith("_"):
+            legend_names.append(name)
+            legend_colors.append(color)
+        layers.append({
+            "transform": [{"filter": {"field": "series", "equal": name}}],
+            "mark": {"type": "line", "color": color, "strokeWidth": style.get("width", 2),
+                     "strokeDash": style.get("dash", []), "opacity": style.get("opacity", 1.0),
+                     "invalid": None, "clip": True},
+            "encoding": {"x": x_enc, "y": y_enc, "order": {"field": "i", "type": "quantitative"}},
+        })
+    if legend_names:
+        # An invisible layer carrying the color legend for the named series
+        layers.append({
+            "transform": [{"filter": {"field": "series", "oneOf": legend_names}}],
+            "mark": {"type": "line", "opacity": 0},
+            "encoding": {"x": x_enc, "y": y_enc, "color": {
+                "field": "series", "type": "nominal", "title": None,
+                "scale": {"domain": legend_names, "range": legend_colors},
+                "legend": {"orient": "top-right", "symbolOpacity": 1}}},
+        })
+    for rule in rules:
+        axis = "x" if "x" in rule else "y"
+        layers.append({
+            "data": {"values": [{axis: float(rule[axis])}]},
+            "mark": {"type": "rule", "color": rule.get("color", "red"),
+                     "strokeDash": rule.get("dash", [6, 4]), "opacity": rule.get("opacity", 0.7),
+                     "clip": True},
+            "encoding": {axis: {"field": axis, "type": "quantitative"}},
+        })
+    for px, py, color, size in points:
+        if not np.isfinite(px) or not np.isfinite(py):
+            continue
+        layers.append({
+            "data": {"values": [{"x": float(px), "y": float(py)}]},
+            "mark": {"type": "point", "filled": True, "color": color, "size": size, "opacity": 1,
+                     "clip": True},
+            "encoding": {"x": x_enc, "y": y_enc},
+        })
+    for tx, ty, text in texts:
+        layers.append({
+            "data": {"values": [{"x": float(tx), "y": float(ty), "text": text}]},
+            "mark": {"type": "text", "align": "left", "fontSize": 13},
+            "encoding": {"x": x_enc, "y": y_enc, "text": {"field": "text"}},
+        })
+    return {"title": title, "width": width, "height": height,
+            "data": {"values": values}, "layer": layers}
+
+
+def grid(rows):
+    """Arrange panels like plt.subplots: a list of rows of panel specs."""
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "vconcat": [{"hconcat": row} for row in rows],
+        "config": {"axis": {"grid": True, "gridOpacity": 0.3}},
+    }
+
+
+def _circle(n=200):
+    t = np.linspace(0, 2 * np.pi, n)
+    return np.cos(t), np.sin(t)
+
+
+@instrumentation.timed("chart_spec")
+def basic_trig_spec(angle_deg, width_px):
+    w = width_px // 2
+    angle_rad = np.radians(angle_deg)
+    sin_val, cos_val, tan_val = compute.trig_values(angle_deg)
+    x = np.linspace(-2*np.pi, 2*np.pi, 1000)
+    x_tan, y_tan = sampling.sample_wave("Tangent", -2*np.pi, 2*np.pi, (-5, 5))
+    marker = {"x": angle_rad}
+
+    unit = panel(f"Unit Circle - Angle: {angle_deg}°", [
+        ("_circle", *_circle(), "black"),
+        ("_radius", [0, cos_val], [0, sin_val], "red"),
+        (f"sin = {sin_val:.3f}", [cos_val, cos_val], [0, sin_val], "blue", {"dash": [6, 4]}),
+        (f"cos = {cos_val:.3f}", [0, cos_val], [0, 0], "green", {"dash": [6, 4]}),
+    ], w, x_domain=(-1.5, 1.5), y_domain=(-1.5, 1.5),
+        points=[(0, 0, "red", 60), (cos_val, sin_val, "red", 60)], downsample_curves=False)
+    sine = panel("Sine Function", [("sin(x)", x, np.sin(x), "blue")], w,
+                 "Angle (radians)", "sin(x)", rules=[marker], points=[(angle_rad, sin_val, "red", 120)])
+    cosine = panel("Cosine Function", [("cos(x)", x, np.cos(x), "green")], w,
+                   "Angle (radians)", "cos(x)", rules=[marker], points=[(angle_rad, cos_val, "red", 120)])
+    tangent = panel("Tangent Function", [("tan(x)", x_tan, y_tan, "orange")], w,
+                    "Angle (radians)", "tan(x)", y_domain=(-5, 5), rules=[marker],
+                    points=[(angle_rad, tan_val, "red", 120)] if abs(tan_val) < 10 else [])
+    return grid([[unit, sine], [cosine, tangent]])
+
+
+@instrumentation.timed("chart_spec")
+def unit_circle_spec(angle_deg, show_reference, show_quadrants, width_px):
+    sin_val, cos_val, _ = compute.trig_values(angle_deg)
+    series = [
+        ("_circle", *_circle(), "black", {"width": 3}),
+        ("_x_axis", [-1.5, 1.5], [0, 0], "gray", {"width": 1}),
+        ("_y_axis", [0, 0], [-1.5, 1.5], "gray", {"width": 1}),
+        (f"{angle_deg}°", [0, cos_val], [0, sin_val], "red", {"width": 4}),
+        (f"sin({angle_deg}°) = {sin_val:.3f}", [cos_val, cos_val], [0, sin_val], "blue", {"width": 3}),
+        (f"cos({angle_deg}°) = {cos_val:.3f}", [0, cos_val], [0, 0], "green", {"width": 3}),
+    ]
+    points = [(cos_val, sin_val, "red", 250)]
+    if show_reference:
+        special = special_angles.table(special_angles.REFERENCE_DIVISORS).angles
+        points += [(a.cos.value, a.sin.value, "black", 40) for a in special]
+    texts = []
+    if show_quadrants:
+        texts = [(0.65, 0.7, "I"), (-0.75, 0.7, "II"), (-0.8, -0.7, "III"), (0.65, -0.7, "IV")]
+    title = f"Unit Circle - Angle: {angle_deg}° (Quadrant {compute.quadrant_name(angle_deg)})"
+    w = int(width_px / PANEL_ASPECT * 0.6)
+    return grid([[panel(title, series, w, x_domain=(-1.5, 1.5), y_domain=(-1.5, 1.5),
+                        points=points, texts=texts, downsample_curves=False)]])
+
+
+@instrumentation.timed("chart_spec")
+def triangle_spec(calc_type, angle, opposite, adjacent, hypotenuse, width_px):
+    w = width_px // 2
+    shape = panel("Right Triangle Visualization", [
+        ("_triangle", [0, adjacent, 0, 0], [0, 0, opposite, 0], "blue", {"width": 3}),
+    ], w, x_domain=(-2, max(adjacent, opposite) + 2), y_domain=(-2, max(adjacent, opposite) + 2),
+        texts=[(adjacent / 2, -0.7, f"Adjacent = {adjacent:.2f}"),
+               (0.3, opposite / 2, f"Opposite = {opposite:.2f}"),
+               (adjacent / 2 + 0.5, opposite / 2 + 0.5, f"Hypotenuse = {hypotenuse:.2f}"),
+               (1, 0.5, f"{angle:.1f}°")],
+        downsample_curves=False)
+
+    angles = np.linspace(1, 89, 100)
+    current = {"x": angle, "color": "black", "dash": [2, 2]}
+    if calc_type == "Two Sides":
+        sin_vals, cos_vals, tan_vals = compute.trig_values(angles)
+        ratios = panel("Trigonometric Functions", [
+            ("sin", angles, sin_vals, "red"), ("cos", angles, cos_vals, "green"),
+            ("tan", angles, tan_vals, "blue"),
+        ], w, "Angle (degrees)", "Function Value", y_domain=(0, 3), rules=[current])
+    else:
+        sweep = compute.solve_right_triangle(calc_type, angle=angles, hypotenuse=hypotenuse,
+                                             opposite=opposite, adjacent=adjacent)
+        curves = {"Opposite": (sweep.opposite, "red"), "Adjacent": (sweep.adjacent, "green"),
+                  "Hypotenuse": (sweep.hypotenuse, "blue")}
+        fixed = {"Angle and Hypotenuse": "Hypotenuse", "Angle and Adjacent": "Adjacent",
+                 "Angle and Opposite": "Opposite"}[calc_type]
+        fixed_value = {"Hypotenuse": hypotenuse, "Adjacent": adjacent, "Opposite": opposite}[fixed]
+        series = [(name, angles, values, color) for name, (values, color) in curves.items() if name != fixed]
+        series.append((f"{fixed} = {fixed_value:.2f}", [1, 89], [fixed_value, fixed_value],
+                       curves[fixed][1], {"dash": [6, 4]}))
+        ratios = panel("How Side Lengths Change with Angle", series, w,
+                       "Angle (degrees)", "Side Length", rules=[current])
+    return grid([[shape, ratios]])
+
+
+@instrumentation.timed("chart_spec")
+def oblique_triangle_spec(case, inputs, width_px, labels):
+    """Both Triangle page panels for a general triangle.
+
+    inputs are the case's solve_oblique_triangle arguments, labels their names as the page shows them.
+    """
+    # plots imports this module, so its vertex placement is imported on use
+    from .plots import oblique_vertices
+
+    w = width_px // 2
+    solved = compute.solve_oblique_triangle(case, **inputs)
+    count = int(solved.solutions)
+    series, texts, xs, ys = [], [], [0.0], [0.0]
+    for slot, (color, style) in enumerate([("blue", {"width": 3}), ("orange", {"dash": [6, 4]})][:count]):
+        x, y = oblique_vertices(solved, slot)
+        series.append((f"Solution {slot + 1}" if count > 1 else "_triangle",
+                       np.append(x, 0), np.append(y, 0), color, style))
+        xs.extend(x)
+        ys.extend(y)
+        # The second SSA triangle shares a, b and A with the first
+        for (i, j), name in (((1, 2), "a"), ((0, 2), "b"), ((0, 1), "c"))[2 * slot:]:
+            texts.append(((x[i] + x[j]) / 2, (y[i] + y[j]) / 2,
+                          f"{name} = {float(np.ravel(getattr(solved, name))[slot]):.2f}"))
+        for i, name in enumerate(("angle_a", "angle_b", "angle_c")[slot:], start=slot):
+            inset = 0.2 if slot == 0 else 0.45
+            texts.append((x[i] + inset * (x.mean() - x[i]), y[i] + inset * (y.mean() - y[i]),
+                          f"{name[-1].upper()} = {float(np.ravel(getattr(solved, name))[slot]):.1f}°"))
+    if count == 0:
+        texts.append((0, 0, "No triangle has these parts"))
+    span = max(max(xs) - min(xs), max(ys) - min(ys), 1)
+    low = min(min(xs), min(ys)) - 0.15 * span
+    shape = panel(f"Oblique Triangle Visualization ({case})", series, w,
+                  x_domain=(low, low + 1.3 * span), y_domain=(low, low + 1.3 * span),
+                  texts=texts, downsample_curves=False)
+
+    sweep = compute.oblique_sweep(case, inputs)
+    series = []
+    for (name, values), color in zip(sweep["curves"].items(), ["red", "green", "blue"]):
+        series.append((labels[name], sweep["x"], values[:, 0], color))
+        if np.isfinite(values[:, 1]).any():
+            series.append((f"{labels[name]} (second triangle)", sweep["x"], values[:, 1], color, {"dash": [6, 4]}))
+    x_domain = (sweep["x"][0], sweep["x"][-1])
+    for (name, value), color in zip(sweep["fixed"].items(), ["gray", "black"]):
+        series.append((f"{labels[name]} = {value:.2f}", x_domain, [value, value], color, {"dash": [2, 2]}))
+    x_title = labels[sweep["input"]] + ("" if sweep["input"] == "c" else " (degrees)")
+    changes = panel(f"How the Triangle Changes with {labels[sweep['input']]}", series, w,
+                    x_title, sweep["y_title"], x_domain=x_domain,
+                    rules=[{"x": inputs[sweep["input"]], "color": "black", "dash": [2, 2]}])
+    return grid([[shape, changes]])
+
+
+@instrumentation.timed("chart_spec")
+def wave_spec(wave_type, amplitude, frequency, phase, vertical_shift, width_px, curve=None, base=None):
+    """Both Wave page panels; curve and base are the (x, y) samples of the modified and base waves, if already computed."""
+    y_domain = sampling.wave_y_range(wave_type)
+    if curve is None:
+        curve = sampling.sample_wave(wave_type, -4*np.pi, 4*np.pi, y_domain,
+                                     amplitude, frequency, phase, vertical_shift)
+    if base is None:
+        base = sampling.sample_wave(wave_type, -4*np.pi, 4*np.pi, y_domain)
+    (x, y), (base_x, base_y) = curve, base
+    x_domain = (-4*np.pi, 4*np.pi)
+
+    modified = panel(f"Modified {wave_type} Wave", [
+        (f"Modified {wave_type}", x, y, "blue", {"width": 3}),
+        (f"Vertical Shift = {vertical_shift}", x_domain, [vertical_shift] * 2, "red", {"dash": [6, 4]}),
+        (f"Max = {vertical_shift + amplitude:.2f}", x_domain, [vertical_shift + amplitude] * 2, "green", {"dash": [2, 2]}),
+        (f"Min = {vertical_shift - amplitude:.2f}", x_domain, [vertical_shift - amplitude] * 2, "green", {"dash": [2, 2]}),
+    ], width_px, "x (radians)", "y", x_domain=x_domain, y_domain=y_domain)
+    comparison = panel("Comparison: Base vs Modified Function", [
+        (f"Base {wave_type}", base_x, base_y, "gray", {"opacity": 0.5}),
+        (f"Modified {wave_type}", x, y, "blue", {"width": 3}),
+    ], width_px, "x (radians)", "y", x_domain=x_domain, y_domain=y_domain)
+    for spec in (modified, comparison):
+        spec["height"] = int(width_px * 0.4)
+    return grid([[modified], [comparison]])
+
+
+def parametric_width_px(width_px):
+    """Width of the parametric curve panel in a chart width_px wide, the resolution its detail needs."""
+    return int(width_px * 0.6)
+
+
+@instrumentation.timed("chart_spec")
+def parametric_spec(bounds, detail, title, width_px):
+    """The Parametric Curves panel of a curves.detail() over bounds, as plots.render_parametric."""
+    w = parametric_width_px(width_px)
+    x, y = detail.x, detail.y
+    cells = w
+    while len(x) > MAX_CURVE_POINTS and cells > 16:
+        cells //= 2
+        keep = curves.decimate(x, y, bounds, cells, cells)
+        x, y = x[keep], y[keep]
+    spec = panel(title, [("_curve", x, y, "blue", {"width": 1.5})], w, "x", "y",
+                 x_domain=(bounds.x_min, bounds.x_max), y_domain=(bounds.y_min, bounds.y_max),
+                 downsample_curves=False)
+    spec["height"] = w
+    return grid([[spec]])
+
+
+@instrumentation.timed("chart_spec")
+def inverse_spec(function_type, input_val, width_px, curves=None):
+    """The three plot panels of the Inverse Functions page (the reference table is shown separately).
+
+    curves is sampling.inverse_curves(function_type), if already computed.
+    """
+    if curves is None:
+        curves = sampling.inverse_curves(function_type)
+    w = width_px // 2
+    result_rad = compute.inverse(function_type, input_val)
+    result_deg = np.degrees(result_rad)
+    color = {"arcsin": "blue", "arccos": "green", "arctan": "red"}[function_type]
+    markers = [{"x": input_val}, {"y": result_rad}]
+
+    if function_type == "arctan":
+        y_domain = (-np.pi/2 - 0.5, np.pi/2 + 0.5)
+        extra = [("y = π/2", [-10, 10], [np.pi/2] * 2, "gray", {"dash": [6, 4], "opacity": 0.5}),
+                 ("y = -π/2", [-10, 10], [-np.pi/2] * 2, "gray", {"dash": [6, 4], "opacity": 0.5})]
+    else:
+        y_domain = (-0.5, np.pi + 0.5) if function_type == "arccos" else (-np.pi/2 - 0.5, np.pi/2 + 0.5)
+        extra = []
+    inverse_panel = panel(f"{function_type}(x)", [
+        (f"{function_type}(x)", *curves["inverse"], color, {"width": 3}),
+        *extra,
+    ], w, "x", "y (radians)", y_domain=y_domain, rules=markers,
+        points=[(input_val, result_rad, "red", 120)])
+
+    forward_panel = panel(f"Corresponding {function_type[3:]}(x) function", [
+        (f"{function_type[3:]}(x)", *curves["forward"], color, {"opacity": 0.7}),
+        ("Principal branch", *curves["principal"], color, {"width": 4}),
+    ], w, "x (radians)", "y", y_domain=(-3, 3), rules=[{"x": result_rad}, {"y": input_val}],
+        points=[(result_rad, input_val, "red", 120)])
+
+    if function_type == "arctan":
+        circle_series = [("_circle", *_circle(), "black"),
+                         (f"slope = {input_val:.2f}", [0, 1], [0, input_val], "red", {"width": 3})]
+    else:
+        x_circle, y_circle = np.cos(result_rad), np.sin(result_rad)
+        circle_series = [("_circle", *_circle(), "black"),
+                         ("_radius", [0, x_circle], [0, y_circle], "red", {"width": 3}),
+                         ("_sin", [x_circle, x_circle], [0, y_circle], "blue", {"dash": [6, 4]}),
+                         ("_cos", [0, x_circle], [0, 0], "green", {"dash": [6, 4]})]
+    circle_panel = panel("Unit Circle Representation", circle_series, w,
+                         x_domain=(-1.5, 1.5), y_domain=(-1.5, 1.5),
+                         texts=[(0.1, 0.1, f"{function_type}({input_val:.2f}) = {result_deg:.1f}°")],
+                         downsample_curves=False)
+    return grid([[inverse_panel, forward_panel], [circle_panel]])
+
+
+@instrumentation.timed("chart_spec")
+def fourier_spec(title, x, y, comps, width_px, fit=None):
+    """Signal panel over a component amplitude spectrum, as in plots.render_fourier."""
+    if fit is None:
+        series = [("Sum of components", x, y, "blue")]
+    else:
+        series = [("Signal", x, y, "gray", {"width": 1, "opacity": 0.6}),
+                  (f"Reconstruction ({len(comps.amplitude)} components)", *fit, "blue")]
+    signal = panel(title, series, width_px, "x (radians)", "y", x_domain=(x[0], x[-1]))
+    signal["height"] = int(width_px * 0.4)
+
+    frequency = np.round(comps.frequency, DECIMALS).tolist()
+    amplitude = np.round(np.abs(comps.amplitude), DECIMALS).tolist()
+    spectrum = {
+        "title": "Component Amplitudes", "width": width_px, "height": int(width_px * 0.3),
+        "data": {"values": [{"f": f, "a": a} for f, a in zip(frequency, amplitude)]},
+        "encoding": {"x": {"field": "f", "type": "quantitative", "title": "Frequency (f)"},
+                     "y": {"field": "a", "type": "quantitative", "title": "|A|"}},
+        "layer": [{"mark": {"type": "rule", "color": "blue", "strokeWidth": 2}, "encoding": {"y2": {"datum": 0}}},
+                  {"mark": {"type": "point", "filled": True, "color": "blue", "size": 15}}],
+    }
+    return grid([[signal], [spectrum]])
@@ -0,0 +1,324 @@
+"""Vectorized trigonometry used by the app pages and by batch callers.
+
+Every function accepts scalars or NumPy arrays (broadcast together) and is
+built from whole-array ufunc operations, so the same code path serves a
+single slider value and arrays with millions of elements. Scalar inputs
+give NumPy scalar results.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+# cos(angle) below this magnitude is treated as zero, making tan undefined
+TAN_COS_EPS = 1e-10
+
+QUADRANT_NAMES = np.array(["I", "II", "III", "IV"])
+
+TRIANGLE_MODES = ["Angle and Hypotenuse", "Two Sides", "Angle and Adjacent", "Angle and Opposite"]
+
+# Known parts of a general triangle; side a is opposite angle A, and so on
+OBLIQUE_CASES = ["SSS", "SAS", "ASA", "AAS", "SSA"]
+
+# SSA rows with sin B this close to 1 have the single right-angled solution
+SSA_TANGENT_EPS = 1e-12
+
+# case -> the inputs of solve_oblique_triangle it reads
+OBLIQUE_INPUTS = {
+    "SSS": ["a", "b", "c"],
+    "SAS": ["a", "b", "angle_c"],        # angle C between sides a and b
+    "ASA": ["angle_a", "c", "angle_b"],  # side c between angles A and B
+    "AAS": ["angle_a", "angle_b", "a"],
+    "SSA": ["a", "b", "angle_a"],        # angle A opposite side a: zero, one or two triangles
+}
+
+WAVE_TYPES = ["Sine", "Cosine", "Tangent"]
+
+INVERSE_FUNCTIONS = ["arcsin", "arccos", "arctan"]
+
+# inverse function -> its ufunc, and the forward ufunc used to verify it
+# (ufuncs, so block-wise callers can evaluate into preallocated out= arrays)
+INVERSE_UFUNCS = {"arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan}
+FORWARD_UFUNCS = {"arcsin": np.sin, "arccos": np.cos, "arctan": np.tan}
+
+
+def _scalar_or_array(values):
+    # 0-d arrays become NumPy scalars so they format like Python numbers
+    if isinstance(values, np.ndarray) and values.ndim == 0:
+        return values[()]
+    return values
+
+
+def trig_values(angle_deg):
+    """Return (sin, cos, tan) of angles in degrees; tan is inf where cos is ~0."""
+    angle_rad = np.radians(np.asarray(angle_deg, dtype=float))
+    sin_val = np.sin(angle_rad)
+    cos_val = np.cos(angle_rad)
+    defined = np.abs(cos_val) > TAN_COS_EPS
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tan_val = np.where(defined, np.tan(angle_rad), np.inf)
+    return _scalar_or_array(sin_val), _scalar_or_array(cos_val), _scalar_or_array(tan_val)
+
+
+def quadrant(angle_deg):
+    """Return the quadrant number (1-4) of angles in degrees, as on the Unit Circle page.
+
+    Boundaries belong to the lower quadrant (90° is I, 180° is II, 270° is
+    III); angles outside [0, 270] fall in IV.
+    """
+    a = np.asarray(angle_deg, dtype=float)
+    result = np.full(a.shape, 4, dtype=np.int8)
+    result[(a > 180) & (a <= 270)] = 3
+    result[(a > 90) & (a <= 180)] = 2
+    result[(a >= 0) & (a <= 90)] = 1
+    return _scalar_or_array(result)
+
+
+def quadrant_name(angle_deg):
+    return _scalar_or_array(QUADRANT_NAMES[np.asarray(quadrant(angle_deg)) - 1])
+
+
+class RightTriangle(NamedTuple):
+    angle_a: np.ndarray
+    angle_b: np.ndarray
+    opposite: np.ndarray
+    adjacent: np.ndarray
+    hypotenuse: np.ndarray
+    area: np.ndarray
+    perimeter: np.ndarray
+
+
+def solve_right_triangle(mode, angle=None, hypotenuse=None, opposite=None, adjacent=None):
+    """Solve right triangles for one of the TRIANGLE_MODES.
+
+    angle is angle A in degrees (opposite the 'opposite' side). Only the
+    inputs the mode uses are read; all results are broadcast arrays.
+    """
+    if mode == "Angle and Hypotenuse":
+        angle = np.asarray(angle, dtype=float)
+        hypotenuse = np.asarray(hypotenuse, dtype=float)
+        angle_rad = np.radians(angle)
+        opposite = hypotenuse * np.sin(angle_rad)
+        adjacent = hypotenuse * np.cos(angle_rad)
+    elif mode == "Two Sides":
+        opposite = np.asarray(opposite, dtype=float)
+        adjacent = np.asarray(adjacent, dtype=float)
+        hypotenuse = np.hypot(opposite, adjacent)
+        angle = np.degrees(np.arctan2(opposite, adjacent))
+    elif mode == "Angle and Adjacent":
+        angle = np.asarray(angle, dtype=float)
+        adjacent = np.asarray(adjacent, dtype=float)
+        angle_rad = np.radians(angle)
+        opposite = adjacent * np.tan(angle_rad)
+        hypotenuse = adjacent / np.cos(angle_rad)
+    elif mode == "Angle and Opposite":
+        angle = np.asarray(angle, dtype=float)
+        opposite = np.asarray(opposite, dtype=float)
+        angle_rad = np.radians(angle)
+        adjacent = opposite / np.tan(angle_rad)
+        hypotenuse = opposite / np.sin(angle_rad)
+    else:
+        raise ValueError(f"Unknown triangle mode: {mode!r}")
+
+    angle, opposite, adjacent, hypotenuse = np.broadcast_arrays(angle, opposite, adjacent, hypotenuse)
+    return RightTriangle(
+        angle_a=_scalar_or_array(angle),
+        angle_b=_scalar_or_array(90 - angle),
+        opposite=_scalar_or_array(opposite),
+        adjacent=_scalar_or_array(adjacent),
+        hypotenuse=_scalar_or_array(hypotenuse),
+        area=_scalar_or_array(0.5 * opposite * adjacent),
+        perimeter=_scalar_or_array(opposite + adjacent + hypotenuse),
+    )
+
+
+class ObliqueTriangles(NamedTuple):
+    """Solutions of general triangles, two slots per input row.
+
+    Every field but solutions has a trailing axis of length 2: slot 0 holds
+    the first solution, slot 1 the second triangle of an ambiguous SSA row.
+    Slots past a row's solution count are NaN. Angles are in degrees.
+    """
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    angle_a: np.ndarray
+    angle_b: np.ndarray
+    angle_c: np.ndarray
+    area: np.ndarray
+    perimeter: np.ndarray
+    solutions: np.ndarray  # number of triangles per row: 0, 1 or 2
+
+    def valid(self):
+        """Boolean mask of the filled slots, shaped like the fields."""
+        return np.arange(2) < np.asarray(self.solutions)[..., None]
+
+
+def _sin_deg(angle):
+    return np.sin(np.radians(angle))
+
+
+def solve_oblique_triangle(case, a=None, b=None, c=None, angle_a=None, angle_b=None, angle_c=None):
+    """Solve general triangles for one of the OBLIQUE_CASES in a single vectorized pass.
+
+    Only the inputs listed in OBLIQUE_INPUTS[case] are read; they broadcast
+    together. Rows whose inputs do not form a triangle (non-positive sides,
+    angles outside (0°, 180°), the triangle inequality or an angle sum of
+    180° or more, an SSA side too short to reach) get zero solutions.
+    """
+    if case not in OBLIQUE_INPUTS:
+        raise ValueError(f"Unknown triangle case: {case!r}")
+    given = {"a": a, "b": b, "c": c, "angle_a": angle_a, "angle_b": angle_b, "angle_c": angle_c}
+    inputs = np.broadcast_arrays(*(np.asarray(given[name], dtype=float) for name in OBLIQUE_INPUTS[case]))
+    shape = inputs[0].shape
+    ok = np.ones(shape, dtype=bool)
+    for name, values in zip(OBLIQUE_INPUTS[case], inputs):
+        ok &= (values > 0) & np.isfinite(values)
+        if name.startswith("angle"):
+            ok &= values < 180
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if case == "SSS":
+            a, b, c = inputs
+            ok &= (a < b + c) & (b < a + c) & (c < a + b)
+            angle_a = np.degrees(np.arccos(np.clip((b*b + c*c - a*a) / (2*b*c), -1, 1)))
+            angle_b = np.degrees(np.arccos(np.clip((a*a + c*c - b*b) / (2*a*c), -1, 1)))
+            angle_c = 180 - angle_a - angle_b
+        elif case == "SAS":
+            a, b, angle_c = inputs
+            gamma = np.radians(angle_c)
+            c = np.sqrt(np.maximum(a*a + b*b - 2*a*b*np.cos(gamma), 0))
+            # atan2 keeps A accurate when it is obtuse or tiny
+            angle_a = np.degrees(np.arctan2(a * np.sin(gamma), b - a * np.cos(gamma)))
+            angle_b = 180 - angle_a - angle_c
+        elif case in ("ASA", "AAS"):
+            if case == "ASA":
+                angle_a, c, angle_b = inputs
+            else:
+                angle_a, angle_b, a = inputs
+            angle_c = 180 - angle_a - angle_b
+            ok &= angle_c > 0
+            # Law of sines from the known side
+            known, known_angle = (c, angle_c) if case == "ASA" else (a, angle_a)
+            ratio = known / _sin_deg(known_angle)
+            a, b, c = ratio * _sin_deg(angle_a), ratio * _sin_deg(angle_b), ratio * _sin_deg(angle_c)
+        else:  # SSA
+            a, b, angle_a = inputs
+            sin_b = b * _sin_deg(angle_a) / a
+            # a = b·sin A exactly (one right triangle) often rounds to either side of 1
+            sin_b = np.where(np.abs(sin_b - 1) <= SSA_TANGENT_EPS, 1.0, sin_b)
+            ok &= sin_b <= 1
+            acute = np.degrees(np.arcsin(np.minimum(sin_b, 1)))
+            # The obtuse B also fits when side a is shorter than b and can swing to both sides
+            two = ok & (a < b) & (sin_b < 1) & (angle_a < 90)
+            angle_b = np.stack([acute, np.where(two, 180 - acute, np.nan)], axis=-1)
+            angle_a = angle_a[..., None]
+            angle_c = 180 - angle_a - angle_b
+            ok_slots = np.stack([ok & (angle_c[..., 0] > 0), two], axis=-1)
+            a, b = a[..., None], b[..., None]
+            c = a * _sin_deg(angle_c) / _sin_deg(angle_a)
+
+        if case != "SSA":
+            ok_slots = np.stack([ok, np.zeros(shape, dtype=bool)], axis=-1)
+        fields = [np.broadcast_to(np.asarray(v, dtype=float)[..., None] if case != "SSA" else v, shape + (2,))
+                  for v in (a, b, c, angle_a, angle_b, angle_c)]
+        fields = [np.where(ok_slots, f, np.nan) for f in fields]
+        a, b, c, angle_a, angle_b, angle_c = fields
+        area = 0.5 * a * b * _sin_deg(angle_c)
+    return ObliqueTriangles(a, b, c, angle_a, angle_b, angle_c, area, a + b + c,
+                            _scalar_or_array(ok_slots.sum(axis=-1).astype(np.int8)))
+
+
+# Oblique case -> (swept input, solved fields plotted against it, axis title)
+_OBLIQUE_SWEEPS = {
+    "SSS": ("c", ["angle_a", "angle_b", "angle_c"], "Angle (degrees)"),
+    "SAS": ("angle_c", ["c"], "Side Length"),
+    "ASA": ("angle_b", ["a", "b"], "Side Length"),
+    "AAS": ("angle_b", ["b", "c"], "Side Length"),
+    "SSA": ("angle_a", ["c"], "Side Length"),
+}
+
+
+def oblique_sweep(case, inputs, points=200):
+    """How an oblique triangle's solution changes with one of its inputs, for the Triangle page's second panel.
+
+    inputs are the case's solve_oblique_triangle arguments. Returns a dict:
+    "input" (the swept input's name), "x", "curves" (field name -> (points, 2)
+    array, NaN where that solution does not exist), "fixed" (the side
+    inputs held constant) and "y_title".
+    """
+    swept, fields, y_title = _OBLIQUE_SWEEPS[case]
+    if swept == "c":
+        low, high = abs(inputs["a"] - inputs["b"]), inputs["a"] + inputs["b"]
+    elif case in ("ASA", "AAS"):
+        low, high = 0, 180 - inputs["angle_a"]
+    else:
+        low, high = 0, 180
+    x = np.linspace(low, high, points + 2)[1:-1]
+    solved = solve_oblique_triangle(case, **{**inputs, swept: x})
+    return {"input": swept, "x": x, "curves": {name: getattr(solved, name) for name in fields},
+            "fixed": {name: value for name, value in inputs.items()
+                      if name != swept and not name.startswith("angle") and swept != "c"},
+            "y_title": y_title}
+
+
+def wave(x, wave_type, amplitude=1.0, frequency=1.0, phase_deg=0.0, vertical_shift=0.0):
+    """Evaluate y = A·f(frequency·x + phase) + D for f in WAVE_TYPES (x in radians)."""
+    x = np.asarray(x, dtype=float)
+    arg = frequency * x + np.radians(phase_deg)
+    if wave_type == "Sine":
+        base = np.sin(arg)
+    elif wave_type == "Cosine":
+        base = np.cos(arg)
+    elif wave_type == "Tangent":
+        base = np.tan(arg)
+    else:
+        raise ValueError(f"Unknown wave type: {wave_type!r}")
+    return _scalar_or_array(amplitude * base + vertical_shift)
+
+
+def wave_period(frequency, wave_type="Sine"):
+    """Period of the wave; tangent repeats every π/frequency, sine and cosine every 2π/frequency."""
+    base_period = np.pi if wave_type == "Tangent" else 2 * np.pi
+    return _scalar_or_array(base_period / np.asarray(frequency, dtype=float))
+
+
+def wave_asymptotes(x_min, x_max, wave_type, frequency=1.0, phase_deg=0.0):
+    """Sorted x positions in [x_min, x_max] where the wave is undefined.
+
+    Only the tangent has asymptotes: frequency·x + phase = π/2 + kπ.
+    """
+    if wave_type != "Tangent" or frequency == 0:
+        return np.empty(0)
+    phase = np.radians(phase_deg)
+    # Solve for k at both ends; a negative frequency reverses the order
+    k_ends = sorted(((frequency * x + phase - np.pi / 2) / np.pi for x in (x_min, x_max)))
+    k = np.arange(np.ceil(k_ends[0]), np.floor(k_ends[1]) + 1)
+    return np.sort((np.pi / 2 + k * np.pi - phase) / frequency)
+
+
+def inverse(function_type, x):
+    """Principal value in radians of arcsin, arccos or arctan; NaN outside the domain."""
+    try:
+        func = INVERSE_UFUNCS[function_type]
+    except KeyError:
+        raise ValueError(f"Unknown inverse function: {function_type!r}") from None
+    with np.errstate(invalid="ignore"):
+        return _scalar_or_array(func(np.asarray(x, dtype=float)))
+
+
+def forward(function_type, result_rad):
+    """Apply the forward function matching an inverse (sin for arcsin, ...)."""
+    try:
+        func = FORWARD_UFUNCS[function_type]
+    except KeyError:
+        raise ValueError(f"Unknown inverse function: {function_type!r}") from None
+    return _scalar_or_array(func(np.asarray(result_rad, dtype=float)))
+
+
+def round_trip(function_type, x):
+    """Return (result_rad, verification, abs_error) for inverse then forward evaluation."""
+    x = np.asarray(x, dtype=float)
+    result_rad = inverse(function_type, x)
+    verification = forward(function_type, result_rad)
+    return result_rad, verification, _scalar_or_array(np.abs(verification - x))
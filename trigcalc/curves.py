@@ -0,0 +1,237 @@
+"""Parametric and polar trig curves with view-dependent level of detail.
+
+A Curve is one closed trig curve, evaluated at `samples` evenly spaced
+parameter values over its period. Those samples are the most detail the
+curve has; a plot never evaluates more of them than its view can show.
+detail() picks the samples for one view in three steps:
+
+1. A coarse pass over at most 2 * COARSE_POINTS of them, shared by every
+   view of the curve, finds the stretches of the curve inside the view.
+2. Those stretches alone are refined, to about one sample per pixel (or
+   fewer, within `budget` evaluations), so zooming in refines the curve
+   down to the full sample count while the work stays bounded by the
+   budget and the pixel count rather than by `samples`.
+3. The refined path is decimated to one point per run of samples in the
+   same pixel, the 2-D counterpart of the min/max-per-pixel binning of the
+   charts: the drawn path stays within a pixel of the full-resolution one.
+
+Curves denser than MAX_LINE_POINTS after decimation also get a pixel
+coverage image, which draws in time proportional to the plot area instead
+of the point count.
+"""
+
+import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from . import instrumentation
+
+CURVE_KINDS = ["Lissajous", "Rose", "Epicycle"]
+
+# Coarse samples per curve are between COARSE_POINTS and twice as many
+COARSE_POINTS = 1 << 15
+
+# Most samples evaluated for one view
+DEFAULT_BUDGET = 500_000
+
+# Decimated paths longer than this are drawn from their coverage image
+MAX_LINE_POINTS = 50_000
+
+# Share of the view added around the curve's extent at zoom 1
+MARGIN = 0.05
+
+
+class Curve(NamedTuple):
+    """A closed trig curve; p, q and size mean per kind:
+
+    Lissajous  x = sin(p·t + phase), y = size·sin(q·t)                 t ∈ [0, 2π]
+    Rose       r = size·cos(p/q·θ), x = r·cos θ, y = r·sin θ            θ ∈ [0, qπ] or [0, 2qπ]
+    Epicycle   x = cos(p·t) + size·cos(q·t + phase),
+               y = sin(p·t) + size·sin(q·t + phase)                     t ∈ [0, 2π]
+
+    p and q are integers, so every curve closes over its period.
+    """
+    kind: str
+    p: int
+    q: int
+    phase_deg: float = 0.0
+    size: float = 1.0
+
+    def period(self):
+        if self.kind == "Rose":
+            # With p/q in lowest terms, r(θ + qπ) = ±r(θ): the rose closes after qπ when p·q is odd
+            g = math.gcd(self.p, self.q)
+            p, q = self.p // g, self.q // g
+            return np.pi * q * (1 if p * q % 2 else 2)
+        return 2 * np.pi
+
+    def label(self):
+        """The curve's equations as text."""
+        size = "" if self.size == 1 else f"{self.size:g}·"
+        if self.kind == "Lissajous":
+            return f"x = sin({self.p}t + {self.phase_deg:g}°), y = {size}sin({self.q}t)"
+        if self.kind == "Rose":
+            return f"r = {size}cos({self.p}/{self.q}·θ)"
+        return (f"x = cos({self.p}t) + {size}cos({self.q}t + {self.phase_deg:g}°), "
+                f"y = sin({self.p}t) + {size}sin({self.q}t + {self.phase_deg:g}°)")
+
+    def evaluate(self, t):
+        """(x, y) at parameter values t."""
+        t = np.asarray(t, dtype=float)
+        phase = np.radians(self.phase_deg)
+        if self.kind == "Lissajous":
+            return np.sin(self.p * t + phase), self.size * np.sin(self.q * t)
+        if self.kind == "Rose":
+            r = self.size * np.cos(self.p / self.q * t)
+            return r * np.cos(t), r * np.sin(t)
+        if self.kind == "Epicycle":
+            return (np.cos(self.p * t) + self.size * np.cos(self.q * t + phase),
+                    np.sin(self.p * t) + self.size * np.sin(self.q * t + phase))
+        raise ValueError(f"Unknown curve kind: {self.kind!r}")
+
+    def extent(self):
+        """Half-widths (x, y) of a box around the origin holding the whole curve."""
+        if self.kind == "Lissajous":
+            return 1.0, abs(self.size)
+        if self.kind == "Rose":
+            return abs(self.size), abs(self.size)
+        return 1 + abs(self.size), 1 + abs(self.size)
+
+
+class View(NamedTuple):
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+
+def view(curve, zoom=1.0, center_x=0.0, center_y=0.0):
+    """Square view of the curve's extent (plus MARGIN) magnified zoom times around (center_x, center_y)."""
+    half = max(curve.extent()) * (1 + MARGIN) / zoom
+    return View(center_x - half, center_x + half, center_y - half, center_y + half)
+
+
+class Coarse(NamedTuple):
+    stride: int          # sample indices between coarse points (a power of two)
+    index: np.ndarray    # sample index of each coarse point
+    x: np.ndarray
+    y: np.ndarray
+
+
+class Detail(NamedTuple):
+    x: np.ndarray                  # decimated path, NaN between disjoint stretches
+    y: np.ndarray
+    stride: int                    # sample indices between refined points (1: every sample)
+    evaluated: int                 # samples evaluated for this view, besides the coarse pass
+    coverage: Optional[np.ndarray]  # (height, width) bool image of the covered pixels, for dense paths
+
+
+def _parameter(curve, samples, index):
+    return curve.period() * index / (samples - 1)
+
+
+@instrumentation.timed("compute")
+def coarse(curve, samples):
+    """The coarse pass over samples: every stride-th sample, and the last."""
+    samples = max(int(samples), 2)
+    stride = 1 << max(0, int(np.ceil(np.log2((samples - 1) / COARSE_POINTS))))
+    index = np.arange(0, samples, stride)
+    if index[-1] != samples - 1:
+        index = np.append(index, samples - 1)
+    x, y = curve.evaluate(_parameter(curve, samples, index))
+    return Coarse(stride, index, x, y)
+
+
+def _visible_segments(rough, bounds):
+    """Mask of the coarse segments that may pass through bounds, and their lengths."""
+    x0, x1, y0, y1 = rough.x[:-1], rough.x[1:], rough.y[:-1], rough.y[1:]
+    length = np.hypot(x1 - x0, y1 - y0)
+    # Between two coarse points the curve stays within about a segment length of them
+    visible = ((np.maximum(x0, x1) + length >= bounds.x_min) & (np.minimum(x0, x1) - length <= bounds.x_max)
+               & (np.maximum(y0, y1) + length >= bounds.y_min) & (np.minimum(y0, y1) - length <= bounds.y_max))
+    return visible, length
+
+
+def _refined_indices(rough, visible, stride):
+    """Sample indices every stride within the visible coarse segments, and their ends, in order."""
+    starts, ends = rough.index[:-1][visible], rough.index[1:][visible]
+    # One row per segment: its refined points, then its end if the next segment is not visible
+    rows = starts[:, None] + np.arange(0, rough.stride + 1, stride)
+    rows[:, -1] = ends
+    keep = rows < ends[:, None]
+    keep[:, -1] = ~np.append(visible[1:], False)[visible]
+    return rows[keep]
+
+
+def decimate(x, y, bounds, width_px, height_px):
+    """Indices of a path's points to draw at width_px x height_px over bounds.
+
+    Keeps the first point of each run of consecutive points in one pixel,
+    the first and last of each run outside the view on one side of it (a
+    segment between them cannot cross the view), every NaN, and the last point.
+    """
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    fx = (x - bounds.x_min) * (width_px / (bounds.x_max - bounds.x_min))
+    fy = (y - bounds.y_min) * (height_px / (bounds.y_max - bounds.y_min))
+    # Cohen-Sutherland outcode: 0 inside, one bit per side the point is beyond
+    outcode = (fx < 0) + 2 * (fx >= width_px) + 4 * (fy < 0) + 8 * (fy >= height_px)
+    nan = np.isnan(fx) | np.isnan(fy)
+    fx[nan] = fy[nan] = 0
+    cell = np.where(outcode == 0,
+                    np.clip(fx, 0, width_px - 1).astype(np.int64) * height_px
+                    + np.clip(fy, 0, height_px - 1).astype(np.int64),
+                    -outcode.astype(np.int64))
+    cell[nan] = -16
+    change = cell[1:] != cell[:-1]
+    keep = np.empty(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    keep[1:] = change
+    keep[:-1] |= change & (cell[:-1] < 0)
+    keep |= nan
+    return np.flatnonzero(keep)
+
+
+def _coverage(x, y, bounds, width_px, height_px):
+    fx = np.floor((x - bounds.x_min) * (width_px / (bounds.x_max - bounds.x_min)))
+    fy = np.floor((y - bounds.y_min) * (height_px / (bounds.y_max - bounds.y_min)))
+    inside = (fx >= 0) & (fx < width_px) & (fy >= 0) & (fy < height_px)
+    cells = fy[inside].astype(np.int64) * width_px + fx[inside].astype(np.int64)
+    covered = np.bincount(cells, minlength=width_px * height_px).astype(bool)
+    # Row 0 at the top, as images are drawn
+    return covered.reshape(height_px, width_px)[::-1]
+
+
+@instrumentation.timed("compute")
+def detail(curve, samples, bounds, width_px, height_px=None, rough=None, budget=DEFAULT_BUDGET):
+    """The curve's samples to draw over bounds in a width_px x height_px plot; see the module docstring.
+
+    rough is coarse(curve, samples), if already computed for another view.
+    """
+    samples = max(int(samples), 2)
+    height_px = height_px or width_px
+    rough = rough if rough is not None else coarse(curve, samples)
+    visible, length = _visible_segments(rough, bounds)
+    if not visible.any():
+        return Detail(np.empty(0), np.empty(0), rough.stride, 0, None)
+
+    # Longest visible step of the coarse pass, in pixels
+    step_px = length[visible].max() * width_px / (bounds.x_max - bounds.x_min)
+    stride = rough.stride
+    if stride > 1:
+        fine = int(2 ** np.floor(np.log2(max(stride / max(step_px, 1e-12), 1))))
+        affordable = 1 << max(0, int(np.ceil(np.log2(visible.sum() * stride / budget))))
+        stride = min(max(fine, affordable, 1), stride)
+    index = _refined_indices(rough, visible, stride)
+    x, y = curve.evaluate(_parameter(curve, samples, index))
+
+    # Break the path between disjoint stretches
+    gaps = np.flatnonzero(np.diff(index) > stride) + 1
+    x, y = np.insert(x, gaps, np.nan), np.insert(y, gaps, np.nan)
+    keep = decimate(x, y, bounds, width_px, height_px)
+    coverage = None
+    if len(keep) > MAX_LINE_POINTS:
+        coverage = _coverage(x, y, bounds, width_px, height_px)
+    return Detail(x[keep], y[keep], stride, len(index), coverage)
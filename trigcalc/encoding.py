@@ -0,0 +1,107 @@
+"""How server-rendered figures are encoded for the browser.
+
+An Encoding names the output format (PNG, JPEG or SVG), the pixel width
+raster figures are drawn at, and an optional byte budget. Pages pick one
+per rerun from the settings and the client's viewport (see for_page) and
+make it current around their render calls; the figure code reads it with
+current(). Its key() goes into the render-cache key, so different encodings
+of one state are cached separately.
+
+This module does not import matplotlib, so the pages can use it before a
+figure is drawn.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from . import settings
+
+FORMATS = ("png", "jpeg", "svg")
+
+# Widest image st.image shows as is; wider ones are resized and re-encoded
+# by Streamlit on every display
+MAX_WIDTH_PX = 1460
+
+# Share of the viewport width taken by a page's figure column (st.columns([1, 2]))
+COLUMN_FRACTION = 2 / 3
+
+# Viewport-derived widths are rounded up to this step, so clients with
+# similar windows share cache entries
+WIDTH_STEP_PX = 128
+
+MIN_WIDTH_PX = 384
+
+
+class Encoding(NamedTuple):
+    format: str = "png"
+    width_px: int = MAX_WIDTH_PX  # raster width; the DPI follows from the figure size
+    dpi: float = 0.0              # fixed raster DPI overriding width_px (0: unset)
+    quality: int = 85             # JPEG quality
+    max_bytes: int = 0            # payload budget (0: none)
+
+    def dpi_for(self, width_in):
+        """Raster DPI for a figure width_in inches wide."""
+        return self.dpi or self.width_px / width_in
+
+    def key(self):
+        """Render-cache params distinguishing this encoding's output from others'."""
+        key = {"image_format": self.format, "image_max_bytes": self.max_bytes}
+        if self.format != "svg":
+            key["image_dpi" if self.dpi else "image_width_px"] = self.dpi or self.width_px
+        if self.format == "jpeg":
+            key["image_quality"] = self.quality
+        return key
+
+
+def _header_float(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value.strip('"'))
+            except ValueError:
+                pass
+    return None
+
+
+def viewport_width_px(headers):
+    """Device-pixel width for a page figure from client hint headers, or None without hints.
+
+    Browsers send Sec-CH-Viewport-Width and Sec-CH-DPR only to servers that
+    ask for them (Accept-CH), e.g. through a reverse proxy in front of the
+    app.
+    """
+    viewport = _header_float(headers, "Sec-CH-Viewport-Width", "Viewport-Width")
+    if viewport is None:
+        return None
+    dpr = _header_float(headers, "Sec-CH-DPR", "DPR") or 1.0
+    width = viewport * dpr * COLUMN_FRACTION
+    width = -(-int(width) // WIDTH_STEP_PX) * WIDTH_STEP_PX
+    return max(MIN_WIDTH_PX, min(MAX_WIDTH_PX, width))
+
+
+def for_page(module_name, headers=None):
+    """The Encoding for a page module (e.g. "trigcalc.pages.waves") and the client's request headers."""
+    page = module_name.rsplit(".", 1)[-1]
+    fmt = settings.IMAGE_FORMATS.get(page, settings.IMAGE_FORMATS.get("default", "png"))
+    width = viewport_width_px(headers or {}) or settings.IMAGE_WIDTH_PX
+    return Encoding(format=fmt, width_px=min(int(width), MAX_WIDTH_PX), dpi=settings.IMAGE_DPI,
+                    quality=settings.JPEG_QUALITY, max_bytes=int(settings.IMAGE_MAX_KB * 1024))
+
+
+_current = contextvars.ContextVar("encoding", default=None)
+
+
+def current():
+    """The Encoding made current by use(), or the defaults from the settings."""
+    return _current.get() or for_page("default")
+
+
+@contextmanager
+def use(enc):
+    token = _current.set(enc)
+    try:
+        yield enc
+    finally:
+        _current.reset(token)
@@ -0,0 +1,361 @@
+"""Static site export of the pages with finite input spaces.
+
+Basic Trig Functions, Unit Circle Explorer and Inverse Functions have a
+finite set of widget states (see warmup.states). export() renders the
+figure and the result text (page_states.results) of every one of them
+across a process pool and
+writes a static site any plain file server or CDN can serve:
+
+    index.html            the three pages, their controls, and a manifest of
+                          every state's figure and result text; moving a
+                          control swaps in that state's pre-rendered figure
+    assets/<hash>.<ext>   the figures, named by a hash of their content
+
+Identical figures are stored once, and since a figure's name changes
+whenever its content does, assets can be cached by clients indefinitely.
+States already in a render disk cache (e.g. after a warm-up) are read from
+it instead of being rendered again. Live workers are then only needed for
+the continuous pages.
+
+Usage::
+
+    python -m trigcalc.export site/ --workers 4 --cache-dir /var/cache/trigcalc
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import encoding, page_states, settings, warmup
+from .render_cache import open_disk_cache
+
+# Content hash characters in asset names
+HASH_LENGTH = 16
+
+ASSET_DIR = "assets"
+
+# File extension of each image format
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "svg": "svg"}
+
+def _range(slider):
+    return {"min": slider.min, "max": slider.max, "step": slider.step, "value": slider.value}
+
+
+def controls(page):
+    """The page's widgets (page_states.WIDGETS) as the site draws them, in state key order."""
+    if page not in page_states.WIDGETS:
+        raise ValueError(f"Page {page!r} has no finite state space to export")
+    result = []
+    for name, widget in page_states.WIDGETS[page].items():
+        if isinstance(widget, page_states.Slider):
+            result.append({"name": name, "type": "range", "label": widget.label, **_range(widget)})
+        elif isinstance(widget, page_states.Checkbox):
+            result.append({"name": name, "type": "checkbox", "label": widget.label, "value": widget.value})
+        elif isinstance(widget, page_states.Select):
+            result.append({"name": name, "type": "select", "label": widget.label, "options": list(widget.options),
+                           "value": widget.options[0]})
+        else:
+            # A range whose bounds follow the leader's value
+            label = next(iter(widget.sliders.values())).label
+            result.append({"name": name, "type": "range", "label": label, "follows": widget.leader,
+                           "ranges": {value: _range(slider) for value, slider in widget.sliders.items()}})
+    return result
+
+
+def _key_part(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        # As JavaScript's String(Number(x)) prints slider values
+        return f"{value + 0.0:.12g}" if value != int(value) else str(int(value))
+    return str(value)
+
+
+def state_key(page, params):
+    """The site's key of a page state: its control values in control order, comma-separated."""
+    return ",".join(_key_part(params[control["name"]]) for control in controls(page))
+
+
+_disk = None
+
+
+def _init_worker(directory):
+    global _disk
+    if directory:
+        _disk = open_disk_cache(directory, settings.RENDER_CACHE_DIR_MB * 1024 * 1024)
+
+
+def _export_chunk(chunk):
+    """(figure bytes, result sections, whether it came from the disk cache) of each (page, params) of chunk."""
+    results = []
+    for page, params in chunk:
+        data = _disk.get(warmup.state_key(page, params)) if _disk is not None else None
+        cached = data is not None
+        if not cached:
+            with encoding.use(warmup.state_encoding(page)):
+                data = warmup.render_state(page, params)
+        results.append((bytes(data), page_states.results(page, params), cached))
+    return results
+
+
+def content_name(data, image_format):
+    """Asset file name of figure bytes: a hash of the content and the format's extension."""
+    return f"{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.{EXTENSIONS[image_format]}"
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def export(directory, pages=None, workers=None, cache_dir=None, report=None):
+    """Render every state of pages into a static site at directory; returns a summary dict.
+
+    report(done, total), if given, is called after every finished chunk.
+    """
+    pages = [page for page in warmup.PAGES if page in (pages or warmup.PAGES)]
+    todo = warmup.states(pages)
+    assets = os.path.join(directory, ASSET_DIR)
+    os.makedirs(assets, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    chunks = [todo[i:i + warmup.CHUNK_SIZE] for i in range(0, len(todo), warmup.CHUNK_SIZE)]
+    site = {page: {"controls": controls(page), "states": {}} for page in pages}
+    # Keys in state order whatever order the chunks finish in, so an unchanged site exports unchanged
+    for page, params in todo:
+        site[page]["states"][state_key(page, params)] = None
+    written, duplicates, cached, asset_bytes = set(), 0, 0, 0
+    done = 0
+    # spawn, as warmup: the workers start clean instead of copying this process
+    with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        futures = {pool.submit(_export_chunk, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            for (page, params), (data, sections, from_cache) in zip(futures[future], future.result()):
+                name = content_name(data, warmup.state_encoding(page).format)
+                if name in written:
+                    duplicates += 1
+                else:
+                    written.add(name)
+                    asset_bytes += len(data)
+                    path = os.path.join(assets, name)
+                    if not os.path.exists(path):  # same name, same content
+                        _write_atomic(path, data)
+                cached += from_cache
+                site[page]["states"][state_key(page, params)] = {"figure": f"{ASSET_DIR}/{name}", "sections": sections}
+            done += len(futures[future])
+            if report:
+                report(done, len(todo))
+
+    # Assets of earlier exports that no state uses any more
+    removed = 0
+    for name in os.listdir(assets):
+        if name not in written:
+            os.remove(os.path.join(assets, name))
+            removed += 1
+    # Written last, so the site never references a missing asset
+    _write_atomic(os.path.join(directory, "index.html"), render_index(site).encode())
+    return {"states": len(todo), "assets": len(written), "duplicates": duplicates, "from_cache": cached,
+            "removed": removed, "asset_bytes": asset_bytes, "workers": workers,
+            "seconds": time.perf_counter() - start, "directory": directory}
+
+
+def render_index(site):
+    """index.html of a site manifest: {page: {"controls": [...], "states": {key: state}}}."""
+    # "</" could close the script element early
+    manifest = json.dumps(site, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return _INDEX.replace("__SITE__", manifest)
+
+
+_INDEX = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Interactive Trigonometry Calculator</title>
+<style>
+  body { font-family: sans-serif; margin: 0 auto; max-width: 1400px; padding: 1rem 2rem; color: #262730; }
+  .main-header { font-size: 2.5rem; color: #1f77b4; text-align: center; margin-bottom: 2rem; }
+  .section-header { font-size: 1.5rem; color: #ff7f0e; margin-top: 1rem; }
+  nav button { font-size: 1rem; padding: 0.4rem 0.8rem; margin-right: 0.4rem; cursor: pointer; }
+  nav button.active { background: #ff4b4b; color: white; border-color: #ff4b4b; }
+  .columns { display: flex; gap: 2rem; align-items: flex-start; }
+  .controls { flex: 1; min-width: 16rem; }
+  .figure { flex: 2; }
+  .figure img { width: 100%; height: auto; }
+  label { display: block; margin: 0.8rem 0 0.3rem; }
+  input[type=range], select { width: 100%; }
+  .results p { margin: 0.3rem 0; white-space: pre-line; }
+  .results p.highlight { background: #dff3e3; color: #177233; padding: 0.6rem 0.8rem; border-radius: 0.4rem; }
+</style>
+</head>
+<body>
+<h1 class="main-header">🔢 Interactive Trigonometry Calculator</h1>
+<nav id="nav"></nav>
+<h2 class="section-header" id="title"></h2>
+<div class="columns">
+  <div class="controls"><div id="controls"></div><div class="results" id="results"></div></div>
+  <div class="figure"><img id="figure" alt=""></div>
+</div>
+<script>
+const SITE = __SITE__;
+const preloaded = new Set();
+let page = null;
+
+function keyPart(control, element) {
+  if (control.type === "checkbox") return element.checked ? "1" : "0";
+  if (control.type === "range") return String(Number(element.value));
+  return element.value;
+}
+
+function stateOf(inputs) {
+  return SITE[page].controls.map((c, i) => keyPart(c, inputs[i])).join(",");
+}
+
+function preload(key) {
+  const state = SITE[page].states[key];
+  if (state && !preloaded.has(state.figure)) {
+    preloaded.add(state.figure);
+    new Image().src = state.figure;
+  }
+}
+
+function show(inputs) {
+  const state = SITE[page].states[stateOf(inputs)];
+  const results = document.getElementById("results");
+  results.replaceChildren();
+  if (!state) return;
+  document.getElementById("figure").src = state.figure;
+  for (const [heading, lines] of state.sections) {
+    const h = document.createElement("h3");
+    h.textContent = heading;
+    results.append(h);
+    for (const [label, value, highlight] of lines) {
+      const p = document.createElement("p");
+      if (highlight) {
+        p.className = "highlight";
+        p.append(label + ": " + value);
+      } else if (label !== null) {
+        const b = document.createElement("b");
+        b.textContent = label + ":";
+        p.append(b, " " + value);
+      } else {
+        p.append(value);
+      }
+      results.append(p);
+    }
+  }
+  // The figures one slider step away are the likely next ones
+  SITE[page].controls.forEach((c, i) => {
+    if (c.type !== "range") return;
+    for (const delta of [-1, 1]) {
+      const element = inputs[i], saved = element.value;
+      element.value = Number(saved) + delta * Number(element.step);
+      if (element.value !== saved) preload(stateOf(inputs));
+      element.value = saved;
+    }
+  });
+}
+
+function applyRange(element, range) {
+  element.min = range.min;
+  element.max = range.max;
+  element.step = range.step;
+  element.value = range.value;
+}
+
+function openPage(name) {
+  page = name;
+  document.getElementById("title").textContent = name;
+  for (const button of document.getElementById("nav").children) {
+    button.classList.toggle("active", button.textContent === name);
+  }
+  const box = document.getElementById("controls");
+  box.replaceChildren();
+  const controls = SITE[name].controls;
+  const inputs = controls.map(c => {
+    const label = document.createElement("label");
+    let element;
+    if (c.type === "select") {
+      element = document.createElement("select");
+      for (const option of c.options) element.append(new Option(option, option));
+      element.value = c.value;
+    } else {
+      element = document.createElement("input");
+      element.type = c.type;
+      if (c.type === "checkbox") element.checked = c.value;
+      else if (!c.follows) applyRange(element, c);
+    }
+    if (c.type === "checkbox") {
+      label.append(element, " " + c.label);
+      box.append(label);
+    } else {
+      const value = document.createElement("span");
+      label.append(c.label + " ", value);
+      box.append(label, element);
+      if (c.type === "range") {
+        element.addEventListener("input", () => { value.textContent = element.value; });
+        element.refreshValue = () => { value.textContent = element.value; };
+      }
+    }
+    return element;
+  });
+  controls.forEach((c, i) => {
+    if (c.follows) {
+      const leader = inputs[controls.findIndex(other => other.name === c.follows)];
+      const follow = () => { applyRange(inputs[i], c.ranges[leader.value]); inputs[i].refreshValue(); };
+      leader.addEventListener("input", follow);
+      follow();
+    } else if (c.type === "range") {
+      inputs[i].refreshValue();
+    }
+  });
+  for (const element of inputs) element.addEventListener("input", () => show(inputs));
+  show(inputs);
+}
+
+for (const name of Object.keys(SITE)) {
+  const button = document.createElement("button");
+  button.textContent = name;
+  button.addEventListener("click", () => openPage(name));
+  document.getElementById("nav").append(button);
+}
+openPage(Object.keys(SITE)[0]);
+</script>
+</body>
+</html>
+"""
+
+
+def _print_progress(done, total):
+    print(f"\r{done:5}/{total} states", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="output directory of the site")
+    parser.add_argument("--page", action="append", choices=warmup.PAGES,
+                        help="page to export (repeatable; default: all pages listed above)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache-dir", default=settings.RENDER_CACHE_DIR,
+                        help="render disk cache to take already rendered states from (default: TRIG_RENDER_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    summary = export(args.directory, args.page, args.workers, args.cache_dir, report=_print_progress)
+    print(file=sys.stderr)
+    print(f"{summary['states']} states, {summary['assets']} assets ({summary['asset_bytes'] / 1e6:.1f} MB, "
+          f"{summary['duplicates']} duplicates stored once, {summary['from_cache']} from the disk cache), "
+          f"{summary['workers']} workers, {summary['seconds']:.1f}s -> {summary['directory']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
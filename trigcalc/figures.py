@@ -0,0 +1,199 @@
+"""Figure lifecycle for page rendering.
+
+Figures are created without pyplot, so they are never registered with its
+global figure manager, and are handed out from a small pool per page layout.
+Returned figures are cleared and kept for reuse (together with their Agg
+renderer buffer); figures beyond the pool limit are cleared and dropped
+immediately, so retained memory is bounded no matter how many reruns happen.
+"""
+
+import io
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from . import encoding, instrumentation, settings
+
+# layout name -> ((nrows, ncols), figsize in inches)
+LAYOUTS = {
+    "2x2": ((2, 2), (12, 10)),  # Basic Trig Functions, Inverse Functions
+    "1x1": ((1, 1), (10, 10)),  # Unit Circle Explorer, Parametric Curves
+    "1x2": ((1, 2), (12, 6)),   # Triangle Calculator
+    "2x1": ((2, 1), (12, 10)),  # Wave Functions
+}
+
+# Padding around the tight bounding box of a figure, as savefig's default
+PAD_INCHES = 0.1
+
+# Downscaling steps at most taken to bring a raster under the byte budget
+MAX_BUDGET_STEPS = 4
+
+
+def _tight_crop(fig, rgba):
+    """The part of a rendered RGBA buffer inside the figure's padded tight bounding box."""
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(PAD_INCHES)
+    height, width = rgba.shape[:2]
+    dpi = fig.dpi
+    left, right = max(0, int(np.floor(bbox.x0 * dpi))), min(width, int(np.ceil(bbox.x1 * dpi)))
+    top, bottom = max(0, height - int(np.ceil(bbox.y1 * dpi))), min(height, height - int(np.floor(bbox.y0 * dpi)))
+    return rgba[top:bottom, left:right]
+
+
+def _encode_image(image, enc):
+    buf = io.BytesIO()
+    if enc.format == "jpeg":
+        image.save(buf, format="JPEG", quality=enc.quality)
+    else:
+        image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def encode_rgba(rgba, enc=None):
+    """Encode an RGBA pixel array as PNG or JPEG, downscaling it until it fits the byte budget."""
+    from PIL import Image
+
+    enc = enc or encoding.current()
+    if enc.format == "svg":
+        enc = enc._replace(format="png")
+    with instrumentation.stage("encode"):
+        image = Image.fromarray(np.ascontiguousarray(rgba), "RGBA").convert("RGB")
+        data = _encode_image(image, enc)
+        for _ in range(MAX_BUDGET_STEPS):
+            if not enc.max_bytes or len(data) <= enc.max_bytes:
+                break
+            # Encoded size scales roughly with the pixel count
+            scale = 0.9 * (enc.max_bytes / len(data)) ** 0.5
+            image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                                 Image.LANCZOS)
+            data = _encode_image(image, enc)
+            instrumentation.count("budget_downscales")
+    instrumentation.count("encoded_bytes", len(data))
+    return data
+
+
+def encode_svg(fig):
+    """The figure as SVG bytes, or None if that exceeds the current byte budget."""
+    enc = encoding.current()
+    buf = io.BytesIO()
+    with instrumentation.stage("encode"):
+        fig.savefig(buf, format="svg", bbox_inches="tight", pad_inches=PAD_INCHES)
+    data = buf.getvalue()
+    if enc.max_bytes and len(data) > enc.max_bytes:
+        instrumentation.count("svg_over_budget")
+        return None
+    instrumentation.count("encoded_bytes", len(data))
+    return data
+
+
+def encode_figure(fig):
+    """Encode a figure in the current Encoding: SVG, or its tight raster at the figure's DPI."""
+    if encoding.current().format == "svg":
+        data = encode_svg(fig)
+        if data is not None:
+            return data
+    with instrumentation.stage("rasterize"):
+        fig.canvas.draw()
+        rgba = _tight_crop(fig, np.asarray(fig.canvas.buffer_rgba()))
+    return encode_rgba(rgba)
+
+
+def _renderer_bytes(fig):
+    renderer = getattr(fig.canvas, "renderer", None)
+    if renderer is None:
+        return 0
+    return int(renderer.width) * int(renderer.height) * 4
+
+
+class FigurePool:
+    """Bounded pool of reusable figures, keyed by layout name."""
+
+    def __init__(self, max_per_layout):
+        self.max_per_layout = int(max_per_layout)
+        self._idle = {name: [] for name in LAYOUTS}
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _new_figure(self, layout):
+        _, figsize = LAYOUTS[layout]
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig
+
+    def acquire(self, layout):
+        with self._lock:
+            idle = self._idle[layout]
+            if idle:
+                fig = idle.pop()
+                self.reused += 1
+            else:
+                fig = None
+                self.created += 1
+            self.in_use += 1
+        if fig is None:
+            fig = self._new_figure(layout)
+        (nrows, ncols), figsize = LAYOUTS[layout]
+        # tight_layout and bbox_inches="tight" may have touched size/layout
+        fig.set_size_inches(figsize)
+        axes = fig.subplots(nrows, ncols, squeeze=False)
+        return fig, axes
+
+    def release(self, fig, layout):
+        fig.clear()
+        with self._lock:
+            self.in_use -= 1
+            idle = self._idle[layout]
+            if len(idle) < self.max_per_layout:
+                idle.append(fig)
+                return
+            self.discarded += 1
+        # Over the pool limit: drop the renderer buffer now rather than at GC
+        fig.canvas.renderer = None
+        fig.canvas._lastKey = None
+
+    @contextmanager
+    def figure(self, layout):
+        """Yield (fig, axes) for a layout; axes is a 2-D array as from plt.subplots(squeeze=False)."""
+        fig, axes = self.acquire(layout)
+        try:
+            yield fig, axes
+        finally:
+            self.release(fig, layout)
+
+    def clear(self):
+        with self._lock:
+            for idle in self._idle.values():
+                idle.clear()
+
+    def stats(self):
+        with self._lock:
+            idle = [fig for figs in self._idle.values() for fig in figs]
+            return {
+                "live_figures": len(idle) + self.in_use,
+                "idle_figures": len(idle),
+                "in_use": self.in_use,
+                "bytes_retained": sum(_renderer_bytes(fig) for fig in idle),
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
+
+
+# Process-wide pool used by the page renderers
+figure_pool = FigurePool(settings.FIGURE_POOL_SIZE)
+
+
+def render_png(layout, draw, *args):
+    """Draw onto a pooled figure with draw(fig, axes, *args) and return it encoded (see encoding.current())."""
+    with figure_pool.figure(layout) as (fig, axes):
+        fig.set_dpi(encoding.current().dpi_for(fig.get_figwidth()))
+        with instrumentation.stage("figure"):
+            draw(fig, axes, *args)
+        with instrumentation.stage("tight_layout"):
+            fig.tight_layout()
+        return encode_figure(fig)
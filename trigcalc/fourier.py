@@ -0,0 +1,184 @@
+"""Multi-component wave synthesis and FFT decomposition.
+
+A signal is a sum of sinusoids A_k·sin(f_k·x + φ_k) plus a constant
+offset, with x in radians as on the Wave Functions page. Synthesis never
+loops over components in Python: integer harmonics on whole periods are
+placed in a spectrum and inverted with one real FFT, and any other set of
+components is evaluated as a matrix product over blocks of x. Decomposition
+goes the other way, keeping the strongest bins of the signal's real FFT.
+"""
+
+import io
+from typing import NamedTuple
+
+import numpy as np
+
+from . import instrumentation
+
+PRESETS = ["Square", "Sawtooth", "Triangle"]
+
+# Largest components × samples block evaluated at once by the matrix path
+MAX_BLOCK_ELEMENTS = 1 << 22
+
+
+class Components(NamedTuple):
+    amplitude: np.ndarray
+    frequency: np.ndarray
+    phase_deg: np.ndarray
+
+
+def components(amplitude, frequency, phase_deg=0.0):
+    """Build Components from scalars or arrays, broadcast to one length."""
+    amplitude, frequency, phase_deg = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(amplitude, dtype=float)),
+        np.atleast_1d(np.asarray(frequency, dtype=float)),
+        np.atleast_1d(np.asarray(phase_deg, dtype=float)),
+    )
+    return Components(amplitude.copy(), frequency.copy(), phase_deg.copy())
+
+
+def preset_components(name, count, amplitude=1.0):
+    """First count non-zero Fourier terms of a square, sawtooth or triangle wave of period 2π."""
+    if name == "Square":
+        n = 2 * np.arange(count) + 1
+        return components(amplitude * 4 / (np.pi * n), n)
+    if name == "Sawtooth":
+        n = np.arange(1, count + 1)
+        return components(amplitude * 2 * (-1.0) ** (n + 1) / (np.pi * n), n)
+    if name == "Triangle":
+        n = 2 * np.arange(count) + 1
+        return components(amplitude * 8 / np.pi**2 * (-1.0) ** ((n - 1) // 2) / n**2, n)
+    raise ValueError(f"Unknown preset: {name!r}")
+
+
+def synthesize(x, comps, vertical_shift=0.0):
+    """Evaluate the sum of comps at x as a matrix product, in bounded blocks of x."""
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.full(x.shape, float(vertical_shift))
+    k = len(comps.amplitude)
+    if k == 0:
+        return y
+    phase = np.radians(comps.phase_deg)[:, None]
+    block = max(MAX_BLOCK_ELEMENTS // k, 1)
+    for start in range(0, len(x), block):
+        xb = x[start:start + block]
+        y[start:start + block] += comps.amplitude @ np.sin(comps.frequency[:, None] * xb + phase)
+    return y
+
+
+def _is_harmonic(comps):
+    f = comps.frequency
+    return len(f) > 0 and np.all(f >= 0) and np.all(f == np.round(f))
+
+
+def synthesize_periodic(comps, samples_per_period, vertical_shift=0.0):
+    """One 2π period of integer-harmonic comps at samples_per_period points, by inverse real FFT."""
+    m = int(samples_per_period)
+    harmonics = comps.frequency.astype(np.int64)
+    if harmonics.max(initial=0) >= m // 2:
+        raise ValueError(f"{m} samples per period cannot represent harmonic {harmonics.max()}")
+    # sin(nθ + φ) = Re(e^{i(nθ + φ - π/2)}); irfft scales bin n by 2/m (bin 0 by 1/m)
+    coeff = comps.amplitude * np.exp(1j * (np.radians(comps.phase_deg) - np.pi / 2))
+    spectrum = np.zeros(m // 2 + 1, dtype=complex)
+    np.add.at(spectrum, harmonics, np.where(harmonics == 0, coeff.real * m, coeff * m / 2))
+    return np.fft.irfft(spectrum, n=m) + vertical_shift
+
+
+@instrumentation.timed("compute")
+def sample(comps, x_min, x_max, vertical_shift=0.0, min_samples=4096):
+    """Sample the sum of comps on [x_min, x_max] for plotting; returns (x, y).
+
+    Integer harmonics over a range of whole 2π periods use the FFT path;
+    anything else falls back to the blocked matrix product.
+    """
+    periods = (x_max - x_min) / (2 * np.pi)
+    whole = periods >= 1 and abs(periods - round(periods)) < 1e-9
+    if whole and _is_harmonic(comps):
+        periods = int(round(periods))
+        top = int(comps.frequency.max())
+        # Power of two with at least 8 samples per cycle of the top harmonic
+        m = 1 << int(np.ceil(np.log2(max(8 * (top + 1), min_samples / periods))))
+        one = synthesize_periodic(comps, m, vertical_shift)
+        y = np.append(np.tile(one, periods), one[0])
+        x = x_min + np.arange(len(y)) * (2 * np.pi / m)
+        return x, y
+    top = comps.frequency.max(initial=0)
+    n = max(min_samples, int(np.ceil(8 * top * (x_max - x_min) / (2 * np.pi))) + 1)
+    x = np.linspace(x_min, x_max, n)
+    return x, synthesize(x, comps, vertical_shift)
+
+
+def _strongest_bins(spectrum, n, count):
+    """Amplitudes of every rfft bin and the indices of the count strongest non-DC ones."""
+    amplitude = np.abs(spectrum) * 2 / n
+    amplitude[0] = 0.0
+    if n % 2 == 0:
+        amplitude[-1] /= 2  # the Nyquist bin is not mirrored
+    count = min(count, len(amplitude) - 1)
+    if count <= 0:
+        return amplitude, np.empty(0, dtype=np.int64)
+    top = np.argpartition(amplitude, -count)[-count:]
+    return amplitude, top[np.argsort(amplitude[top])[::-1]]
+
+
+@instrumentation.timed("compute")
+def decompose(y, spacing=1.0, count=10, x0=0.0):
+    """Find the count strongest sinusoids in samples y taken every spacing radians from x0.
+
+    Returns (Components, offset); frequencies are the FFT bin frequencies,
+    so a tone between bins is split over its neighbours.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    spectrum = np.fft.rfft(y)
+    amplitude, top = _strongest_bins(spectrum, n, count)
+    frequency = 2 * np.pi * top / (n * spacing)
+    # Bin phase is a cosine phase at x0; convert to the sine phase at x = 0
+    phase = np.angle(spectrum[top]) + np.pi / 2 - frequency * x0
+    phase_deg = np.degrees(np.angle(np.exp(1j * phase)))
+    return components(amplitude[top], frequency, phase_deg), spectrum[0].real / n
+
+
+@instrumentation.timed("compute")
+def reconstruct(y, count=10):
+    """Samples of y rebuilt from its offset and count strongest components (same bins as decompose)."""
+    y = np.asarray(y, dtype=float)
+    spectrum = np.fft.rfft(y)
+    _, top = _strongest_bins(spectrum, len(y), count)
+    kept = np.zeros_like(spectrum)
+    kept[0] = spectrum[0]
+    kept[top] = spectrum[top]
+    return np.fft.irfft(kept, n=len(y))
+
+
+def example_signal(samples=4096, spacing=np.pi / 256, noise=0.1, seed=0):
+    """A noisy sum of three sinusoids for trying out decomposition: returns (x, y)."""
+    x = np.arange(samples) * spacing
+    y = synthesize(x, components([1.0, 0.5, 0.25], [1, 3, 7], [0, 45, -90]), 0.5)
+    y += noise * np.random.default_rng(seed).standard_normal(samples)
+    return x, y
+
+
+def read_signal(data):
+    """Parse uploaded samples: .npy bytes, or CSV/text with a y column or x, y columns.
+
+    Returns (x, y), with x None when only y was given. Non-numeric rows
+    (such as a header) are skipped.
+    """
+    if data[:6] == b"\x93NUMPY":
+        values = np.load(io.BytesIO(data), allow_pickle=False)
+    else:
+        text = data.decode("utf-8", errors="replace")
+        values = np.genfromtxt(io.StringIO(text), delimiter="," if "," in text else None)
+    # A single number parses to a 0-d array
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.ndim == 2:
+        values = values[~np.isnan(values).any(axis=1)]
+    if values.ndim != 2 or values.shape[1] not in (1, 2) or len(values) < 4:
+        raise ValueError("Expected at least 4 rows of one (y) or two (x, y) numeric columns")
+    if values.shape[1] == 1:
+        return None, values[:, 0]
+    return values[:, 0], values[:, 1]
+
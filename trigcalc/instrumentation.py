@@ -0,0 +1,198 @@
+"""Per-rerun stage timings.
+
+Each page rerun runs inside rerun(page), which makes a RerunTimings the
+current one for the script thread. Code along the render path wraps its
+work in stage(name) or adds counters with count(name, value); both are
+no-ops outside a rerun, so the compute and plotting modules stay usable on
+their own. Finished reruns are aggregated per page and stage in a
+process-wide MetricsRegistry, which renders Prometheus text format, and can
+be appended to a JSON-lines log.
+
+Stages nest: "figure" includes any "compute" done while drawing, and
+"total" covers the whole page.
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the Prometheus histogram buckets for stage times
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar("rerun_timings", default=None)
+
+
+class RerunTimings:
+    """Stage durations (seconds) and counters of one page rerun."""
+
+    def __init__(self, page):
+        self.page = page
+        self.timestamp = time.time()
+        self.stages = {}
+        self.counters = {}
+        self._open = set()
+
+    @contextmanager
+    def stage(self, name):
+        if name in self._open:
+            # Re-entered (e.g. a timed function calling another): count once
+            yield
+            return
+        self._open.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._open.discard(name)
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_record(self):
+        return {"timestamp": self.timestamp, "page": self.page,
+                "stages": self.stages, "counters": self.counters}
+
+
+@contextmanager
+def stage(name):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    with timings.stage(name):
+        yield
+
+
+def count(name, value=1):
+    timings = _current.get()
+    if timings is not None:
+        timings.count(name, value)
+
+
+def timed(name):
+    """Decorator running the function inside stage(name)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def rerun(page, registry=None, log_path=None):
+    """Time one page rerun; on exit it is observed by registry and appended to log_path."""
+    timings = RerunTimings(page)
+    token = _current.set(timings)
+    try:
+        with timings.stage("total"):
+            yield timings
+    finally:
+        _current.reset(token)
+        if registry is not None:
+            registry.observe(timings)
+        if log_path:
+            append_jsonl(log_path, timings.as_record())
+
+
+_log_lock = threading.Lock()
+
+
+def append_jsonl(path, record):
+    line = json.dumps(record) + "\n"
+    with _log_lock:
+        with open(path, "a") as f:
+            f.write(line)
+
+
+class MetricsRegistry:
+    """Stage-time histograms and counter totals per page, across all sessions."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._stages = {}    # (page, stage) -> [bucket counts..., sum, count]
+        self._counters = {}  # (page, name) -> total
+        self._reruns = {}    # page -> count
+        self._lock = threading.Lock()
+
+    def observe(self, timings):
+        with self._lock:
+            self._reruns[timings.page] = self._reruns.get(timings.page, 0) + 1
+            for name, seconds in timings.stages.items():
+                hist = self._stages.setdefault((timings.page, name), [0] * len(self.buckets) + [0.0, 0])
+                for i, bound in enumerate(self.buckets):
+                    if seconds <= bound:
+                        hist[i] += 1
+                hist[-2] += seconds
+                hist[-1] += 1
+            for name, value in timings.counters.items():
+                key = (timings.page, name)
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self):
+        """{page: {stage: mean seconds}} over all observed reruns."""
+        with self._lock:
+            result = {}
+            for (page, name), hist in self._stages.items():
+                result.setdefault(page, {})[name] = hist[-2] / hist[-1]
+            return result
+
+    def prometheus_text(self):
+        def labels(**values):
+            return ",".join(f'{k}="{_escape(v)}"' for k, v in values.items())
+
+        lines = ["# HELP trig_reruns_total Page reruns observed.", "# TYPE trig_reruns_total counter"]
+        with self._lock:
+            for page, n in sorted(self._reruns.items()):
+                lines.append(f"trig_reruns_total{{{labels(page=page)}}} {n}")
+
+            lines += ["# HELP trig_stage_seconds Time spent per rerun in each render stage.",
+                      "# TYPE trig_stage_seconds histogram"]
+            for (page, name), hist in sorted(self._stages.items()):
+                for bound, n in zip(self.buckets, hist):
+                    lines.append(f"trig_stage_seconds_bucket{{{labels(page=page, stage=name, le=bound)}}} {n}")
+                lines.append(f"trig_stage_seconds_bucket{{{labels(page=page, stage=name, le='+Inf')}}} {hist[-1]}")
+                lines.append(f"trig_stage_seconds_sum{{{labels(page=page, stage=name)}}} {hist[-2]}")
+                lines.append(f"trig_stage_seconds_count{{{labels(page=page, stage=name)}}} {hist[-1]}")
+
+            lines += ["# HELP trig_rerun_counter_total Per-rerun counters (payload bytes, cache hits, ...).",
+                      "# TYPE trig_rerun_counter_total counter"]
+            for (page, name), total in sorted(self._counters.items()):
+                lines.append(f"trig_rerun_counter_total{{{labels(page=page, name=name)}}} {total}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def serve_metrics(registry, port, host="127.0.0.1"):
+    """Serve registry.prometheus_text() at /metrics from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="trig-metrics", daemon=True).start()
+    return server
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,219 @@
+"""Out-of-core inverse trig evaluation for large binary arrays.
+
+Evaluates arcsin, arccos or arctan of every value of a raw binary or .npy
+file, as the Inverse Functions page does for one value, and verifies it the
+same way: the matching forward function is applied to the result and
+compared with the input. Input and outputs are memory-mapped and processed
+in blocks small enough to stay in cache, so files of billions of values
+are handled in a few megabytes of working memory per thread; the threads
+each take a contiguous span of the file (NumPy releases the GIL in the
+ufuncs).
+
+Values without a result are counted, not just left as NaN in the output:
+``nan`` inputs, ``out_of_domain`` inputs (outside [-1, 1] for arcsin and
+arccos) and ``infinite`` inputs of arctan, whose result cannot be verified.
+The absolute round-trip error of every other value goes into streaming
+statistics: count, max, mean and a histogram over powers of two.
+
+Usage::
+
+    python -m trigcalc.inverse_batch arcsin sensor.npy --degrees degrees.npy --radians radians.npy --threads 4
+    python -m trigcalc.inverse_batch arctan dump.bin --dtype float32 --offset 64 --degrees degrees.npy
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .compute import FORWARD_UFUNCS, INVERSE_FUNCTIONS, INVERSE_UFUNCS
+
+# Elements per block: a few 512 KB float64 work arrays stay in L2/L3
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Histogram bin of an error e > 0 is its binary exponent: e in [2**(k-1), 2**k)
+_MIN_EXPONENT = np.finfo(float).minexp - np.finfo(float).nmant  # -1074, the smallest subnormal
+_MAX_EXPONENT = np.finfo(float).maxexp
+_EXPONENTS = _MAX_EXPONENT - _MIN_EXPONENT + 1
+
+
+class RoundTripStats:
+    """Streaming statistics of absolute round-trip errors; mergeable across threads."""
+
+    def __init__(self):
+        self.count = 0
+        self.zeros = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Bin k - _MIN_EXPONENT counts the nonzero errors in [2**(k-1), 2**k)
+        self.histogram = np.zeros(_EXPONENTS, dtype=np.int64)
+
+    def add(self, errors):
+        """Record a 1-D array of finite errors."""
+        if not len(errors):
+            return
+        self.count += len(errors)
+        self.total += float(errors.sum())
+        self.max = max(self.max, float(errors.max()))
+        nonzero = errors[errors != 0]
+        self.zeros += len(errors) - len(nonzero)
+        exponents = np.frexp(nonzero)[1]
+        self.histogram += np.bincount(exponents - _MIN_EXPONENT, minlength=_EXPONENTS)
+
+    def merge(self, other):
+        self.count += other.count
+        self.zeros += other.zeros
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float("nan")
+
+    def bins(self):
+        """(upper bound, count) of every non-empty bin, the zero errors first with bound 0."""
+        rows = [(0.0, self.zeros)] if self.zeros else []
+        for index in np.flatnonzero(self.histogram):
+            rows.append((float(np.ldexp(1.0, int(index) + _MIN_EXPONENT)), int(self.histogram[index])))
+        return rows
+
+    def as_dict(self):
+        return {"count": self.count, "max": self.max, "mean": self.mean,
+                "histogram": [{"below": bound, "count": count} for bound, count in self.bins()]}
+
+
+class _Scratch:
+    """Per-thread work arrays of one block."""
+
+    def __init__(self, block_size):
+        self.x = np.empty(block_size)
+        self.radians = np.empty(block_size)
+        self.error = np.empty(block_size)
+        self.mask = np.empty(block_size, dtype=bool)
+
+
+def _evaluate_span(function_type, x, radians_out, degrees_out, start, stop, block_size):
+    """Evaluate x[start:stop] block by block; returns (counts, RoundTripStats) of the span."""
+    inverse, forward = INVERSE_UFUNCS[function_type], FORWARD_UFUNCS[function_type]
+    scratch = _Scratch(min(block_size, max(stop - start, 1)))
+    counts = {"nan": 0, "out_of_domain": 0, "infinite": 0}
+    stats = RoundTripStats()
+    for lo in range(start, stop, block_size):
+        hi = min(lo + block_size, stop)
+        n = hi - lo
+        xs, mask, error = scratch.x[:n], scratch.mask[:n], scratch.error[:n]
+        np.copyto(xs, x[lo:hi], casting="unsafe")  # the one read of the input block
+        # Write float64 radians straight into the output mapping
+        direct = radians_out is not None and radians_out.dtype == np.float64
+        radians = radians_out[lo:hi] if direct else scratch.radians[:n]
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            inverse(xs, out=radians)
+            forward(radians, out=error)
+            np.subtract(error, xs, out=error)
+            np.abs(error, out=error)
+
+        nan_inputs = int(np.count_nonzero(np.isnan(xs, out=mask)))
+        counts["nan"] += nan_inputs
+        counts["out_of_domain"] += int(np.count_nonzero(np.isnan(radians, out=mask))) - nan_inputs
+        if function_type == "arctan":
+            counts["infinite"] += int(np.count_nonzero(np.isinf(xs, out=mask)))
+        # NaN where there is no result, inf for infinite inputs: neither is an error sample
+        stats.add(error[np.isfinite(error, out=mask)])
+
+        if radians_out is not None and not direct:
+            np.copyto(radians_out[lo:hi], radians, casting="unsafe")
+        if degrees_out is not None:
+            np.multiply(radians, 180.0 / np.pi, out=degrees_out[lo:hi], casting="unsafe")
+    return counts, stats
+
+
+def open_input(path, dtype=None, offset=0):
+    """Read-only 1-D memory map of a .npy file, or of a raw binary file of dtype values after offset bytes."""
+    if path.endswith(".npy"):
+        if dtype is not None or offset:
+            raise ValueError(".npy files carry their own dtype and header; dtype and offset are for raw files")
+        array = np.load(path, mmap_mode="r")
+        if not array.flags.c_contiguous:
+            raise ValueError(f"{path} is stored in Fortran order; save it C-contiguous")
+        return array.reshape(-1)
+    return np.memmap(path, dtype=np.dtype(dtype or np.float64), mode="r", offset=offset)
+
+
+def open_output(path, length, dtype=np.float64):
+    """Writable 1-D memory map of length values: a .npy file, or a raw binary file for any other extension."""
+    if path.endswith(".npy"):
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(length,))
+    return np.memmap(path, dtype=dtype, mode="w+", shape=(length,))
+
+
+def evaluate_file(function_type, input_path, radians_path=None, degrees_path=None, dtype=None, offset=0,
+                  output_dtype=np.float64, block_size=DEFAULT_BLOCK_SIZE, threads=1):
+    """Evaluate function_type over input_path into the optional output files; returns a summary dict.
+
+    With threads > 1, each thread evaluates one contiguous span of the input.
+    """
+    if function_type not in INVERSE_FUNCTIONS:
+        raise ValueError(f"Unknown inverse function: {function_type!r}")
+    x = open_input(input_path, dtype, offset)
+    n = len(x)
+    radians_out = open_output(radians_path, n, output_dtype) if radians_path else None
+    degrees_out = open_output(degrees_path, n, output_dtype) if degrees_path else None
+
+    blocks = -(-n // block_size)
+    threads = max(1, min(threads, blocks))
+    # Span boundaries on block multiples, so every block but the last is full
+    bounds = [min(n, block_size * (blocks * i // threads)) for i in range(threads + 1)]
+    spans = [(function_type, x, radians_out, degrees_out, lo, hi, block_size)
+             for lo, hi in zip(bounds, bounds[1:])]
+    if threads == 1:
+        results = [_evaluate_span(*spans[0])]
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(lambda span: _evaluate_span(*span), spans))
+
+    counts = {"nan": 0, "out_of_domain": 0, "infinite": 0}
+    stats = RoundTripStats()
+    for span_counts, span_stats in results:
+        for name, value in span_counts.items():
+            counts[name] += value
+        stats.merge(span_stats)
+    for out in (radians_out, degrees_out):
+        if out is not None:
+            out.flush()
+    return {"function": function_type, "values": n, **counts, "blocks": blocks, "error": stats.as_dict()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate and verify an inverse trig function over a binary array file.")
+    parser.add_argument("function", choices=INVERSE_FUNCTIONS)
+    parser.add_argument("input", help="input .npy file, or raw binary file of --dtype values")
+    parser.add_argument("--radians", help="output file of results in radians (.npy, or raw binary)")
+    parser.add_argument("--degrees", help="output file of results in degrees (.npy, or raw binary)")
+    parser.add_argument("--dtype", help="value type of a raw input file (default: float64)")
+    parser.add_argument("--offset", type=int, default=0, help="header bytes to skip in a raw input file")
+    parser.add_argument("--output-dtype", default="float64", choices=["float32", "float64"])
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--threads", type=int, default=1, help="threads (default: 1)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = evaluate_file(args.function, args.input, args.radians, args.degrees, args.dtype, args.offset,
+                            np.dtype(args.output_dtype), args.block_size, args.threads)
+    seconds = time.perf_counter() - start
+    error = summary["error"]
+    print(f"Evaluated {summary['values']:,} values in {seconds:.2f}s "
+          f"({summary['values'] / max(seconds, 1e-9) / 1e6:.1f} M/s, {summary['blocks']} blocks)")
+    print(f"No result: {summary['nan']:,} NaN, {summary['out_of_domain']:,} out of domain, "
+          f"{summary['infinite']:,} infinite (not verified)")
+    print(f"Round-trip error over {error['count']:,} values: max {error['max']:.3g}, mean {error['mean']:.3g}")
+    for row in error["histogram"]:
+        label = "= 0" if row["below"] == 0 else f"< {row['below']:.3g}"
+        print(f"  {label:>12}  {row['count']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Layered rendering: a static background blitted under per-render artists.
+
+A LayeredFigure draws everything that never changes once, rasterizes it and
+keeps the pixels. Each render restores those pixels and draws only the
+dynamic artists on top, so matplotlib redraws a handful of lines and labels
+instead of the whole figure.
+"""
+
+import io
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from . import encoding, instrumentation
+from .figures import LAYOUTS, PAD_INCHES, encode_rgba
+
+
+class LayeredFigure:
+    """Figure whose static layer is rasterized once and reused for every render.
+
+    draw_static(fig, axes) draws the background and returns a state object
+    holding the dynamic artists (created with animated=True so the static
+    pass skips them). draw_dynamic(state, axes, *args) updates them and
+    returns the artists to draw on top of the background.
+    """
+
+    def __init__(self, layout, draw_static, draw_dynamic, dpi=None):
+        (nrows, ncols), figsize = LAYOUTS[layout]
+        self.figure = Figure(figsize=figsize, dpi=dpi or encoding.current().dpi_for(figsize[0]))
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.axes = self.figure.subplots(nrows, ncols, squeeze=False)
+        self._draw_dynamic = draw_dynamic
+        self._lock = threading.Lock()
+
+        self.state = draw_static(self.figure, self.axes)
+        self.figure.tight_layout()
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def render(self, *args):
+        """Blit the background, draw the dynamic layer for args and return it encoded (see encoding.current())."""
+        with self._lock:
+            if encoding.current().format == "svg":
+                data = self._render_svg(args)
+                if data is not None:
+                    return data
+            return encode_rgba(self._draw(args))
+
+    def pixels(self, *args):
+        """RGBA array of the figure for args (a copy; the canvas buffer is reused by the next render)."""
+        with self._lock:
+            return self._draw(args).copy()
+
+    def _draw(self, args):
+        with instrumentation.stage("figure"):
+            self.canvas.restore_region(self._background)
+            for artist in self._draw_dynamic(self.state, self.axes, *args):
+                artist.set_animated(True)
+                artist.axes.draw_artist(artist)
+        with instrumentation.stage("rasterize"):
+            return np.asarray(self.canvas.buffer_rgba())
+
+    def _render_svg(self, args):
+        # Vector output cannot reuse the pixels: draw both layers into the SVG
+        with instrumentation.stage("figure"):
+            artists = self._draw_dynamic(self.state, self.axes, *args)
+            for artist in artists:
+                artist.set_animated(False)
+        buf = io.BytesIO()
+        try:
+            with instrumentation.stage("encode"):
+                self.figure.savefig(buf, format="svg", bbox_inches="tight", pad_inches=PAD_INCHES)
+        finally:
+            for artist in artists:
+                artist.set_animated(True)
+        data = buf.getvalue()
+        max_bytes = encoding.current().max_bytes
+        if max_bytes and len(data) > max_bytes:
+            instrumentation.count("svg_over_budget")
+            return None
+        instrumentation.count("encoded_bytes", len(data))
+        return data
+
+
+class LayerCache:
+    """Process-wide LayeredFigure instances, built on first use per key."""
+
+    def __init__(self):
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        # The static layer is rasterized at the current encoding's resolution
+        enc = encoding.current()
+        key = (key, enc.dpi, enc.width_px)
+        with self._lock:
+            layered = self._figures.get(key)
+            if layered is None:
+                layered = self._figures[key] = build()
+            return layered
+
+    def __len__(self):
+        return len(self._figures)
+
+
+layer_cache = LayerCache()
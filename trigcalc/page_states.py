@@ -0,0 +1,165 @@
+"""Widgets and result text of the pages with finite input spaces.
+
+Basic Trig Functions, Unit Circle Explorer and Inverse Functions have a
+finite set of widget states. Their widgets and result text are defined here
+once, for the pages that show them, the warm-up that pre-renders every
+state (warmup.py) and the static site export (export.py):
+
+- WIDGETS: each page's widgets, in the order the page shows them, and
+  states(): every combination of values they can reach
+- results(): the result text of a state, as sections of lines
+
+Streamlit is not imported here; the pages pass the specs on to st.slider,
+st.checkbox and st.selectbox.
+"""
+
+from itertools import product
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from . import compute, precision, special_angles
+
+
+class Slider(NamedTuple):
+    """st.slider(*slider) arguments."""
+    label: str
+    min: float
+    max: float
+    value: float
+    step: float
+
+    def values(self):
+        """Every value the slider gives, min to max: ints for an int slider, floats rounded to the step's decimals."""
+        if all(isinstance(v, int) for v in self[1:]):
+            return list(range(self.min, self.max + 1, self.step))
+        decimals = len(repr(float(self.step)).partition(".")[2])
+        count = int(round((self.max - self.min) / self.step))
+        return [round(self.min + i * self.step, decimals) for i in range(count + 1)]
+
+
+class Checkbox(NamedTuple):
+    """st.checkbox(*checkbox) arguments."""
+    label: str
+    value: bool
+
+    def values(self):
+        return [True, False]
+
+
+class Select(NamedTuple):
+    """st.selectbox(*select) arguments; the first option is the default."""
+    label: str
+    options: tuple
+
+    def values(self):
+        return list(self.options)
+
+
+class Follows(NamedTuple):
+    """A slider whose bounds depend on the value of another widget of the page."""
+    leader: str
+    sliders: dict  # leader value -> Slider
+
+
+# Inverse Functions: the input slider per function, and its domain and range
+INVERSE_INPUTS = {
+    "arcsin": Slider("Input value", -1.0, 1.0, 0.5, 0.01),
+    "arccos": Slider("Input value", -1.0, 1.0, 0.5, 0.01),
+    "arctan": Slider("Input value", -10.0, 10.0, 1.0, 0.1),
+}
+INVERSE_DOMAINS = {"arcsin": ("[-1, 1]", "[-π/2, π/2]"), "arccos": ("[-1, 1]", "[0, π]"),
+                   "arctan": ("(-∞, ∞)", "(-π/2, π/2)")}
+
+# Page title -> widget name -> widget, in page order; the names are the render-cache params
+WIDGETS = {
+    "Basic Trig Functions": {
+        "angle_deg": Slider("Angle (degrees)", -360, 360, 45, 15),
+    },
+    "Unit Circle Explorer": {
+        "angle_deg": Slider("Angle (degrees)", 0, 360, 45, 5),
+        "show_reference": Checkbox("Show reference angles", True),
+        "show_quadrants": Checkbox("Show quadrant labels", True),
+    },
+    "Inverse Functions": {
+        "function_type": Select("Function", tuple(compute.INVERSE_FUNCTIONS)),
+        "input_val": Follows("function_type", INVERSE_INPUTS),
+    },
+}
+
+
+def states(page):
+    """Every widget state of a page as a params dict.
+
+    Sliders vary fastest, so consecutive states share the figure layers
+    that depend on the other widgets only.
+    """
+    widgets = WIDGETS[page]
+    free = sorted((name for name, widget in widgets.items() if not isinstance(widget, Follows)),
+                  key=lambda name: isinstance(widgets[name], Slider))
+    result = []
+    for values in product(*(widgets[name].values() for name in free)):
+        params = dict(zip(free, values))
+        followers = {name: widget.sliders[params[widget.leader]].values()
+                     for name, widget in widgets.items() if isinstance(widget, Follows)}
+        for follower_values in product(*followers.values()):
+            state = {**params, **dict(zip(followers, follower_values))}
+            result.append({name: state[name] for name in widgets})
+    return result
+
+
+class Line(NamedTuple):
+    label: Optional[str]     # None: the value is shown on its own
+    value: str
+    highlight: bool = False  # shown as a highlighted box (st.success on the page)
+
+
+def basic_trig_results(angle_deg):
+    """Result sections of Basic Trig Functions: [(heading, [Line, ...]), ...]."""
+    sin, cos, tan = precision.trig_values(angle_deg)
+    return [("Results", [
+        Line("Angle", f"{angle_deg}° = {np.radians(angle_deg):.4f} radians"),
+        Line(f"sin({angle_deg}°)", f"{sin.value:.4f}"),
+        Line(f"cos({angle_deg}°)", f"{cos.value:.4f}"),
+        Line(f"tan({angle_deg}°)", f"{tan.value:.4f}" if np.isfinite(tan.value) else "undefined"),
+    ])]
+
+
+def unit_circle_results(angle_deg):
+    """Result sections of Unit Circle Explorer."""
+    sin_val, cos_val, _ = compute.trig_values(angle_deg)
+    lines = [Line("Quadrant", compute.quadrant_name(angle_deg)),
+             Line("Coordinates", f"({cos_val:.3f}, {sin_val:.3f})")]
+    special = special_angles.table().match_angle(angle_deg)
+    if special is not None:
+        radians = "2π" if angle_deg == 360 else special.radians
+        tan = special.tan.text if special.tan else "undefined"
+        lines.append(Line("Special angle", f"{angle_deg}° = {radians}  \n"
+                                           f"sin = {special.sin.text}, cos = {special.cos.text}, tan = {tan}", True))
+    return [("Information", lines)]
+
+
+def inverse_results(function_type, input_val, round_trip=None):
+    """Result sections of Inverse Functions; round_trip is compute.round_trip(function_type, input_val), if known."""
+    result_rad, verification, _ = round_trip or compute.round_trip(function_type, input_val)
+    lines = [Line("Input", f"{input_val}"),
+             Line(f"{function_type}({input_val})", f"{result_rad:.4f} radians"),
+             Line(f"{function_type}({input_val})", f"{np.degrees(result_rad):.2f}°")]
+    special = special_angles.table().match_value(function_type, input_val, 1e-9)
+    if special is not None:
+        lines.append(Line("Exact", f"{function_type}({special.x.text}) = {special.radians}"))
+    domain, value_range = INVERSE_DOMAINS[function_type]
+    return [("Results", lines),
+            ("Function Properties", [Line("Domain", domain), Line("Range", value_range)]),
+            ("Verification", [Line(None, f"{function_type[3:]}({result_rad:.4f}) = {verification:.4f}")])]
+
+
+def results(page, params):
+    """Result sections of a page state."""
+    if page == "Basic Trig Functions":
+        return basic_trig_results(params["angle_deg"])
+    if page == "Unit Circle Explorer":
+        return unit_circle_results(params["angle_deg"])
+    if page == "Inverse Functions":
+        return inverse_results(params["function_type"], params["input_val"])
+    raise ValueError(f"Page {page!r} has no finite state space")
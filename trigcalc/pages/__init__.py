@@ -0,0 +1,237 @@
+"""Page registry for the app sidebar.
+
+Each page lives in its own module and is imported only when its sidebar
+entry is selected, so matplotlib and the plotting code are not loaded at
+startup. Pages run as fragments (see settings.PAGE_FRAGMENTS): moving one
+of a page's widgets reruns that page only.
+"""
+
+import importlib
+import json
+import time
+
+import streamlit as st
+
+from .. import encoding, instrumentation, settings
+from ..render_cache import RenderCache, open_disk_cache
+
+# Sidebar title -> module defining render()
+PAGES = {
+    "Basic Trig Functions": "trigcalc.pages.basic_trig",
+    "Unit Circle Explorer": "trigcalc.pages.unit_circle",
+    "Triangle Calculator": "trigcalc.pages.triangle",
+    "Wave Functions": "trigcalc.pages.waves",
+    "Inverse Functions": "trigcalc.pages.inverse",
+    "Parametric Curves": "trigcalc.pages.parametric",
+}
+
+
+@st.cache_resource
+def get_render_cache():
+    # One cache per server process, shared by all sessions
+    # The disk tier, if configured, is shared with the other server processes
+    disk = None
+    if settings.RENDER_CACHE_DIR:
+        disk = open_disk_cache(settings.RENDER_CACHE_DIR, settings.RENDER_CACHE_DIR_MB * 1024 * 1024)
+    return RenderCache(max_bytes=settings.RENDER_CACHE_MB * 1024 * 1024, disk=disk)
+
+
+def uses_client_charts(module_name):
+    """Whether the page module draws its charts in the browser (see TRIG_CLIENT_CHARTS)."""
+    pages = settings.CLIENT_CHART_PAGES
+    return "all" in pages or module_name.rsplit(".", 1)[-1] in pages
+
+
+@st.cache_resource
+def start_metrics_server():
+    # Once per server process; the registry is shared by all sessions
+    return instrumentation.serve_metrics(instrumentation.registry, settings.METRICS_PORT)
+
+
+@st.cache_resource
+def start_service():
+    # Once per server process, next to the app on the same host
+    from .. import service
+    return service.serve_in_background(settings.SERVICE_PORT)
+
+
+@st.cache_resource
+def start_warmup():
+    # Once per server process; returns the warm-up's Progress
+    from .. import warmup
+    return warmup.warm_in_background(settings.RENDER_CACHE_DIR, settings.WARMUP_CPU_BUDGET)
+
+
+def image_encoding(module_name):
+    """Encoding of the page module's figures, from the settings and this client's viewport hints."""
+    # st.context is new in Streamlit 1.37; older versions get the configured width
+    return encoding.for_page(module_name, getattr(getattr(st, "context", None), "headers", None))
+
+
+def render_figure(page, params, render, enc):
+    """Encoded figure of a page state from the render cache, calling render() with enc current on a miss."""
+    with encoding.use(enc):
+        return get_render_cache().get_or_render(page, {**params, **enc.key()}, render)
+
+
+def show_results(sections):
+    """Display result sections as page_states returns them: [(heading, [Line, ...]), ...]."""
+    for heading, lines in sections:
+        st.subheader(heading)
+        for line in lines:
+            if line.highlight:
+                st.success(f"{line.label}: {line.value}")
+            else:
+                st.write(f"**{line.label}:** {line.value}" if line.label else line.value)
+
+
+def show_image(data):
+    """Display an encoded figure (PNG, JPEG, GIF or SVG bytes, or a memoryview of them), recording the payload size."""
+    instrumentation.count("payload_bytes", len(data))
+    with instrumentation.stage("display"):
+        # st.image only takes bytes; this is the one copy out of the shared mapping
+        data = data.tobytes() if isinstance(data, memoryview) else data
+        if data[:4] == b"\x89PNG":
+            st.image(data, output_format="PNG")
+        elif data[:2] == b"\xff\xd8":
+            st.image(data, output_format="JPEG")
+        elif data[:4] == b"GIF8":
+            st.image(data)  # passed through as is, so it stays animated
+        else:
+            st.image(data.decode())  # SVG markup
+
+
+def animation_controls(page, **options):
+    """Widgets of a page's angle-sweep animation; returns (animation.Sweep, stream) or None when it is off.
+
+    options are passed on to the Sweep (e.g. the Unit Circle checkboxes).
+    """
+    if not st.checkbox("Animate angle sweep", False):
+        return None
+    from .. import animation
+
+    low, high = animation.SWEEP_RANGES[page]
+    start, stop = st.slider("Sweep range (degrees)", low, high, (max(low, 0), min(high, 360)))
+    step = st.select_slider("Step (degrees)", animation.STEPS, 1)
+    fps = st.slider("Frames per second", 5, animation.MAX_FPS, 25, 5)
+    stream = st.checkbox("Show frames while rendering", True)
+    sweep = animation.Sweep(page, start, stop, step, fps, width_px=settings.ANIMATION_WIDTH_PX, **options)
+    return sweep, stream
+
+
+def show_animation(page, sweep, stream=False):
+    """Display an angle-sweep animation from the render cache, rendering it on a miss.
+
+    With stream, the frames of a render are shown as they arrive, before the
+    finished animation replaces them; frames arriving faster than sweep.fps
+    are skipped rather than waited for.
+    """
+    from .. import animation
+
+    cache = get_render_cache()
+    params = sweep.params()
+    data = cache.get(page, params)
+    if data is None:
+        instrumentation.count("render_cache_misses")
+        placeholder = st.empty()
+        due = time.perf_counter()
+
+        def show_frame(angle, frame):
+            nonlocal due
+            now = time.perf_counter()
+            if now >= due:
+                placeholder.image(frame, caption=f"Rendering: {angle}°")
+                due = now + 1 / sweep.fps
+
+        on_frame = show_frame if stream else None
+        try:
+            data = animation.render(sweep, on_frame=on_frame)
+        except ValueError as e:
+            placeholder.empty()
+            st.error(f"Cannot animate this sweep: {e}")
+            return
+        cache.put(page, params, data)
+        placeholder.empty()
+    else:
+        instrumentation.count("render_cache_hits")
+    show_image(data)
+    st.caption(f"{len(sweep.angles())} frames from {sweep.start}° to {sweep.stop}° "
+               f"in {sweep.step}° steps at {sweep.fps} fps")
+
+
+def cached_spec(page, params, build):
+    """Vega-Lite spec of a page state, built by build() once and shared through the render cache as JSON."""
+    params = {**params, "output": "vega-lite", "width_px": settings.CLIENT_CHART_WIDTH_PX}
+    data = get_render_cache().get_or_render(page, params, lambda: json.dumps(build()).encode())
+    return json.loads(data.tobytes() if isinstance(data, memoryview) else data)
+
+
+def show_chart(spec):
+    """Display a client-side Vega-Lite spec, recording its serialized size."""
+    instrumentation.count("payload_bytes", len(json.dumps(spec)))
+    with instrumentation.stage("display"):
+        st.vega_lite_chart(spec=spec)
+
+
+def show_timings(timings):
+    """Sidebar panel with this rerun's stage timings next to the page's running means."""
+    means = instrumentation.registry.summary().get(timings.page, {})
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        stages = sorted(timings.stages, key=timings.stages.get, reverse=True)
+        st.dataframe({
+            "stage": stages,
+            "this rerun (ms)": [round(timings.stages[name] * 1000, 2) for name in stages],
+            "mean (ms)": [round(means.get(name, 0.0) * 1000, 2) for name in stages],
+        }, hide_index=True)
+        for name, value in sorted(timings.counters.items()):
+            st.write(f"**{name}:** {value:,}")
+        if settings.WARMUP and settings.RENDER_CACHE_DIR:
+            progress = start_warmup()
+            state = "failed" if progress.error else "running" if progress.running else "done"
+            st.write(f"**warm-up:** {progress.done:,}/{progress.total:,} states ({state})")
+
+
+def show_graph(memo):
+    """Sidebar panel listing the page's computation nodes and which of them this rerun recomputed."""
+    if not settings.DEBUG_PANEL:
+        return
+    with st.sidebar.expander("🔁 Recomputed nodes", expanded=True):
+        nodes = list(memo.graph.nodes)
+        st.dataframe({
+            "node": nodes,
+            "inputs": [", ".join(memo.graph.nodes[name][1]) for name in nodes],
+            "this rerun": [memo.status.get(name, "not needed") for name in nodes],
+            "ms": [round(memo.seconds[name] * 1000, 2) if name in memo.seconds else None for name in nodes],
+        }, hide_index=True)
+        st.caption("Recent reruns, newest first")
+        history = list(reversed(memo.history))
+        st.dataframe({
+            "changed inputs": [", ".join(h["changed"]) or "-" for h in history],
+            "recomputed": [", ".join(h["recomputed"]) or "-" for h in history],
+        }, hide_index=True)
+
+
+def _run_page(title):
+    module = importlib.import_module(PAGES[title])
+    with instrumentation.rerun(title, instrumentation.registry, settings.TIMINGS_LOG) as timings:
+        module.render()
+    if settings.DEBUG_PANEL:
+        show_timings(timings)
+
+
+# As a fragment, a widget change on the page reruns only the page (and its
+# timings panel), not the header, sidebar navigation and footer of app.py
+_run_page_fragment = st.fragment(_run_page) if hasattr(st, "fragment") else _run_page
+
+
+def render_page(title):
+    if settings.METRICS_PORT:
+        start_metrics_server()
+    if settings.SERVICE_PORT:
+        start_service()
+    if settings.WARMUP and settings.RENDER_CACHE_DIR:
+        start_warmup()
+    if settings.PAGE_FRAGMENTS:
+        _run_page_fragment(title)
+    else:
+        _run_page(title)
@@ -0,0 +1,32 @@
+"""Basic Trig Functions page."""
+
+import streamlit as st
+
+from .. import charts, instrumentation, page_states, plots, settings
+from . import (animation_controls, cached_spec, image_encoding, render_figure, show_animation, show_chart, show_image,
+               show_results, uses_client_charts)
+
+TITLE = "Basic Trig Functions"
+WIDGETS = page_states.WIDGETS[TITLE]
+
+
+def render():
+    st.markdown('<h2 class="section-header">Basic Trigonometric Functions</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Input Parameters")
+        angle_deg = st.slider(*WIDGETS["angle_deg"])
+        animation = animation_controls(TITLE)
+        show_results(page_states.basic_trig_results(angle_deg))
+
+    with col2:
+        if animation is not None:
+            show_animation(TITLE, *animation)
+        elif uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, {"angle_deg": angle_deg},
+                                   lambda: charts.basic_trig_spec(angle_deg, settings.CLIENT_CHART_WIDTH_PX)))
+        else:
+            show_image(render_figure(TITLE, {"angle_deg": angle_deg},
+                                     lambda: plots.render_basic_trig(angle_deg), image_encoding(__name__)))
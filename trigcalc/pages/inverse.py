@@ -0,0 +1,69 @@
+"""Inverse Functions page."""
+
+import streamlit as st
+
+from .. import charts, compute, instrumentation, page_states, plots, reactive, sampling, settings, special_angles
+from . import (cached_spec, image_encoding, render_figure, show_chart, show_graph, show_image, show_results,
+               uses_client_charts)
+
+TITLE = "Inverse Functions"
+WIDGETS = page_states.WIDGETS[TITLE]
+
+
+# The curves and the reference table depend on the function alone, so
+# moving the input slider reuses them
+graph = reactive.Graph("inverse")
+
+
+@graph.node("function_type")
+def curves(function_type):
+    return sampling.inverse_curves(function_type)
+
+
+@graph.node("function_type", "input_val")
+def result(function_type, input_val):
+    return compute.round_trip(function_type, input_val)
+
+
+@graph.node("function_type")
+def reference(function_type):
+    rows = special_angles.reference_rows(function_type)
+    return {"x": [row.x.text for row in rows], "≈": [f"{row.x.value:.3f}" for row in rows],
+            f"{function_type}(x)": [f"{special_angles.degrees_text(row.degrees)} = {row.radians}" for row in rows]}
+
+
+# enc is not passed on: render_figure makes it current around the render,
+# it is an input so that a new encoding redraws the figure
+@graph.node("function_type", "input_val", "curves", "enc")
+def figure(function_type, input_val, curves, enc):
+    return plots.render_inverse(function_type, input_val, curves)
+
+
+@graph.node("function_type", "input_val", "curves")
+def chart(function_type, input_val, curves):
+    return charts.inverse_spec(function_type, input_val, settings.CLIENT_CHART_WIDTH_PX, curves)
+
+
+def render():
+    st.markdown('<h2 class="section-header">Inverse Trigonometric Functions</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Input Parameters")
+        function_type = st.selectbox(*WIDGETS["function_type"])
+        input_val = st.slider(*WIDGETS["input_val"].sliders[function_type])
+
+        enc = image_encoding(__name__)
+        memo = graph.session(st.session_state).update(function_type=function_type, input_val=input_val, enc=enc)
+        show_results(page_states.inverse_results(function_type, input_val, memo["result"]))
+
+    with col2:
+        params = {"function_type": function_type, "input_val": input_val}
+        if uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: memo["chart"]))
+            st.markdown("**Special Values Reference**")
+            st.table(memo["reference"])
+        else:
+            show_image(render_figure(TITLE, params, lambda: memo["figure"], enc))
+    show_graph(memo)
@@ -0,0 +1,108 @@
+"""Parametric Curves page."""
+
+import streamlit as st
+
+from .. import charts, curves, instrumentation, plots, reactive, settings
+from . import cached_spec, image_encoding, render_figure, show_chart, show_graph, show_image, uses_client_charts
+
+TITLE = "Parametric Curves"
+
+SAMPLE_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+ZOOMS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+# The coarse pass depends on the curve and sample count alone, so zooming
+# and panning only refine the part of the curve in view
+graph = reactive.Graph("parametric")
+
+
+@graph.node("curve", "samples")
+def rough(curve, samples):
+    return curves.coarse(curve, samples)
+
+
+@graph.node("curve", "zoom", "center_x", "center_y")
+def bounds(curve, zoom, center_x, center_y):
+    return curves.view(curve, zoom, center_x, center_y)
+
+
+@graph.node("curve", "samples", "bounds", "width_px", "rough")
+def detail(curve, samples, bounds, width_px, rough):
+    return curves.detail(curve, samples, bounds, width_px, rough=rough)
+
+
+# enc is not passed on: render_figure makes it current around the render,
+# it is an input so that a new encoding redraws the figure
+@graph.node("curve", "bounds", "detail", "enc")
+def figure(curve, bounds, detail, enc):
+    return plots.render_parametric(bounds, detail, curve.label())
+
+
+@graph.node("curve", "bounds", "detail")
+def chart(curve, bounds, detail):
+    return charts.parametric_spec(bounds, detail, curve.label(), settings.CLIENT_CHART_WIDTH_PX)
+
+
+def _curve_inputs(kind):
+    if kind == "Lissajous":
+        p = st.slider("x frequency (a)", 1, 200, 3)
+        q = st.slider("y frequency (b)", 1, 200, 2)
+        phase = st.slider("Phase δ (degrees)", 0, 180, 90, 15)
+        return curves.Curve(kind, p, q, phase)
+    if kind == "Rose":
+        p = st.slider("Numerator (n)", 1, 100, 4)
+        q = st.slider("Denominator (d)", 1, 50, 1)
+        size = st.slider("Amplitude (A)", 0.5, 5.0, 1.0, 0.1)
+        return curves.Curve(kind, p, q, 0.0, size)
+    p = st.slider("Circle speed (p)", -20, 20, 1)
+    q = st.slider("Epicycle speed (q)", -200, 200, -6)
+    size = st.slider("Epicycle radius (r)", 0.0, 2.0, 0.5, 0.05)
+    phase = st.slider("Epicycle phase (degrees)", 0, 360, 0, 15)
+    return curves.Curve(kind, p, q, phase, size)
+
+
+def render():
+    st.markdown('<h2 class="section-header">Parametric and Polar Curves</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Curve Parameters")
+        kind = st.selectbox("Curve", curves.CURVE_KINDS)
+        curve = _curve_inputs(kind)
+        samples = st.select_slider("Samples", SAMPLE_COUNTS, 1_000_000, format_func=lambda n: f"{n:,}")
+
+        st.subheader("View")
+        zoom = st.select_slider("Zoom", ZOOMS, 1, format_func=lambda z: f"{z}×")
+        center_x = center_y = 0.0
+        if zoom > 1:
+            half_x, half_y = curve.extent()
+            center_x = st.slider("Center x", -round(half_x, 2), round(half_x, 2), 0.0, round(half_x / 100, 4))
+            center_y = st.slider("Center y", -round(half_y, 2), round(half_y, 2), 0.0, round(half_y / 100, 4))
+
+        client = uses_client_charts(__name__)
+        enc = image_encoding(__name__)
+        width_px = (charts.parametric_width_px(settings.CLIENT_CHART_WIDTH_PX) if client
+                    else plots.parametric_plot_px(enc))
+        memo = graph.session(st.session_state).update(
+            curve=curve, samples=samples, zoom=zoom, center_x=center_x, center_y=center_y,
+            width_px=width_px, enc=enc)
+        shown = memo["detail"]
+
+        st.subheader("Equation")
+        st.write(curve.label())
+        st.subheader("Level of Detail")
+        st.write(f"**Samples per period:** {samples:,}")
+        st.write(f"**Resolution in view:** {'all samples' if shown.stride == 1 else f'1 in {shown.stride:,} samples'}")
+        st.write(f"**Evaluated for this view:** {shown.evaluated:,}")
+        st.write(f"**Drawn points:** {len(shown.x):,}"
+                 + (" (as a pixel coverage image)" if shown.coverage is not None and not client else ""))
+
+    with col2:
+        params = {"kind": curve.kind, "p": curve.p, "q": curve.q, "phase": curve.phase_deg, "size": curve.size,
+                  "samples": samples, "zoom": zoom, "center_x": center_x, "center_y": center_y}
+        if client:
+            show_chart(cached_spec(TITLE, params, lambda: memo["chart"]))
+        else:
+            show_image(render_figure(TITLE, params, lambda: memo["figure"], enc))
+    show_graph(memo)
@@ -0,0 +1,127 @@
+"""Triangle Calculator page."""
+
+import streamlit as st
+
+from .. import charts, compute, instrumentation, plots, precision, settings
+from . import cached_spec, image_encoding, render_figure, show_chart, show_image, uses_client_charts
+
+TITLE = "Triangle Calculator"
+
+
+# Oblique case -> default inputs
+OBLIQUE_DEFAULTS = {
+    "SSS": {"a": 5.0, "b": 6.0, "c": 7.0},
+    "SAS": {"a": 5.0, "b": 7.0, "angle_c": 60},
+    "ASA": {"angle_a": 40, "c": 8.0, "angle_b": 60},
+    "AAS": {"angle_a": 40, "angle_b": 60, "a": 5.0},
+    "SSA": {"a": 5.0, "b": 7.0, "angle_a": 35},
+}
+
+OBLIQUE_LABELS = {"a": "Side a", "b": "Side b", "c": "Side c",
+                  "angle_a": "Angle A", "angle_b": "Angle B", "angle_c": "Angle C"}
+
+_OBLIQUE_INPUT_LABELS = {name: label + (" (degrees)" if name.startswith("angle") else "")
+                         for name, label in OBLIQUE_LABELS.items()}
+
+
+def render():
+    kind = st.radio("Triangle", ["Right", "Oblique"], horizontal=True)
+    st.markdown(f'<h2 class="section-header">{kind} Triangle Calculator</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+    if kind == "Right":
+        _render_right(col1, col2)
+    else:
+        _render_oblique(col1, col2)
+
+
+def _render_right(col1, col2):
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Triangle Parameters")
+
+        calc_type = st.radio("Calculate using:", compute.TRIANGLE_MODES)
+
+        if calc_type == "Angle and Hypotenuse":
+            angle = st.slider("Angle (degrees)", 1, 89, 30)
+            hypotenuse = st.number_input("Hypotenuse", min_value=0.1, value=10.0)
+            solved, _ = precision.solve_right_triangle(calc_type, angle=angle, hypotenuse=hypotenuse)
+
+        elif calc_type == "Two Sides":
+            opposite = st.number_input("Opposite side", min_value=0.1, value=5.0)
+            adjacent = st.number_input("Adjacent side", min_value=0.1, value=8.0)
+            solved, _ = precision.solve_right_triangle(calc_type, opposite=opposite, adjacent=adjacent)
+
+        elif calc_type == "Angle and Adjacent":
+            angle = st.slider("Angle (degrees)", 1, 89, 30)
+            adjacent = st.number_input("Adjacent side", min_value=0.1, value=8.0)
+            solved, _ = precision.solve_right_triangle(calc_type, angle=angle, adjacent=adjacent)
+
+        else:  # Angle and Opposite
+            angle = st.slider("Angle (degrees)", 1, 89, 30)
+            opposite = st.number_input("Opposite side", min_value=0.1, value=5.0)
+            solved, _ = precision.solve_right_triangle(calc_type, angle=angle, opposite=opposite)
+
+        angle, opposite, adjacent, hypotenuse = solved.angle_a, solved.opposite, solved.adjacent, solved.hypotenuse
+
+        st.subheader("Results")
+        st.write(f"**Angle A:** {solved.angle_a:.2f}°")
+        st.write(f"**Angle B:** {solved.angle_b:.2f}°")
+        st.write(f"**Opposite:** {solved.opposite:.3f}")
+        st.write(f"**Adjacent:** {solved.adjacent:.3f}")
+        st.write(f"**Hypotenuse:** {solved.hypotenuse:.3f}")
+        st.write(f"**Area:** {solved.area:.3f}")
+        st.write(f"**Perimeter:** {solved.perimeter:.3f}")
+
+    with col2:
+        params = {"calc_type": calc_type, "angle": angle, "opposite": opposite,
+                  "adjacent": adjacent, "hypotenuse": hypotenuse}
+        if uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: charts.triangle_spec(
+                calc_type, angle, opposite, adjacent, hypotenuse, settings.CLIENT_CHART_WIDTH_PX)))
+        else:
+            show_image(render_figure(TITLE, params,
+                                     lambda: plots.render_triangle(calc_type, angle, opposite, adjacent, hypotenuse),
+                                     image_encoding(__name__)))
+
+
+def _render_oblique(col1, col2):
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Triangle Parameters")
+
+        case = st.selectbox("Known parts:", compute.OBLIQUE_CASES,
+                            help="S: a side, A: an angle, in order around the triangle. "
+                                 "Side a is opposite angle A, and so on.")
+        inputs = {}
+        for name, default in OBLIQUE_DEFAULTS[case].items():
+            if name.startswith("angle"):
+                inputs[name] = st.slider(_OBLIQUE_INPUT_LABELS[name], 1, 179, default, key=f"{case}_{name}")
+            else:
+                inputs[name] = st.number_input(_OBLIQUE_INPUT_LABELS[name], min_value=0.1, value=default,
+                                               key=f"{case}_{name}")
+
+        solved = compute.solve_oblique_triangle(case, **inputs)
+        count = int(solved.solutions)
+
+        st.subheader("Results")
+        if count == 0:
+            st.error("No triangle has these parts.")
+        elif count == 2:
+            st.info("Ambiguous case: two different triangles have these parts.")
+        for slot in range(count):
+            if count > 1:
+                st.write(f"**Solution {slot + 1}**")
+            values = {name: float(getattr(solved, name)[slot]) for name in solved._fields[:-1]}
+            st.write(f"**Angles:** A = {values['angle_a']:.2f}°, B = {values['angle_b']:.2f}°, "
+                     f"C = {values['angle_c']:.2f}°")
+            st.write(f"**Sides:** a = {values['a']:.3f}, b = {values['b']:.3f}, c = {values['c']:.3f}")
+            st.write(f"**Area:** {values['area']:.3f}")
+            st.write(f"**Perimeter:** {values['perimeter']:.3f}")
+
+    with col2:
+        params = {"kind": "Oblique", "case": case, **inputs}
+        if uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: charts.oblique_triangle_spec(
+                case, inputs, settings.CLIENT_CHART_WIDTH_PX, OBLIQUE_LABELS)))
+        else:
+            show_image(render_figure(TITLE, params, lambda: plots.render_oblique_triangle(case, inputs, OBLIQUE_LABELS),
+                                     image_encoding(__name__)))
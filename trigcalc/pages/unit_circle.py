@@ -0,0 +1,36 @@
+"""Unit Circle Explorer page."""
+
+import streamlit as st
+
+from .. import charts, instrumentation, page_states, plots, settings
+from . import (animation_controls, cached_spec, image_encoding, render_figure, show_animation, show_chart, show_image,
+               show_results, uses_client_charts)
+
+TITLE = "Unit Circle Explorer"
+WIDGETS = page_states.WIDGETS[TITLE]
+
+
+def render():
+    st.markdown('<h2 class="section-header">Unit Circle Explorer</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Interactive Controls")
+        angle_deg = st.slider(*WIDGETS["angle_deg"])
+        show_reference = st.checkbox(*WIDGETS["show_reference"])
+        show_quadrants = st.checkbox(*WIDGETS["show_quadrants"])
+        animation = animation_controls(TITLE, show_reference=show_reference, show_quadrants=show_quadrants)
+        show_results(page_states.unit_circle_results(angle_deg))
+
+    with col2:
+        params = {"angle_deg": angle_deg, "show_reference": show_reference, "show_quadrants": show_quadrants}
+        if animation is not None:
+            show_animation(TITLE, *animation)
+        elif uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: charts.unit_circle_spec(
+                angle_deg, show_reference, show_quadrants, settings.CLIENT_CHART_WIDTH_PX)))
+        else:
+            show_image(render_figure(TITLE, params,
+                                     lambda: plots.render_unit_circle(angle_deg, show_reference, show_quadrants),
+                                     image_encoding(__name__)))
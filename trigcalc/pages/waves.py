@@ -0,0 +1,203 @@
+"""Wave Functions page."""
+
+import hashlib
+
+import numpy as np
+import streamlit as st
+
+from .. import charts, compute, fourier, instrumentation, plots, reactive, sampling, settings
+from . import cached_spec, image_encoding, render_figure, show_chart, show_graph, show_image, uses_client_charts
+
+TITLE = "Wave Functions"
+
+MODES = ["Single wave", "Superposition", "Decompose signal"]
+
+# Signals are plotted over the same four periods as the single wave
+X_RANGE = (-4*np.pi, 4*np.pi)
+
+
+# Single-wave computations: the base curve depends on the wave type alone,
+# so moving the amplitude, frequency, phase or shift sliders reuses it
+single_wave = reactive.Graph("waves.single")
+
+
+@single_wave.node("wave_type")
+def y_range(wave_type):
+    return sampling.wave_y_range(wave_type)
+
+
+@single_wave.node("wave_type", "y_range")
+def base_curve(wave_type, y_range):
+    return sampling.sample_wave(wave_type, *X_RANGE, y_range)
+
+
+@single_wave.node("wave_type", "amplitude", "frequency", "phase", "vertical_shift", "y_range")
+def curve(wave_type, amplitude, frequency, phase, vertical_shift, y_range):
+    return sampling.sample_wave(wave_type, *X_RANGE, y_range, amplitude, frequency, phase, vertical_shift)
+
+
+@single_wave.node("wave_type", "frequency")
+def period(wave_type, frequency):
+    return compute.wave_period(frequency, wave_type)
+
+
+# enc is not passed on: render_figure makes it current around the render,
+# it is an input so that a new encoding redraws the figure
+@single_wave.node("wave_type", "amplitude", "frequency", "phase", "vertical_shift", "curve", "base_curve", "enc")
+def figure(wave_type, amplitude, frequency, phase, vertical_shift, curve, base_curve, enc):
+    return plots.render_wave(wave_type, amplitude, frequency, phase, vertical_shift, curve, base_curve)
+
+
+@single_wave.node("wave_type", "amplitude", "frequency", "phase", "vertical_shift", "curve", "base_curve")
+def chart(wave_type, amplitude, frequency, phase, vertical_shift, curve, base_curve):
+    return charts.wave_spec(wave_type, amplitude, frequency, phase, vertical_shift,
+                            settings.CLIENT_CHART_WIDTH_PX, curve, base_curve)
+
+
+def render():
+    st.markdown('<h2 class="section-header">Trigonometric Wave Functions</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1, instrumentation.stage("inputs"):
+        mode = st.radio("Mode", MODES, horizontal=True)
+
+    if mode == "Superposition":
+        _render_superposition(col1, col2)
+    elif mode == "Decompose signal":
+        _render_decomposition(col1, col2)
+    else:
+        _render_single_wave(col1, col2)
+
+
+def _render_single_wave(col1, col2):
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Wave Parameters")
+        wave_type = st.selectbox("Wave Type", compute.WAVE_TYPES)
+        amplitude = st.slider("Amplitude (A)", 0.1, 5.0, 1.0, 0.1)
+        frequency = st.slider("Frequency (f)", 0.1, 3.0, 1.0, 0.1)
+        phase = st.slider("Phase Shift (φ) degrees", -180, 180, 0, 15)
+        vertical_shift = st.slider("Vertical Shift (D)", -2.0, 2.0, 0.0, 0.1)
+
+        phase_rad = np.radians(phase)
+
+        st.subheader("Wave Equation")
+        if wave_type == "Sine":
+            st.latex(f"y = {amplitude} \\sin({frequency}x + {phase_rad:.2f}) + {vertical_shift}")
+        elif wave_type == "Cosine":
+            st.latex(f"y = {amplitude} \\cos({frequency}x + {phase_rad:.2f}) + {vertical_shift}")
+        else:
+            st.latex(f"y = {amplitude} \\tan({frequency}x + {phase_rad:.2f}) + {vertical_shift}")
+
+        enc = image_encoding(__name__)
+        memo = single_wave.session(st.session_state).update(
+            wave_type=wave_type, amplitude=amplitude, frequency=frequency, phase=phase,
+            vertical_shift=vertical_shift, enc=enc)
+
+        st.subheader("Properties")
+        st.write(f"**Period:** {memo['period']:.2f}")
+        st.write(f"**Amplitude:** {amplitude}")
+        st.write(f"**Frequency:** {frequency}")
+        st.write(f"**Phase Shift:** {phase}° = {phase_rad:.2f} rad")
+        st.write(f"**Vertical Shift:** {vertical_shift}")
+
+    with col2:
+        params = {"wave_type": wave_type, "amplitude": amplitude, "frequency": frequency,
+                  "phase": phase, "vertical_shift": vertical_shift}
+        if uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: memo["chart"]))
+        else:
+            show_image(render_figure(TITLE, params, lambda: memo["figure"], enc))
+    show_graph(memo)
+
+
+def _digest(*arrays):
+    h = hashlib.sha1()
+    for a in arrays:
+        h.update(np.ascontiguousarray(a, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+def _show_fourier(col2, params, title, x, y, comps, fit=None):
+    with col2:
+        if uses_client_charts(__name__):
+            show_chart(cached_spec(TITLE, params, lambda: charts.fourier_spec(
+                title, x, y, comps, settings.CLIENT_CHART_WIDTH_PX, fit)))
+        else:
+            show_image(render_figure(TITLE, params, lambda: plots.render_fourier(title, x, y, comps, fit),
+                                     image_encoding(__name__)))
+
+
+def _render_superposition(col1, col2):
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Components")
+        source = st.selectbox("Waveform", fourier.PRESETS + ["Custom"])
+
+        if source == "Custom":
+            table = st.data_editor(
+                {"amplitude": [1.0, 0.5, 0.25], "frequency": [1.0, 2.0, 3.0], "phase (°)": [0.0, 0.0, 0.0]},
+                num_rows="dynamic")
+            values = np.array([table["amplitude"], table["frequency"], table["phase (°)"]], dtype=float)
+            values = values[:, ~np.isnan(values).any(axis=0)]
+            comps = fourier.components(*values)
+            params = {"mode": "superposition", "components": _digest(*values)}
+        else:
+            count = st.slider("Number of components", 1, 5000, 10)
+            amplitude = st.slider("Amplitude (A)", 0.1, 5.0, 1.0, 0.1)
+            comps = fourier.preset_components(source, count, amplitude)
+            params = {"mode": "superposition", "preset": source, "count": count, "amplitude": amplitude}
+
+        vertical_shift = st.slider("Vertical Shift (D)", -2.0, 2.0, 0.0, 0.1)
+        params["vertical_shift"] = vertical_shift
+
+        if not len(comps.amplitude):
+            st.warning("Add at least one component")
+            return
+        x, y = fourier.sample(comps, *X_RANGE, vertical_shift)
+
+        st.subheader("Properties")
+        st.write(f"**Components:** {len(comps.amplitude)}")
+        st.write(f"**Highest frequency:** {comps.frequency.max():g}")
+        st.write(f"**Samples:** {len(x)}")
+        st.write(f"**Max:** {y.max():.3f}")
+        st.write(f"**Min:** {y.min():.3f}")
+
+    title = f"{source} Wave from {len(comps.amplitude)} Components"
+    _show_fourier(col2, params, title, x, y, comps)
+
+
+def _render_decomposition(col1, col2):
+    with col1, instrumentation.stage("inputs"):
+        st.subheader("Signal")
+        uploaded = st.file_uploader("Samples (.csv, .txt or .npy): a y column, or x and y columns",
+                                    type=["csv", "txt", "npy"])
+        if uploaded is None:
+            st.caption("No file uploaded: decomposing an example signal")
+            x, y = fourier.example_signal()
+        else:
+            try:
+                x, y = fourier.read_signal(uploaded.getvalue())
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+        if x is None:
+            spacing = st.number_input("Sample spacing (radians)", min_value=1e-6, value=0.01, format="%.6f")
+            x = np.arange(len(y)) * spacing
+        else:
+            # Assumes evenly spaced samples
+            spacing = (x[-1] - x[0]) / (len(x) - 1)
+
+        count = st.slider("Components to keep", 1, 100, 5)
+        comps, offset = fourier.decompose(y, spacing, count, x0=x[0])
+        fit = fourier.reconstruct(y, count)
+
+        st.subheader("Dominant Components")
+        st.write(f"**Samples:** {len(y)}")
+        st.write(f"**Offset (D):** {offset:.4f}")
+        st.write(f"**Residual RMS:** {np.sqrt(np.mean((y - fit) ** 2)):.4f}")
+        st.dataframe({"frequency": comps.frequency, "amplitude": comps.amplitude,
+                      "phase (°)": comps.phase_deg}, hide_index=True)
+
+    params = {"mode": "decompose", "signal": _digest(x, y), "count": count}
+    _show_fourier(col2, params, "Signal Decomposition", x, y, comps, fit=(x, fit))
@@ -0,0 +1,634 @@
+"""Figure renderers for each page of the app.
+
+Each render_* function takes only the page's widget values and returns PNG
+bytes, so its output can be cached by those values.
+"""
+
+import numpy as np
+from matplotlib.colors import ListedColormap
+from matplotlib.patches import Circle
+
+from . import compute, sampling, special_angles
+from .charts import downsample
+from .figures import render_png
+from .layers import LayeredFigure, layer_cache
+
+
+# Widest labels the dynamic layer can produce, used to lay out the static layer
+_PLACEHOLDER_ANGLE = 225
+
+
+def render_basic_trig(angle_deg):
+    return basic_trig_layers().render(angle_deg)
+
+
+def basic_trig_layers():
+    """The Basic Trig LayeredFigure at the current encoding's resolution; its dynamic layer takes angle_deg."""
+    return layer_cache.get("basic_trig", lambda: LayeredFigure(
+        "2x2", _draw_basic_trig_static, _draw_basic_trig_dynamic))
+
+
+def _draw_basic_trig_static(fig, axes):
+    (ax1, ax2), (ax3, ax4) = axes
+    dynamic = {}
+
+    # Unit circle
+    circle = Circle((0, 0), 1, fill=False, color='black', linewidth=2)
+    ax1.add_patch(circle)
+    dynamic['radius'], = ax1.plot([0, 1], [0, 0], 'ro-', linewidth=2, markersize=8, animated=True)
+    dynamic['sin_proj'], = ax1.plot([1, 1], [0, 0], 'b--', linewidth=2, alpha=0.7, animated=True)
+    dynamic['cos_proj'], = ax1.plot([0, 1], [0, 0], 'g--', linewidth=2, alpha=0.7, animated=True)
+    ax1.set_xlim(-1.5, 1.5)
+    ax1.set_ylim(-1.5, 1.5)
+    ax1.set_aspect('equal')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_title(f'Unit Circle - Angle: {_PLACEHOLDER_ANGLE}°')
+    ax1.title.set_animated(True)
+
+    # Sine function
+    x = np.linspace(-2*np.pi, 2*np.pi, 1000)
+    ax2.plot(x, np.sin(x), 'b-', linewidth=2, label='sin(x)')
+    dynamic['sin_vline'] = ax2.axvline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['sin_marker'], = ax2.plot(0, 0, 'ro', markersize=10, animated=True)
+    ax2.set_title('Sine Function')
+    ax2.grid(True, alpha=0.3)
+    ax2.set_xlabel('Angle (radians)')
+    ax2.set_ylabel('sin(x)')
+    ax2.legend()
+
+    # Cosine function
+    ax3.plot(x, np.cos(x), 'g-', linewidth=2, label='cos(x)')
+    dynamic['cos_vline'] = ax3.axvline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['cos_marker'], = ax3.plot(0, 1, 'ro', markersize=10, animated=True)
+    ax3.set_title('Cosine Function')
+    ax3.grid(True, alpha=0.3)
+    ax3.set_xlabel('Angle (radians)')
+    ax3.set_ylabel('cos(x)')
+    ax3.legend()
+
+    # Tangent function
+    # Sampled to the visible range and split at the asymptotes
+    x_tan, y_tan = sampling.sample_wave("Tangent", -2*np.pi, 2*np.pi, (-5, 5))
+    ax4.plot(x_tan, y_tan, 'orange', linewidth=2, label='tan(x)')
+    dynamic['tan_vline'] = ax4.axvline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['tan_marker'], = ax4.plot(0, 0, 'ro', markersize=10, animated=True)
+    ax4.set_title('Tangent Function')
+    ax4.set_ylim(-5, 5)
+    ax4.grid(True, alpha=0.3)
+    ax4.set_xlabel('Angle (radians)')
+    ax4.set_ylabel('tan(x)')
+    ax4.legend()
+
+    # Lay out with a representative legend, then leave it to the dynamic layer
+    dynamic['sin_proj'].set_label('sin = -0.707')
+    dynamic['cos_proj'].set_label('cos = -0.707')
+    ax1.legend(handles=[dynamic['sin_proj'], dynamic['cos_proj']]).set_animated(True)
+    return dynamic
+
+
+def _draw_basic_trig_dynamic(dynamic, axes, angle_deg):
+    (ax1, ax2), (ax3, ax4) = axes
+    angle_rad = np.radians(angle_deg)
+    sin_val, cos_val, tan_val = compute.trig_values(angle_deg)
+
+    dynamic['radius'].set_data([0, cos_val], [0, sin_val])
+    dynamic['sin_proj'].set_data([cos_val, cos_val], [0, sin_val])
+    dynamic['sin_proj'].set_label(f'sin = {sin_val:.3f}')
+    dynamic['cos_proj'].set_data([0, cos_val], [0, 0])
+    dynamic['cos_proj'].set_label(f'cos = {cos_val:.3f}')
+    ax1.set_title(f'Unit Circle - Angle: {angle_deg}°')
+    legend = ax1.legend(handles=[dynamic['sin_proj'], dynamic['cos_proj']])
+
+    artists = [dynamic['radius'], dynamic['sin_proj'], dynamic['cos_proj'], ax1.title, legend]
+    for name, value in (('sin', sin_val), ('cos', cos_val), ('tan', tan_val)):
+        dynamic[f'{name}_vline'].set_xdata([angle_rad, angle_rad])
+        artists.append(dynamic[f'{name}_vline'])
+        if abs(value) < 10:
+            dynamic[f'{name}_marker'].set_data([angle_rad], [value])
+            artists.append(dynamic[f'{name}_marker'])
+    return artists
+
+
+def render_unit_circle(angle_deg, show_reference, show_quadrants):
+    return unit_circle_layers(show_reference, show_quadrants).render(angle_deg)
+
+
+def unit_circle_layers(show_reference, show_quadrants):
+    """The Unit Circle LayeredFigure for the checkbox values; its dynamic layer takes angle_deg."""
+    # Checkboxes change the background, so each combination has its own layer
+    return layer_cache.get(("unit_circle", show_reference, show_quadrants), lambda: LayeredFigure(
+        "1x1",
+        lambda fig, axes: _draw_unit_circle_static(fig, axes, show_reference, show_quadrants),
+        _draw_unit_circle_dynamic))
+
+
+def _draw_unit_circle_static(fig, axes, show_reference, show_quadrants):
+    ax = axes[0, 0]
+    dynamic = {}
+
+    # Draw unit circle
+    circle = Circle((0, 0), 1, fill=False, color='black', linewidth=3)
+    ax.add_patch(circle)
+
+    # Draw axes
+    ax.axhline(y=0, color='black', linewidth=1, alpha=0.5)
+    ax.axvline(x=0, color='black', linewidth=1, alpha=0.5)
+
+    # Angle line, point and projections are redrawn for every angle
+    dynamic['radius'], = ax.plot([0, 1], [0, 0], 'red', linewidth=4, animated=True)
+    dynamic['point'], = ax.plot(1, 0, 'ro', markersize=15, animated=True)
+    dynamic['sin_proj'], = ax.plot([1, 1], [0, 0], 'blue', linewidth=3, alpha=0.7, animated=True)
+    dynamic['cos_proj'], = ax.plot([0, 1], [0, 0], 'green', linewidth=3, alpha=0.7, animated=True)
+
+    # Add quadrant labels
+    if show_quadrants:
+        ax.text(0.7, 0.7, 'I', fontsize=20, ha='center', va='center',
+               bbox=dict(boxstyle="circle", facecolor='lightblue', alpha=0.5))
+        ax.text(-0.7, 0.7, 'II', fontsize=20, ha='center', va='center',
+               bbox=dict(boxstyle="circle", facecolor='lightgreen', alpha=0.5))
+        ax.text(-0.7, -0.7, 'III', fontsize=20, ha='center', va='center',
+               bbox=dict(boxstyle="circle", facecolor='lightyellow', alpha=0.5))
+        ax.text(0.7, -0.7, 'IV', fontsize=20, ha='center', va='center',
+               bbox=dict(boxstyle="circle", facecolor='lightcoral', alpha=0.5))
+
+    # Add special angle markers
+    if show_reference:
+        points = special_angles.table(special_angles.REFERENCE_DIVISORS).angles
+        ax.plot([a.cos.value for a in points], [a.sin.value for a in points], 'ko',
+                markersize=6, alpha=0.6, linestyle='none')
+
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(-1.5, 1.5)
+    ax.set_aspect('equal')
+    ax.grid(True, alpha=0.3)
+
+    # Lay out with representative title and legend, then leave them to the dynamic layer
+    _label_unit_circle(dynamic, ax, _PLACEHOLDER_ANGLE, -0.707, -0.707)
+    ax.legend(handles=[dynamic['radius'], dynamic['sin_proj'], dynamic['cos_proj']],
+              bbox_to_anchor=(1.05, 1), loc='upper left').set_animated(True)
+    ax.title.set_animated(True)
+    return dynamic
+
+
+def _label_unit_circle(dynamic, ax, angle_deg, sin_val, cos_val):
+    dynamic['radius'].set_label(f'{angle_deg}°')
+    dynamic['sin_proj'].set_label(f'sin({angle_deg}°) = {sin_val:.3f}')
+    dynamic['cos_proj'].set_label(f'cos({angle_deg}°) = {cos_val:.3f}')
+    ax.set_title(f'Unit Circle - Angle: {angle_deg}° (Quadrant {compute.quadrant_name(angle_deg)})', fontsize=16)
+
+
+def _draw_unit_circle_dynamic(dynamic, axes, angle_deg):
+    ax = axes[0, 0]
+    sin_val, cos_val, _ = compute.trig_values(angle_deg)
+
+    dynamic['radius'].set_data([0, cos_val], [0, sin_val])
+    dynamic['point'].set_data([cos_val], [sin_val])
+    dynamic['sin_proj'].set_data([cos_val, cos_val], [0, sin_val])
+    dynamic['cos_proj'].set_data([0, cos_val], [0, 0])
+    _label_unit_circle(dynamic, ax, angle_deg, sin_val, cos_val)
+    legend = ax.legend(handles=[dynamic['radius'], dynamic['sin_proj'], dynamic['cos_proj']],
+                       bbox_to_anchor=(1.05, 1), loc='upper left')
+    return [dynamic['radius'], dynamic['sin_proj'], dynamic['cos_proj'], dynamic['point'],
+            ax.title, legend]
+
+
+def render_triangle(calc_type, angle, opposite, adjacent, hypotenuse):
+    return render_png("1x2", _draw_triangle, calc_type, angle, opposite, adjacent, hypotenuse)
+
+
+def _draw_triangle(fig, axes, calc_type, angle, opposite, adjacent, hypotenuse):
+    angle_rad = np.radians(angle)
+
+    (ax1, ax2), = axes
+
+    # Draw triangle
+    triangle_x = [0, adjacent, 0, 0]
+    triangle_y = [0, 0, opposite, 0]
+    ax1.plot(triangle_x, triangle_y, 'b-', linewidth=3)
+
+    # Add labels
+    ax1.text(adjacent/2, -0.5, f'Adjacent = {adjacent:.2f}', ha='center', fontsize=12)
+    ax1.text(-1, opposite/2, f'Opposite = {opposite:.2f}', ha='center', rotation=90, fontsize=12)
+    ax1.text(adjacent/2 + 0.5, opposite/2 + 0.5, f'Hypotenuse = {hypotenuse:.2f}',
+            ha='center', rotation=-np.degrees(angle_rad), fontsize=12)
+    ax1.text(1, 0.5, f'{angle:.1f}°', ha='center', fontsize=12)
+
+    # Right angle marker
+    square_size = min(adjacent, opposite) * 0.1
+    square_x = [0, square_size, square_size, 0, 0]
+    square_y = [0, 0, square_size, square_size, 0]
+    ax1.plot(square_x, square_y, 'r-', linewidth=2)
+
+    ax1.set_xlim(-2, adjacent + 2)
+    ax1.set_ylim(-2, opposite + 2)
+    ax1.set_aspect('equal')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_title('Right Triangle Visualization')
+
+    # Trigonometric ratios visualization
+    angles = np.linspace(1, 89, 100)
+    if calc_type in ["Angle and Hypotenuse", "Angle and Adjacent", "Angle and Opposite"]:
+        # Show how ratios change with angle, holding the given side fixed
+        sweep = compute.solve_right_triangle(calc_type, angle=angles, hypotenuse=hypotenuse,
+                                             opposite=opposite, adjacent=adjacent)
+        opposites, adjacents, hypotenuses = sweep.opposite, sweep.adjacent, sweep.hypotenuse
+        if calc_type == "Angle and Hypotenuse":
+            ax2.plot(angles, opposites, 'r-', label='Opposite', linewidth=2)
+            ax2.plot(angles, adjacents, 'g-', label='Adjacent', linewidth=2)
+            ax2.axhline(hypotenuse, color='b', linestyle='--', label=f'Hypotenuse = {hypotenuse:.2f}')
+        elif calc_type == "Angle and Adjacent":
+            ax2.plot(angles, opposites, 'r-', label='Opposite', linewidth=2)
+            ax2.plot(angles, hypotenuses, 'b-', label='Hypotenuse', linewidth=2)
+            ax2.axhline(adjacent, color='g', linestyle='--', label=f'Adjacent = {adjacent:.2f}')
+        else:  # Angle and Opposite
+            ax2.plot(angles, adjacents, 'g-', label='Adjacent', linewidth=2)
+            ax2.plot(angles, hypotenuses, 'b-', label='Hypotenuse', linewidth=2)
+            ax2.axhline(opposite, color='r', linestyle='--', label=f'Opposite = {opposite:.2f}')
+
+        ax2.axvline(angle, color='black', linestyle=':', alpha=0.7, label=f'Current angle = {angle}°')
+        ax2.set_xlabel('Angle (degrees)')
+        ax2.set_ylabel('Side Length')
+        ax2.set_title('How Side Lengths Change with Angle')
+    else:
+        # For "Two Sides", show trig function values
+        sin_vals, cos_vals, tan_vals = compute.trig_values(angles)
+
+        ax2.plot(angles, sin_vals, 'r-', label='sin', linewidth=2)
+        ax2.plot(angles, cos_vals, 'g-', label='cos', linewidth=2)
+        ax2.plot(angles, tan_vals, 'b-', label='tan', linewidth=2)
+        ax2.axvline(angle, color='black', linestyle=':', alpha=0.7, label=f'Current angle = {angle:.1f}°')
+        ax2.set_xlabel('Angle (degrees)')
+        ax2.set_ylabel('Function Value')
+        ax2.set_title('Trigonometric Functions')
+        ax2.set_ylim(0, 3)
+
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+
+
+def oblique_vertices(solved, slot):
+    """(x, y) of vertices A, B, C of one solution of a solved oblique triangle: A at the origin, side c along the x axis."""
+    b, c, angle_a = (float(np.ravel(v)[slot]) for v in (solved.b, solved.c, solved.angle_a))
+    alpha = np.radians(angle_a)
+    return np.array([0.0, c, b * np.cos(alpha)]), np.array([0.0, 0.0, b * np.sin(alpha)])
+
+
+def render_oblique_triangle(case, inputs, labels):
+    """Triangle page figure for a general triangle.
+
+    inputs are the case's solve_oblique_triangle arguments, labels their names as the page shows them.
+    """
+    return render_png("1x2", _draw_oblique_triangle, case, inputs, labels)
+
+
+# Solution slot -> line style; the second slot is the other SSA triangle
+_OBLIQUE_STYLES = [dict(color='b', linestyle='-', linewidth=3), dict(color='orange', linestyle='--', linewidth=2)]
+
+
+def _draw_oblique_triangle(fig, axes, case, inputs, labels):
+    solved = compute.solve_oblique_triangle(case, **inputs)
+    (ax1, ax2), = axes
+
+    count = int(solved.solutions)
+    xs, ys = [0.0], [0.0]
+    for slot in range(count):
+        x, y = oblique_vertices(solved, slot)
+        ax1.plot(np.append(x, 0), np.append(y, 0), **_OBLIQUE_STYLES[slot],
+                 label=f'Solution {slot + 1}' if count > 1 else None)
+        xs.extend(x)
+        ys.extend(y)
+        # Side labels at the midpoints, angle labels just inside the vertices;
+        # the second SSA triangle shares a, b and A with the first
+        centroid = x.mean(), y.mean()
+        sides = (((1, 2), 'a'), ((0, 2), 'b'), ((0, 1), 'c'))[2 * slot:]
+        for (i, j), name in sides:
+            ax1.text((x[i] + x[j]) / 2, (y[i] + y[j]) / 2,
+                     f'{name} = {float(np.ravel(getattr(solved, name))[slot]):.2f}',
+                     ha='center', va='center', fontsize=11,
+                     bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.7))
+        inset = 0.2 if slot == 0 else 0.45
+        for i, name in enumerate(('angle_a', 'angle_b', 'angle_c')[slot:], start=slot):
+            ax1.text(x[i] + inset * (centroid[0] - x[i]), y[i] + inset * (centroid[1] - y[i]),
+                     f'{name[-1].upper()} = {float(np.ravel(getattr(solved, name))[slot]):.1f}°',
+                     ha='center', va='center', fontsize=10, color=_OBLIQUE_STYLES[slot]['color'])
+    if count == 0:
+        ax1.text(0.5, 0.5, 'No triangle has these parts', ha='center', va='center',
+                 fontsize=14, transform=ax1.transAxes)
+    if count > 1:
+        ax1.legend()
+
+    margin = 0.15 * max(max(xs) - min(xs), max(ys) - min(ys), 1)
+    ax1.set_xlim(min(xs) - margin, max(xs) + margin)
+    ax1.set_ylim(min(ys) - margin, max(ys) + margin)
+    ax1.set_aspect('equal')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_title(f'Oblique Triangle Visualization ({case})')
+
+    # How the solution changes with one input, holding the others fixed
+    sweep = compute.oblique_sweep(case, inputs)
+    colors = ['r', 'g', 'b']
+    for (name, values), color in zip(sweep["curves"].items(), colors):
+        label = labels[name]
+        ax2.plot(sweep["x"], values[:, 0], f'{color}-', linewidth=2, label=label)
+        if np.isfinite(values[:, 1]).any():
+            ax2.plot(sweep["x"], values[:, 1], f'{color}--', linewidth=2, label=f'{label} (second triangle)')
+    for (name, value), color in zip(sweep["fixed"].items(), ['gray', 'black']):
+        ax2.axhline(value, color=color, linestyle=':', alpha=0.7,
+                    label=f'{labels[name]} = {value:.2f}')
+    current = inputs[sweep["input"]]
+    ax2.axvline(current, color='black', linestyle=':', alpha=0.7,
+                label=f'Current {labels[sweep["input"]]} = {current:.1f}')
+    ax2.set_xlabel(labels[sweep["input"]] + ('' if sweep["input"] == "c" else ' (degrees)'))
+    ax2.set_ylabel(sweep["y_title"])
+    ax2.set_title(f'How the Triangle Changes with {labels[sweep["input"]]}')
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+
+
+def render_wave(wave_type, amplitude, frequency, phase, vertical_shift, curve=None, base=None):
+    """Wave page figure; curve and base are the (x, y) samples of the modified and base waves, if already computed."""
+    y_range = sampling.wave_y_range(wave_type)
+    if curve is None:
+        curve = sampling.sample_wave(wave_type, -4*np.pi, 4*np.pi, y_range,
+                                     amplitude, frequency, phase, vertical_shift)
+    # Axes and the base curve depend on the wave type only
+    layered = layer_cache.get(("wave", wave_type), lambda: LayeredFigure(
+        "2x1",
+        lambda fig, axes: _draw_wave_static(fig, axes, wave_type, y_range, base),
+        _draw_wave_dynamic))
+    return layered.render(wave_type, amplitude, vertical_shift, curve)
+
+
+def _draw_wave_static(fig, axes, wave_type, y_range, base):
+    (ax1,), (ax2,) = axes
+    dynamic = {}
+    if base is None:
+        base = sampling.sample_wave(wave_type, -4*np.pi, 4*np.pi, y_range)
+
+    # Modified wave
+    dynamic['curve'], = ax1.plot([], [], 'b-', linewidth=3, animated=True)
+    dynamic['shift'] = ax1.axhline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['max'] = ax1.axhline(1, color='green', linestyle=':', alpha=0.7, animated=True)
+    dynamic['min'] = ax1.axhline(-1, color='green', linestyle=':', alpha=0.7, animated=True)
+
+    ax1.set_xlim(-4*np.pi, 4*np.pi)
+    ax1.set_ylim(*y_range)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_title(f'Modified {wave_type} Wave')
+    ax1.set_xlabel('x (radians)')
+    ax1.set_ylabel('y')
+
+    # Comparison with base function
+    ax2.plot(*base, 'gray', linewidth=2, alpha=0.5, label=f'Base {wave_type}')
+    dynamic['comparison'], = ax2.plot([], [], 'b-', linewidth=3, label=f'Modified {wave_type}', animated=True)
+
+    ax2.set_xlim(-4*np.pi, 4*np.pi)
+    ax2.set_ylim(*y_range)
+    ax2.grid(True, alpha=0.3)
+    # Drawn over the dynamic curve, as in a full redraw
+    dynamic['comparison_legend'] = ax2.legend()
+    dynamic['comparison_legend'].set_animated(True)
+    ax2.set_title('Comparison: Base vs Modified Function')
+    ax2.set_xlabel('x (radians)')
+    ax2.set_ylabel('y')
+
+    # Lay out with a representative legend, then leave it to the dynamic layer
+    _label_wave(dynamic, wave_type, -2.0, 5.0)
+    ax1.legend(handles=[dynamic['curve'], dynamic['shift'], dynamic['max'], dynamic['min']]).set_animated(True)
+    return dynamic
+
+
+def _label_wave(dynamic, wave_type, vertical_shift, amplitude):
+    dynamic['curve'].set_label(f'Modified {wave_type}')
+    dynamic['shift'].set_label(f'Vertical Shift = {vertical_shift}')
+    dynamic['max'].set_label(f'Max = {vertical_shift + amplitude:.2f}')
+    dynamic['min'].set_label(f'Min = {vertical_shift - amplitude:.2f}')
+
+
+def _draw_wave_dynamic(dynamic, axes, wave_type, amplitude, vertical_shift, curve):
+    (ax1,), _ = axes
+    dynamic['curve'].set_data(*curve)
+    dynamic['comparison'].set_data(*curve)
+    for name, y in (('shift', vertical_shift), ('max', vertical_shift + amplitude),
+                    ('min', vertical_shift - amplitude)):
+        dynamic[name].set_ydata([y, y])
+    _label_wave(dynamic, wave_type, vertical_shift, amplitude)
+    legend = ax1.legend(handles=[dynamic['curve'], dynamic['shift'], dynamic['max'], dynamic['min']])
+    return [dynamic['curve'], dynamic['shift'], dynamic['max'], dynamic['min'], legend,
+            dynamic['comparison'], dynamic['comparison_legend']]
+
+
+# Horizontal pixels of a saved 2x1 figure; long signals are min/max-downsampled to this
+_SIGNAL_WIDTH_PX = 2400
+
+
+def render_fourier(title, x, y, comps, fit=None):
+    """Signal plot over a component amplitude spectrum for the Wave page's Fourier modes.
+
+    Unlike the other renderers this takes the sampled arrays, so callers
+    key the render cache on a digest of them.
+    """
+    return render_png("2x1", _draw_fourier, title, x, y, comps, fit)
+
+
+def _draw_fourier(fig, axes, title, x, y, comps, fit):
+    (ax1,), (ax2,) = axes
+
+    if fit is None:
+        ax1.plot(*downsample(x, y, _SIGNAL_WIDTH_PX), 'b-', linewidth=2, label='Sum of components')
+    else:
+        ax1.plot(*downsample(x, y, _SIGNAL_WIDTH_PX), 'gray', linewidth=1, alpha=0.6, label='Signal')
+        ax1.plot(*downsample(*fit, _SIGNAL_WIDTH_PX), 'b-', linewidth=2,
+                 label=f'Reconstruction ({len(comps.amplitude)} components)')
+    ax1.set_xlim(x[0], x[-1])
+    ax1.grid(True, alpha=0.3)
+    ax1.legend(loc='upper right')
+    ax1.set_title(title)
+    ax1.set_xlabel('x (radians)')
+    ax1.set_ylabel('y')
+
+    ax2.vlines(comps.frequency, 0, np.abs(comps.amplitude), color='blue', linewidth=2)
+    ax2.plot(comps.frequency, np.abs(comps.amplitude), 'bo', markersize=3)
+    ax2.set_ylim(bottom=0)
+    ax2.grid(True, alpha=0.3)
+    ax2.set_title('Component Amplitudes')
+    ax2.set_xlabel('Frequency (f)')
+    ax2.set_ylabel('|A|')
+
+
+# Width of the "1x1" figure in inches, and the share of it taken by the axes
+_CURVE_FIGURE_IN = 10
+_CURVE_AXES_FRACTION = 0.85
+
+
+def parametric_plot_px(enc):
+    """Approximate pixel width of the parametric curve plot drawn with enc, the resolution its detail needs."""
+    return int(enc.dpi_for(_CURVE_FIGURE_IN) * _CURVE_FIGURE_IN * _CURVE_AXES_FRACTION)
+
+
+_COVERAGE_COLORS = ListedColormap([(0, 0, 0, 0), (0, 0, 1, 1)])
+
+
+def render_parametric(bounds, detail, title):
+    """Parametric Curves page figure of a curves.detail() over bounds (a curves.View)."""
+    return render_png("1x1", _draw_parametric, bounds, detail, title)
+
+
+def _draw_parametric(fig, axes, bounds, detail, title):
+    (ax,), = axes
+    if detail.coverage is not None:
+        # Too dense for a line: draw the covered pixels, thickened by one
+        covered = detail.coverage.copy()
+        covered[1:] |= detail.coverage[:-1]
+        covered[:, 1:] |= detail.coverage[:, :-1]
+        # One channel through a two-colour map resamples with far less memory than RGBA
+        ax.imshow(covered.view(np.uint8), cmap=_COVERAGE_COLORS, vmin=0, vmax=1, extent=bounds,
+                  origin='upper', interpolation='nearest', interpolation_stage='data', aspect='auto')
+    else:
+        ax.plot(detail.x, detail.y, 'b-', linewidth=1.5)
+    ax.set_xlim(bounds.x_min, bounds.x_max)
+    ax.set_ylim(bounds.y_min, bounds.y_max)
+    ax.set_aspect('equal')
+    ax.axhline(0, color='k', linewidth=0.5, alpha=0.5)
+    ax.axvline(0, color='k', linewidth=0.5, alpha=0.5)
+    ax.grid(True, alpha=0.3)
+    ax.set_title(title)
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+
+
+def render_inverse(function_type, input_val, curves=None):
+    """Inverse page figure; curves is sampling.inverse_curves(function_type), if already computed."""
+    # Curves, axes and the reference table layout depend on the function only
+    layered = layer_cache.get(("inverse", function_type), lambda: LayeredFigure(
+        "2x2",
+        lambda fig, axes: _draw_inverse_static(fig, axes, function_type, curves),
+        _draw_inverse_dynamic))
+    return layered.render(function_type, input_val)
+
+
+_INVERSE_COLORS = {"arcsin": "b", "arccos": "g", "arctan": "r"}
+
+
+def _draw_inverse_static(fig, axes, function_type, curves):
+    if curves is None:
+        curves = sampling.inverse_curves(function_type)
+    color = _INVERSE_COLORS[function_type]
+    (ax1, ax2), (ax3, ax4) = axes
+    dynamic = {}
+
+    # Plot the inverse function
+    ax1.plot(*curves["inverse"], f'{color}-', linewidth=3, label=f'{function_type}(x)')
+    if function_type == "arctan":
+        ax1.axhline(np.pi/2, color='gray', linestyle='--', alpha=0.5, label='y = π/2')
+        ax1.axhline(-np.pi/2, color='gray', linestyle='--', alpha=0.5, label='y = -π/2')
+    if function_type == "arccos":
+        ax1.set_ylim(-0.5, np.pi + 0.5)
+    else:
+        ax1.set_ylim(-np.pi/2 - 0.5, np.pi/2 + 0.5)
+
+    dynamic['inverse_marker'], = ax1.plot([], [], 'ro', markersize=10, animated=True)
+    dynamic['inverse_vline'] = ax1.axvline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['inverse_hline'] = ax1.axhline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    ax1.set_title(f'{function_type}(x)')
+    ax1.set_xlabel('x')
+    ax1.set_ylabel('y (radians)')
+
+    # Plot the corresponding regular trig function, highlighting the principal domain
+    ax2.plot(*curves["forward"], f'{color}-', linewidth=2, alpha=0.7, label=f'{function_type[3:]}(x)')
+    ax2.plot(*curves["principal"], f'{color}-', linewidth=4, label='Principal branch')
+
+    dynamic['forward_marker'], = ax2.plot([], [], 'ro', markersize=10, animated=True)
+    dynamic['forward_vline'] = ax2.axvline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    dynamic['forward_hline'] = ax2.axhline(0, color='red', linestyle='--', alpha=0.7, animated=True)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+    ax2.set_title(f'Corresponding {function_type[3:]}(x) function')
+    ax2.set_xlabel('x (radians)')
+    ax2.set_ylabel('y')
+    ax2.set_ylim(-3, 3)
+
+    # Unit circle representation
+    circle = Circle((0, 0), 1, fill=False, color='black', linewidth=2)
+    ax3.add_patch(circle)
+
+    # arcsin and arccos show the angle on the unit circle, arctan the slope
+    dynamic['radius'], = ax3.plot([], [], 'ro-', linewidth=3, markersize=8, animated=True)
+    if function_type != "arctan":
+        dynamic['sin_proj'], = ax3.plot([], [], 'b--', linewidth=2, alpha=0.7, animated=True)
+        dynamic['cos_proj'], = ax3.plot([], [], 'g--', linewidth=2, alpha=0.7, animated=True)
+    dynamic['value_text'] = ax3.text(0.1, 0.1, f'{function_type}(-0.00) = -00.0°', animated=True,
+                                     bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
+
+    ax3.set_xlim(-1.5, 1.5)
+    ax3.set_ylim(-1.5, 1.5)
+    ax3.set_aspect('equal')
+    ax3.grid(True, alpha=0.3)
+    ax3.set_title('Unit Circle Representation')
+
+    # Comparison table of values; the row near the input is marked by the dynamic layer
+    ax4.axis('off')
+
+    headers = ['x', '≈', f'{function_type}(x)']
+    table_data = _reference_cells(function_type, None)
+
+    table = ax4.table(cellText=table_data, colLabels=headers,
+                     cellLoc='center', loc='center',
+                     bbox=[0, 0, 1, 1])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 2)
+    table.set_animated(True)
+    dynamic['table'] = table
+
+    ax4.set_title('Special Values Reference')
+    return dynamic
+
+
+def _draw_inverse_dynamic(dynamic, axes, function_type, input_val):
+    result_rad = compute.inverse(function_type, input_val)
+    result_deg = np.degrees(result_rad)
+
+    dynamic['inverse_marker'].set_data([input_val], [result_rad])
+    dynamic['inverse_vline'].set_xdata([input_val, input_val])
+    dynamic['inverse_hline'].set_ydata([result_rad, result_rad])
+    dynamic['forward_marker'].set_data([result_rad], [input_val])
+    dynamic['forward_vline'].set_xdata([result_rad, result_rad])
+    dynamic['forward_hline'].set_ydata([input_val, input_val])
+    artists = [dynamic[name] for name in ('inverse_marker', 'inverse_vline', 'inverse_hline',
+                                          'forward_marker', 'forward_vline', 'forward_hline')]
+
+    if function_type == "arctan":
+        dynamic['radius'].set_data([0, 1], [0, input_val])
+        artists.append(dynamic['radius'])
+    else:
+        x_circle = np.cos(result_rad)
+        y_circle = np.sin(result_rad)
+        dynamic['radius'].set_data([0, x_circle], [0, y_circle])
+        dynamic['sin_proj'].set_data([x_circle, x_circle], [0, y_circle])
+        dynamic['cos_proj'].set_data([0, x_circle], [0, 0])
+        artists += [dynamic['radius'], dynamic['sin_proj'], dynamic['cos_proj']]
+    dynamic['value_text'].set_text(f'{function_type}({input_val:.2f}) = {result_deg:.1f}°')
+    artists.append(dynamic['value_text'])
+
+    # Highlight the reference row nearest to the input
+    table = dynamic['table']
+    near = special_angles.reference_match(function_type, input_val)
+    for i, cells in enumerate(_reference_cells(function_type, near)):
+        for j, text in enumerate(cells):
+            table[(i+1, j)].get_text().set_text(text)
+            table[(i+1, j)].set_facecolor('#ffcccc' if i == near else 'white')
+    artists.append(table)
+    return artists
+
+
+def _reference_cells(function_type, near):
+    """Reference table cell texts, the row at index near marked with an arrow."""
+    cells = []
+    for i, row in enumerate(special_angles.reference_rows(function_type)):
+        mark = "→ " if i == near else ""
+        cells.append([f"{mark}{row.x.text}", f"{row.x.value:.3f}",
+                      f"{special_angles.degrees_text(row.degrees)} = {row.radians}"])
+    return cells
@@ -0,0 +1,323 @@
+"""Trig evaluation with error bounds, escalating ill-conditioned inputs to high precision.
+
+Every function first evaluates all inputs with vectorized float64 NumPy
+and bounds each result's error to first order: the rounding of the
+degrees-to-radians conversion, amplified by the function's derivative,
+plus about an ulp for the library function itself. Only elements whose
+bound exceeds rtol relative to their value, and the inputs of arcsin and
+arccos within DOMAIN_EDGE of ±1, are re-evaluated one by one at
+HIGH_PRECISION_DIGITS significant digits and rounded back to float64.
+
+sin, cos and tan reduce angles exactly in degrees before converting to
+radians, which removes the cancellation that np.sin(np.radians(180))
+suffers: zeros and the undefined tan at odd multiples of 90° come out
+exact, and the bound stays within a few ulps everywhere, so the
+high-precision path is a safety net that rarely runs and throughput stays
+close to plain NumPy.
+
+High precision uses mpmath when it is installed, and the standard library
+decimal module otherwise.
+"""
+
+import decimal
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from . import compute
+
+# Largest accepted relative error bound before an element is escalated
+RTOL = 1e-12
+
+# Significant digits of the high-precision re-evaluation
+HIGH_PRECISION_DIGITS = 40
+
+# Inputs of arcsin and arccos closer than this to ±1 are escalated
+DOMAIN_EDGE = 1e-6
+
+_EPS = np.finfo(float).eps
+
+# Relative error of np.radians(x): the rounded π/180 and the product
+_RADIANS_ERROR = 2 * _EPS
+
+FUNCTIONS = ["sin", "cos", "tan", "arcsin", "arccos", "arctan"]
+
+
+class Bounded(NamedTuple):
+    value: np.ndarray      # float64 results
+    error: np.ndarray      # bound on the absolute error of value
+    escalated: np.ndarray  # bool, True where value came from the high-precision path
+
+
+# -- high precision, one element at a time ------------------------------------
+
+try:
+    import mpmath
+except ImportError:
+    mpmath = None
+
+
+def _decimal_pi():
+    # Machin: π = 16·atan(1/5) − 4·atan(1/239)
+    return 16 * _decimal_atan_small(decimal.Decimal(1) / 5) - 4 * _decimal_atan_small(decimal.Decimal(1) / 239)
+
+
+def _decimal_atan_small(x):
+    """atan(x) for |x| ≤ 1/2 by its Taylor series."""
+    total, power, k, x2 = x, x, 1, x * x
+    while True:
+        power *= -x2
+        term = power / (2 * k + 1)
+        if total + term == total:
+            return total
+        total += term
+        k += 1
+
+
+def _decimal_atan(x, pi):
+    if abs(x) > 1:
+        return (pi / 2 if x > 0 else -pi / 2) - _decimal_atan(1 / x, pi)
+    # atan(x) = 2·atan(x / (1 + √(1 + x²))) halves the argument
+    for _ in range(2):
+        x = x / (1 + (1 + x * x).sqrt())
+    return 4 * _decimal_atan_small(x)
+
+
+def _decimal_sin_cos(x):
+    """(sin x, cos x) for |x| ≤ π/2 by their Taylor series."""
+    sin, cos = sin_term, cos_term = x, decimal.Decimal(1)
+    x2, k = x * x, 1
+    while True:
+        sin_term *= -x2 / ((2 * k) * (2 * k + 1))
+        cos_term *= -x2 / ((2 * k - 1) * (2 * k))
+        if sin + sin_term == sin and cos + cos_term == cos:
+            return sin, cos
+        sin, cos, k = sin + sin_term, cos + cos_term, k + 1
+
+
+def _high_precision_degrees(function, degrees):
+    """sin, cos or tan of a float angle in degrees, reduced exactly before leaving degrees."""
+    r = math.fmod(degrees, 360.0)  # exact
+    if mpmath is not None:
+        with mpmath.workdps(HIGH_PRECISION_DIGITS):
+            turns = mpmath.mpf(r) / 180
+            sin, cos = mpmath.sinpi(turns), mpmath.cospi(turns)  # exact zeros at multiples of 90°
+            if function == "tan":
+                return math.inf if cos == 0 else float(sin / cos) + 0.0
+            return float(sin if function == "sin" else cos) + 0.0
+
+    with decimal.localcontext() as ctx:
+        ctx.prec = HIGH_PRECISION_DIGITS + 5
+        d = decimal.Decimal(r) % 360  # exact
+        if d < 0:
+            d += 360
+        # Reduce to a reference angle in [0°, 90°] and the quadrant's signs
+        ref, sin_sign, cos_sign = d, 1, 1
+        if ref > 180:
+            ref, sin_sign = ref - 180, -1
+            cos_sign = -1
+        if ref > 90:
+            ref, cos_sign = 180 - ref, -cos_sign
+        sin, cos = _decimal_sin_cos(ref * _decimal_pi() / 180)
+        if ref == 0:
+            sin, cos = decimal.Decimal(0), decimal.Decimal(1)
+        elif ref == 90:
+            sin, cos = decimal.Decimal(1), decimal.Decimal(0)
+        sin, cos = sin_sign * sin, cos_sign * cos
+        if function == "tan":
+            return math.inf if cos == 0 else float(sin / cos) + 0.0
+        return float(sin if function == "sin" else cos) + 0.0
+
+
+def _high_precision_inverse(function, x):
+    """arcsin, arccos or arctan of a float, in radians; NaN outside the domain."""
+    if function != "arctan" and abs(x) > 1:
+        return math.nan
+    if mpmath is not None:
+        with mpmath.workdps(HIGH_PRECISION_DIGITS):
+            return float({"arcsin": mpmath.asin, "arccos": mpmath.acos, "arctan": mpmath.atan}[function](x))
+
+    with decimal.localcontext() as ctx:
+        ctx.prec = HIGH_PRECISION_DIGITS + 5
+        d, pi = decimal.Decimal(x), _decimal_pi()
+        if function == "arctan":
+            return float(_decimal_atan(d, pi))
+        if abs(d) == 1:
+            asin = pi / 2 * d
+        else:
+            asin = _decimal_atan(d / (1 - d * d).sqrt(), pi)
+        return float(asin if function == "arcsin" else pi / 2 - asin)
+
+
+def high_precision(function, x):
+    """One of FUNCTIONS at a float x (degrees for sin, cos, tan), correctly rounded to float64."""
+    if function in ("sin", "cos", "tan"):
+        return _high_precision_degrees(function, x)
+    return _high_precision_inverse(function, x)
+
+
+# -- vectorized evaluation -------------------------------------------------------
+
+def _ulp(value):
+    return np.spacing(np.abs(value))
+
+
+def _escalate(function, x, value, error, mask):
+    value = np.asarray(value, dtype=float)
+    error = np.asarray(error, dtype=float)
+    escalated = np.asarray(mask)
+    if not escalated.any():
+        return Bounded(compute._scalar_or_array(value), compute._scalar_or_array(error),
+                       compute._scalar_or_array(escalated))
+    escalated = escalated & np.isfinite(x)
+    value, error = value.copy(), error.copy()
+    for i in np.flatnonzero(escalated):
+        value.flat[i] = high_precision(function, float(x.flat[i]))
+    # Correctly rounded, up to a possible double rounding
+    error[escalated] = np.where(np.isfinite(value[escalated]), _ulp(value[escalated]), 0.0)
+    return Bounded(compute._scalar_or_array(value), compute._scalar_or_array(error),
+                   compute._scalar_or_array(escalated))
+
+
+# Signs of sin and cos in the quadrants k mod 4 of the reduction below
+_SIN_SIGN = np.array([1.0, 1.0, -1.0, -1.0])
+_COS_SIGN = np.array([1.0, -1.0, -1.0, 1.0])
+
+
+def _bounded_trig(x, rtol):
+    """{"sin", "cos", "tan"} -> Bounded for angles x in degrees."""
+    # Reduce exactly in degrees to r + 90°·k with |r| ≤ 45° (fmod and the
+    # subtraction are exact), so sin and cos are only ever evaluated where
+    # they are well-conditioned: zeros and asymptotes come out exact
+    with np.errstate(invalid="ignore"):  # NaN and inf angles stay NaN
+        r = np.fmod(x.ravel(), 360.0)
+        k = np.round(r / 90.0)
+        r -= 90.0 * k
+        quadrant = k.astype(np.intp) & 3
+    rad = np.radians(r)
+    # e_s, e_c bound the errors of s, c: the argument's rounding times the
+    # derivative, plus an ulp for the library function
+    delta = np.abs(rad)
+    delta *= _RADIANS_ERROR
+    s, c = np.sin(rad), np.cos(rad)
+    abs_s, abs_c = np.abs(s), np.abs(c)
+    e_s = abs_c * delta + _EPS * abs_s
+    e_c = abs_s * delta + _EPS * abs_c
+
+    odd = (quadrant & 1).astype(bool)
+    sin = np.where(odd, c, s)
+    sin *= _SIN_SIGN[quadrant]
+    sin += 0.0  # no -0.0
+    cos = np.where(odd, s, c)
+    cos *= _COS_SIGN[quadrant]
+    cos += 0.0
+    e_sin, e_cos = np.where(odd, e_c, e_s), np.where(odd, e_s, e_c)
+    abs_cos = np.abs(cos)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tan = sin / cos
+        abs_tan = np.abs(tan)
+        e_tan = (e_sin + abs_tan * e_cos) / abs_cos + _EPS * abs_tan
+    tan += 0.0
+    undefined = cos == 0
+    tan[undefined] = np.inf
+    e_tan[undefined] = 0.0
+
+    result = {}
+    for name, value, error, magnitude in (("sin", sin, e_sin, np.abs(sin)), ("cos", cos, e_cos, abs_cos),
+                                          ("tan", tan, e_tan, abs_tan)):
+        result[name] = _escalate(name, x, value.reshape(x.shape), error.reshape(x.shape),
+                                 ~(error <= rtol * magnitude).reshape(x.shape))
+    return result
+
+
+def evaluate(function, x, rtol=RTOL, x_error=0.0):
+    """One of FUNCTIONS at x (angles in degrees; arc functions return radians) as a Bounded.
+
+    Elements whose float64 error bound exceeds rtol times their magnitude
+    are re-evaluated at high precision (rtol=0 re-evaluates all inexact
+    ones). tan is inf exactly where it is undefined (odd multiples of 90°);
+    the arc functions are NaN outside their domain.
+
+    x_error bounds the absolute error already in x (e.g. the error of a
+    previous Bounded) and is propagated into the bound. The inputs of the
+    arc functions near ±1 cannot be fixed by more precision, only flagged:
+    the derivative of arcsin and arccos is unbounded there.
+    """
+    x = np.asarray(x, dtype=float)
+    if function in ("sin", "cos", "tan"):
+        bounded = _bounded_trig(x, rtol)[function]
+        if np.any(x_error):
+            slope = {"sin": lambda: evaluate("cos", x).value, "cos": lambda: evaluate("sin", x).value,
+                     "tan": lambda: 1 + bounded.value ** 2}[function]()
+            bounded = bounded._replace(error=bounded.error + np.abs(slope) * np.radians(x_error))
+        return bounded
+    if function not in ("arcsin", "arccos", "arctan"):
+        raise ValueError(f"Unknown function: {function!r}")
+
+    value = compute.inverse(function, x)
+    error = 2 * _ulp(value)
+    if function == "arctan":
+        mask = np.zeros(x.shape, bool)
+    else:
+        # Platform libm accuracy is least certain at the branch points, so
+        # the last DOMAIN_EDGE before them is always evaluated at high precision
+        mask = np.abs(1 - np.abs(x)) < DOMAIN_EDGE
+    mask |= ~(error <= rtol * np.abs(value)) & ~np.isnan(value)
+    bounded = _escalate(function, x, value, error, mask)
+    if np.any(x_error):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = 1 / (1 + x * x) if function == "arctan" else 1 / np.sqrt(1 - x * x)
+        bounded = bounded._replace(error=bounded.error + slope * x_error)
+    return bounded
+
+
+def trig_values(angle_deg, rtol=RTOL):
+    """(sin, cos, tan) of angles in degrees as Bounded results; tan is inf where undefined."""
+    bounded = _bounded_trig(np.asarray(angle_deg, dtype=float), rtol)
+    return bounded["sin"], bounded["cos"], bounded["tan"]
+
+
+def solve_right_triangle(mode, angle=None, hypotenuse=None, opposite=None, adjacent=None, rtol=RTOL):
+    """compute.solve_right_triangle with bounded trig values; returns (triangle, error bounds).
+
+    Both are compute.RightTriangle tuples; the second holds an absolute
+    error bound for every field, with the inputs taken as exact.
+    """
+    if mode == "Two Sides":
+        # No trig evaluation; sides, hypot and arctan2 are within a few ulps
+        solved = compute.solve_right_triangle(mode, opposite=opposite, adjacent=adjacent)
+        return solved, compute.RightTriangle(*(4 * _ulp(np.asarray(f, dtype=float)) for f in solved))
+
+    angle = np.asarray(angle, dtype=float)
+    sin, cos, tan = trig_values(angle, rtol)
+    rel = {name: np.abs(b.error) / np.abs(b.value) for name, b in (("sin", sin), ("cos", cos), ("tan", tan))}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if mode == "Angle and Hypotenuse":
+            hypotenuse = np.asarray(hypotenuse, dtype=float)
+            opposite, adjacent = hypotenuse * sin.value, hypotenuse * cos.value
+            rel_opp, rel_adj, rel_hyp = rel["sin"] + _EPS, rel["cos"] + _EPS, 0.0
+        elif mode == "Angle and Adjacent":
+            adjacent = np.asarray(adjacent, dtype=float)
+            opposite, hypotenuse = adjacent * tan.value, adjacent / cos.value
+            rel_opp, rel_adj, rel_hyp = rel["tan"] + _EPS, 0.0, rel["cos"] + _EPS
+        elif mode == "Angle and Opposite":
+            opposite = np.asarray(opposite, dtype=float)
+            adjacent, hypotenuse = opposite / tan.value, opposite / sin.value
+            rel_opp, rel_adj, rel_hyp = 0.0, rel["tan"] + _EPS, rel["sin"] + _EPS
+        else:
+            raise ValueError(f"Unknown triangle mode: {mode!r}")
+
+    angle, opposite, adjacent, hypotenuse = np.broadcast_arrays(angle, opposite, adjacent, hypotenuse)
+    e_opp, e_adj, e_hyp = (np.abs(v) * r for v, r in ((opposite, rel_opp), (adjacent, rel_adj),
+                                                       (hypotenuse, rel_hyp)))
+    area = 0.5 * opposite * adjacent
+    perimeter = opposite + adjacent + hypotenuse
+    solved = compute.RightTriangle(
+        *(compute._scalar_or_array(v) for v in (angle, 90 - angle, opposite, adjacent, hypotenuse, area, perimeter)))
+    errors = compute.RightTriangle(
+        *(compute._scalar_or_array(np.broadcast_to(e, angle.shape)) for e in (
+            np.zeros(angle.shape), _ulp(90 - angle), e_opp, e_adj, e_hyp,
+            np.abs(area) * (e_opp / np.abs(opposite) + e_adj / np.abs(adjacent) + _EPS),
+            e_opp + e_adj + e_hyp + 2 * _ulp(perimeter))))
+    return solved, errors
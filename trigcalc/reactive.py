@@ -0,0 +1,117 @@
+"""Per-session incremental recomputation within a page.
+
+A Graph holds named nodes, each a function of declared inputs: widget
+values or other nodes. A page keeps one Memo of its graph per session (in
+st.session_state), passes it the current widget values at the start of
+every rerun and reads the nodes it needs. A node is recomputed only when
+one of its inputs changed since its last evaluation in this session;
+otherwise the memoized value is returned, so moving a widget recomputes
+just the nodes downstream of it. A node whose recomputed value equals the
+previous one does not invalidate its dependents.
+
+Nodes are evaluated lazily, so a node nobody reads in a rerun (such as the
+figure while the render cache has it) is not computed at all.
+"""
+
+import time
+from collections import deque
+
+from . import instrumentation
+
+# Reruns kept in Memo.history for the debug view
+HISTORY = 20
+
+_MISSING = object()
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):  # e.g. arrays, whose == is elementwise
+        return False
+
+
+class Graph:
+    """Named computations and the inputs each one reads."""
+
+    def __init__(self, name):
+        self.name = name
+        self.nodes = {}  # node name -> (func, input names)
+
+    def node(self, *inputs):
+        """Decorator adding func as a node named after it; it is called with inputs as keyword arguments."""
+        def decorate(func):
+            self.nodes[func.__name__] = (func, inputs)
+            return func
+        return decorate
+
+    def session(self, store):
+        """This graph's Memo in store (st.session_state), created on first use."""
+        key = f"_reactive_{self.name}"
+        memo = store.get(key)
+        if memo is None or memo.graph is not self:
+            # Also replaces memos of a graph object from before a module reload
+            memo = store[key] = Memo(self)
+        return memo
+
+
+class Memo:
+    """One session's node values, and what each rerun recomputed."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._values = {}    # input or node name -> value
+        self._versions = {}  # input or node name -> version, bumped when its value changes
+        self._seen = {}      # node name -> input versions it was last computed from
+        self.changed = []    # inputs that changed at the start of this rerun
+        self.status = {}     # node name -> "recomputed" or "reused", for nodes read this rerun
+        self.seconds = {}    # node name -> compute time this rerun
+        self.history = deque(maxlen=HISTORY)
+
+    def update(self, **inputs):
+        """Start a rerun with the current widget values."""
+        self.changed = []
+        self.status = {}
+        self.seconds = {}
+        for name, value in inputs.items():
+            if name in self.graph.nodes:
+                raise ValueError(f"{name!r} is a node of graph {self.graph.name!r}, not an input")
+            if not _same(self._values.get(name, _MISSING), value):
+                self._set(name, value)
+                self.changed.append(name)
+        self.history.append({"changed": self.changed, "recomputed": []})
+        return self
+
+    def __getitem__(self, name):
+        if name not in self.graph.nodes:
+            if name not in self._values:
+                raise KeyError(f"No input or node named {name!r} in graph {self.graph.name!r}")
+            return self._values[name]
+        if name in self.status:
+            return self._values[name]
+
+        func, inputs = self.graph.nodes[name]
+        values = {n: self[n] for n in inputs}
+        versions = tuple(self._versions[n] for n in inputs)
+        if self._seen.get(name) == versions:
+            self.status[name] = "reused"
+            instrumentation.count("nodes_reused")
+            return self._values[name]
+
+        start = time.perf_counter()
+        value = func(**values)
+        self.seconds[name] = time.perf_counter() - start
+        self._seen[name] = versions
+        if not _same(self._values.get(name, _MISSING), value):
+            self._set(name, value)
+        self.status[name] = "recomputed"
+        if self.history:
+            self.history[-1]["recomputed"].append(name)
+        instrumentation.count("nodes_recomputed")
+        return value
+
+    def _set(self, name, value):
+        self._values[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
@@ -0,0 +1,315 @@
+"""In-process cache of rendered page figures.
+
+Figures are stored as encoded image bytes keyed by page name and the page's
+normalized widget values, so revisiting a widget state skips matplotlib.
+Entries are evicted least-recently-used once the byte budget is exceeded.
+
+An optional DiskCache below it persists renders across restarts and shares
+them between all server processes on a host (it is also what the warm-up
+fills); memory misses fall through to it.
+"""
+
+import hashlib
+import importlib.util
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: evictions are not serialized across processes
+    fcntl = None
+
+import numpy as np
+
+from . import instrumentation
+
+# Float widget values (e.g. 0.1-step sliders) are rounded before keying so
+# that 0.30000000000000004 and 0.3 share an entry.
+KEY_DECIMALS = 9
+
+
+def normalize_value(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = round(float(value), KEY_DECIMALS)
+        # Integral floats key the same as ints: 45.0 and 45 draw the same figure
+        return int(value) if value.is_integer() else value
+    return str(value)
+
+
+def make_key(page, params):
+    """Build a hashable cache key from a page name and its widget values."""
+    return (page, tuple(sorted((name, normalize_value(v)) for name, v in params.items())))
+
+
+def code_fingerprint(module_names):
+    """Short hash of the source of the named modules, without importing them."""
+    h = hashlib.sha1()
+    for name in module_names:
+        with open(importlib.util.find_spec(name).origin, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+# Modules whose code determines what a render looks like; a change to any
+# of them starts a new disk cache namespace
+RENDER_MODULES = ("trigcalc.plots", "trigcalc.figures", "trigcalc.layers", "trigcalc.compute",
+                  "trigcalc.sampling", "trigcalc.charts", "trigcalc.special_angles", "trigcalc.animation",
+                  "trigcalc.curves")
+
+# Eviction trims the store to this fraction of its budget, so that it does
+# not run again on the next write
+LOW_WATER = 0.9
+
+# A writer checks the store's size after writing this fraction of the budget
+CHECK_FRACTION = 0.05
+
+# Temporary files older than this (seconds) were left by a crashed writer
+STALE_TMP_SECONDS = 3600
+
+
+def open_disk_cache(directory, max_bytes=None):
+    """DiskCache at directory, namespaced by the current drawing code."""
+    return DiskCache(directory, code_fingerprint(RENDER_MODULES), max_bytes)
+
+
+class DiskCache:
+    """Bytes stored one file per key under directory/namespace, shared by processes.
+
+    Every server process (and warm-up worker) on a host can use the same
+    directory, so a state rendered by one process is a hit in all others.
+    Files are written to a temporary name and renamed into place, so
+    concurrent readers and writers never see a partial entry. Reads map the
+    file instead of copying it into the process: the returned memoryview is
+    backed by the OS page cache, which all processes share.
+
+    With max_bytes set, the least recently used files (by mtime, refreshed
+    on every hit) are deleted once the whole directory, including
+    namespaces of older drawing code, grows past the budget. One process at
+    a time evicts, under an advisory lock where the platform has one.
+    """
+
+    def __init__(self, directory, namespace="", max_bytes=None):
+        self.root = directory
+        self.directory = os.path.join(directory, namespace) if namespace else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self._written = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def get(self, key):
+        """Read-only memoryview of the stored bytes, or None."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    data = memoryview(b"")
+                else:
+                    # The mapping outlives the file descriptor, and an eviction
+                    # unlinking the file meanwhile
+                    data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if self.max_bytes:
+            with self._lock:
+                self._written += len(data)
+                check = self._written >= CHECK_FRACTION * self.max_bytes
+                if check:
+                    self._written = 0
+            if check:
+                self.evict()
+
+    def _files(self):
+        now = time.time()
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if name.startswith(".tmp-"):
+                    if now - st.st_mtime > STALE_TMP_SECONDS:
+                        _unlink(path)
+                    continue
+                if name != ".lock":
+                    yield st.st_mtime, st.st_size, path
+
+    def evict(self):
+        """Delete least recently used files until the store is under LOW_WATER of max_bytes; returns the count."""
+        if not self.max_bytes:
+            return 0
+        with _exclusive(os.path.join(self.root, ".lock")) as locked:
+            if not locked:
+                return 0  # another process is evicting
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            if total <= self.max_bytes:
+                return 0
+            evicted = 0
+            for _, size, path in files:
+                if total <= LOW_WATER * self.max_bytes:
+                    break
+                _unlink(path)
+                total -= size
+                evicted += 1
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "max_bytes": self.max_bytes}
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def _exclusive(path):
+    """Hold a non-blocking exclusive lock on path; yields whether it was acquired."""
+    if fcntl is None:
+        yield True
+        return
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RenderCache:
+    """Thread-safe LRU mapping of (page, widget state) to image bytes, optionally backed by a DiskCache."""
+
+    def __init__(self, max_bytes, disk=None):
+        self.max_bytes = int(max_bytes)
+        self.disk = disk
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, page, params):
+        key = make_key(page, params)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        instrumentation.count("render_cache_disk_hits")
+        self._store(key, data)
+        return data
+
+    def put(self, page, params, data):
+        key = make_key(page, params)
+        self._store(key, data)
+        if self.disk is not None:
+            self.disk.put(key, data)
+
+    def _store(self, key, data):
+        size = len(data)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= len(self._entries.pop(key))
+            # Entries larger than the whole budget are never stored
+            if size > self.max_bytes:
+                return
+            self._entries[key] = data
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, page, params, render):
+        """Return cached bytes for this state, calling render() on a miss."""
+        data = self.get(page, params)
+        if data is None:
+            instrumentation.count("render_cache_misses")
+            data = render()
+            self.put(page, params, data)
+        else:
+            instrumentation.count("render_cache_hits")
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            hits = self.hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,156 @@
+"""Adaptive curve sampling for the plots.
+
+Instead of evaluating a curve on a fixed dense grid, points are placed
+where the curve bends within the visible y-range: an interval is split
+while the curve's midpoint is further from the straight chord than a
+fraction of the view height. Flat stretches and parts outside the view stay
+coarse; steep and tightly curved parts get more points. Known
+discontinuities (the asymptotes of a tangent wave) split the curve into
+separate runs joined by NaN, so no false vertical segment is drawn across
+them.
+"""
+
+import numpy as np
+
+from . import compute, instrumentation
+
+# Largest allowed chord error as a fraction of the visible y-range
+# (about half a pixel on a 500 px tall axes)
+DEFAULT_TOLERANCE = 1e-3
+
+# Halving rounds per interval after the initial grid
+MAX_DEPTH = 14
+
+# Initial grid points per period of a periodic curve, so that the midpoint
+# test cannot step over a whole oscillation
+POINTS_PER_PERIOD = 8
+
+_PROBES = np.array([0.25, 0.5, 0.75])
+
+
+def adaptive_sample(func, x_min, x_max, y_range, initial=17, tolerance=DEFAULT_TOLERANCE,
+                    max_depth=MAX_DEPTH):
+    """Sample the vectorized func on [x_min, x_max]; returns sorted (x, y) arrays.
+
+    Refinement is measured on values clipped to y_range (plus a small
+    margin), so the curve is only refined where it is visible.
+    """
+    lo, hi = y_range
+    margin = 0.02 * (hi - lo)
+    clip_lo, clip_hi = lo - margin, hi + margin
+    threshold = tolerance * (hi - lo)
+
+    x = np.linspace(x_min, x_max, max(int(initial), 2))
+    with np.errstate(all="ignore"):
+        y = np.asarray(func(x), dtype=float)
+    # Intervals that may still need splitting
+    active = np.ones(len(x) - 1, dtype=bool)
+
+    for _ in range(max_depth):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        # Chord error at the quarter points and midpoint of each interval
+        # (the midpoint alone underestimates it on steep, convex stretches)
+        x0, x1 = x[idx], x[idx + 1]
+        y0 = np.clip(y[idx], clip_lo, clip_hi)
+        y1 = np.clip(y[idx + 1], clip_lo, clip_hi)
+        t = _PROBES[:, None]
+        with np.errstate(all="ignore"):
+            y_probe = np.asarray(func(x0 + t * (x1 - x0)), dtype=float)
+        chord = y0 + t * (y1 - y0)
+        error = np.abs(np.clip(y_probe, clip_lo, clip_hi) - chord).max(axis=0)
+        split = error > threshold
+        if not split.any():
+            break
+
+        idx = idx[split]
+        x_mid = 0.5 * (x0 + x1)[split]
+        y_mid = y_probe[1, split]
+        x = np.insert(x, idx + 1, x_mid)
+        y = np.insert(y, idx + 1, y_mid)
+        # Both halves of a split interval are tested again; the rest are done
+        active = np.zeros(len(x) - 1, dtype=bool)
+        halves = idx + np.arange(len(idx))
+        active[halves] = True
+        active[halves + 1] = True
+    return x, y
+
+
+def sample_curve(func, x_min, x_max, y_range, breaks=(), inset=None, **kwargs):
+    """Adaptively sample func, splitting the curve at the x positions in breaks.
+
+    Each run stops inset short of a break, and runs are separated by a NaN
+    point so line plots leave a gap there.
+    """
+    if inset is None:
+        inset = 1e-6 * (x_max - x_min)
+    edges = [x_min]
+    for b in np.sort(np.asarray(breaks, dtype=float)):
+        if x_min < b < x_max:
+            edges.append(b)
+    edges.append(x_max)
+
+    xs, ys = [], []
+    for i, (a, b) in enumerate(zip(edges[:-1], edges[1:])):
+        start = a + inset if i > 0 else a
+        stop = b - inset if i < len(edges) - 2 else b
+        if stop <= start:
+            continue
+        if xs:
+            xs.append(np.array([a]))
+            ys.append(np.array([np.nan]))
+        x, y = adaptive_sample(func, start, stop, y_range, **kwargs)
+        xs.append(x)
+        ys.append(y)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+@instrumentation.timed("compute")
+def sample_wave(wave_type, x_min, x_max, y_range, amplitude=1.0, frequency=1.0, phase_deg=0.0,
+                vertical_shift=0.0, tolerance=DEFAULT_TOLERANCE):
+    """Sample compute.wave for display over y_range; tangent runs end just outside the view."""
+    def func(x):
+        return compute.wave(x, wave_type, amplitude, frequency, phase_deg, vertical_shift)
+
+    period = compute.wave_period(abs(frequency), wave_type)
+    breaks = compute.wave_asymptotes(x_min, x_max, wave_type, frequency, phase_deg)
+    # Initial grid per run between asymptotes
+    periods_per_run = (x_max - x_min) / period / (len(breaks) + 1)
+    initial = max(9, int(np.ceil(POINTS_PER_PERIOD * periods_per_run)) + 1)
+
+    inset = None
+    if len(breaks) and amplitude != 0:
+        # amplitude·cot(δ) reaches just past the furthest view edge at δ from an asymptote
+        reach = 1.05 * max(abs(y_range[0] - vertical_shift), abs(y_range[1] - vertical_shift))
+        inset = min(np.arctan(abs(amplitude) / reach) / abs(frequency), 0.25 * period)
+    return sample_curve(func, x_min, x_max, y_range, breaks=breaks, inset=inset,
+                        initial=initial, tolerance=tolerance)
+
+
+def wave_y_range(wave_type):
+    """Visible y-range of the Wave Functions plots for wave_type."""
+    return (-10, 10) if wave_type == "Tangent" else (-6, 6)
+
+
+def inverse_curves(function_type):
+    """The Inverse Functions page's curves for function_type, which do not depend on the input value.
+
+    Returns a dict of (x, y) pairs: "inverse" over the function's plotted
+    domain, "forward" (the trig function over [-2π, 2π]) and "principal"
+    (the trig function over its principal branch).
+    """
+    if function_type == "arctan":
+        x_inverse = np.linspace(-10, 10, 1000)
+        forward = sample_wave("Tangent", -2*np.pi, 2*np.pi, (-3, 3))
+    else:
+        x_inverse = np.linspace(-1, 1, 1000)
+        x_trig = np.linspace(-2*np.pi, 2*np.pi, 1000)
+        forward = (x_trig, compute.forward(function_type, x_trig))
+    principal = {"arcsin": (-np.pi/2, np.pi/2), "arccos": (0, np.pi),
+                 "arctan": (-np.pi/2 + 0.1, np.pi/2 - 0.1)}[function_type]
+    x_principal = np.linspace(*principal, 100)
+    return {"inverse": (x_inverse, compute.inverse(function_type, x_inverse)),
+            "forward": forward,
+            "principal": (x_principal, compute.forward(function_type, x_principal))}
+
@@ -0,0 +1,504 @@
+"""Headless HTTP service for the page math.
+
+Answers the computations behind the Triangle Calculator, Wave Functions
+and Inverse Functions pages over plain HTTP/1.1, with the same functions
+the pages call and none of Streamlit's rerun and rendering work. Every
+endpoint takes a JSON object, or an .npz archive of named arrays with
+Content-Type application/x-npz. Numbers may be scalars or (nested) arrays,
+which broadcast against each other like NumPy arrays, so one request can
+solve 100k triangles:
+
+    POST /v1/triangle  {"mode": "Two Sides", "opposite": [...], "adjacent": [...]}
+                       {"case": "SSA", "a": 5, "b": 7, "angle_a": [30, 35, 40]}
+    POST /v1/wave      {"wave_type": "Sine", "grid": [-6.28, 6.28, 1001], "amplitude": 2}
+    POST /v1/inverse   {"function": "arcsin", "x": [...]}
+    POST /v1/batch     {"requests": [{"op": "inverse", "function": "arctan", "x": 1}, ...]}
+    GET  /v1/health
+
+Responses are JSON objects of the result arrays, with null for NaN and
+infinity, or an .npz archive of them with Accept: application/x-npz.
+Errors are JSON {"error": ...} with a 4xx or 5xx status.
+
+Connections are served by an asyncio event loop. Small requests are
+computed on it directly; requests with large bodies or results are parsed,
+computed and encoded in a bounded process pool, and when max_pending of
+them are already waiting for it, new ones get 503. Bodies over
+max_body_bytes get 413 without being kept in memory, as do requests
+computing more than max_elements values; requests not received within
+READ_TIMEOUT get 408.
+
+Usage::
+
+    python -m trigcalc.service --port 8765 --workers 2
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import NamedTuple
+
+import numpy as np
+
+from . import compute, precision, settings
+
+JSON_TYPE = "application/json"
+NPZ_TYPE = "application/x-npz"
+
+# Requests up to these sizes are handled on the event loop; they take well
+# under a millisecond, less than a round trip to a worker process
+INLINE_BODY_BYTES = 64 * 1024
+INLINE_ELEMENTS = 10_000
+
+MAX_HEADER_LINES = 100
+
+# Seconds a connection may take to send a request's headers or body
+READ_TIMEOUT = 30.0
+
+
+class Limits(NamedTuple):
+    max_body_bytes: int = int(settings.SERVICE_MAX_BODY_MB * 1024 * 1024)
+    max_elements: int = settings.SERVICE_MAX_ELEMENTS
+    max_pending: int = settings.SERVICE_MAX_PENDING
+
+
+class ServiceError(Exception):
+    """A request the service refuses, with the HTTP status to answer."""
+
+    def __init__(self, status, message):
+        # Both in args, so the error pickles back from a worker process
+        super().__init__(status, message)
+        self.status = HTTPStatus(status)
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class _Offload(Exception):
+    """Raised by an inline computation too large for the event loop."""
+
+
+def _number(params, name, default=None):
+    value = params.pop(name, default)
+    if value is None:
+        raise ServiceError(400, f"Missing parameter {name!r}")
+    try:
+        array = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"Parameter {name!r} must be a number or an array of numbers") from None
+    return array
+
+
+def _choice(params, name, choices):
+    value = params.pop(name, None)
+    if isinstance(value, np.ndarray):
+        value = value.item() if value.ndim == 0 else None
+    if value not in choices:
+        raise ServiceError(400, f"Parameter {name!r} must be one of {list(choices)}")
+    return value
+
+
+def _check_size(arrays, max_elements):
+    try:
+        shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+    except ValueError:
+        raise ServiceError(400, "Array parameters do not broadcast against each other") from None
+    size = int(np.prod(shape))
+    if size > max_elements:
+        raise ServiceError(413, f"Request computes {size} values; the limit is {max_elements}")
+    return size
+
+
+def _triangle(params, max_elements):
+    if "case" in params:
+        case = _choice(params, "case", compute.OBLIQUE_CASES)
+        inputs = {name: _number(params, name) for name in compute.OBLIQUE_INPUTS[case]}
+        yield _check_size(inputs.values(), max_elements) * 2
+        solved = compute.solve_oblique_triangle(case, **inputs)
+        yield solved._asdict()
+        return
+    mode = _choice(params, "mode", compute.TRIANGLE_MODES)
+    inputs = {name: _number(params, name) for name in {
+        "Angle and Hypotenuse": ("angle", "hypotenuse"), "Two Sides": ("opposite", "adjacent"),
+        "Angle and Adjacent": ("angle", "adjacent"), "Angle and Opposite": ("angle", "opposite"),
+    }[mode]}
+    yield _check_size(inputs.values(), max_elements) * 2
+    solved, errors = precision.solve_right_triangle(mode, **inputs)
+    # Inputs are not clamped as the page's widgets do; flag the rows that are no triangle
+    valid = np.ones(np.shape(solved.angle_a), dtype=bool)
+    for name, values in inputs.items():
+        valid &= (values > 0) & np.isfinite(values) & ((values < 90) if name == "angle" else True)
+    result = solved._asdict()
+    result.update({f"{name}_error": value for name, value in errors._asdict().items()})
+    result["valid"] = valid
+    yield result
+
+
+def _wave(params, max_elements):
+    wave_type = _choice(params, "wave_type", compute.WAVE_TYPES)
+    result = {}
+    grid = None
+    if "grid" in params:
+        grid = _number(params, "grid")
+        if grid.shape != (3,) or not np.isfinite(grid).all() or not grid[2] >= 1 or grid[2] != int(grid[2]):
+            raise ServiceError(400, "Parameter 'grid' must be [start, stop, number of points]")
+        points = int(grid[2])
+        if points > max_elements:
+            raise ServiceError(413, f"Request computes {points} values; the limit is {max_elements}")
+        # A stand-in of the grid's shape: nothing is allocated before the request is sized
+        x = np.broadcast_to(0.0, (points,))
+    else:
+        x = _number(params, "x")
+    defaults = dict(amplitude=1.0, frequency=1.0, phase=0.0, vertical_shift=0.0)
+    shape = {name: _number(params, name, default) for name, default in defaults.items()}
+    yield _check_size([x, *shape.values()], max_elements)
+    if grid is not None:
+        x = result["x"] = np.linspace(grid[0], grid[1], points)
+    result["y"] = compute.wave(x, wave_type, shape["amplitude"], shape["frequency"], shape["phase"],
+                               shape["vertical_shift"])
+    yield result
+
+
+def _inverse(params, max_elements):
+    function_type = _choice(params, "function", compute.INVERSE_FUNCTIONS)
+    x = _number(params, "x")
+    yield _check_size([x], max_elements) * 3
+    radians, verification, error = compute.round_trip(function_type, x)
+    yield {"radians": radians, "degrees": np.degrees(radians), "verification": verification, "error": error}
+
+
+# Endpoint name -> generator yielding the request's size, then its results
+OPERATIONS = {"triangle": _triangle, "wave": _wave, "inverse": _inverse}
+
+
+def _compute(op, params, max_elements, inline_elements=None):
+    """Results of one operation as a dict of arrays; raises _Offload past inline_elements."""
+    if op not in OPERATIONS:
+        raise ServiceError(404, f"Unknown operation {op!r}; choose one of {list(OPERATIONS)}")
+    params = dict(params)
+    steps = OPERATIONS[op](params, max_elements)
+    size = next(steps)
+    if params:
+        raise ServiceError(400, f"Unknown parameters for {op}: {sorted(params)}")
+    if inline_elements is not None and size > inline_elements:
+        raise _Offload()
+    with np.errstate(all="ignore"):
+        return next(steps)
+
+
+def compute_request(op, body, max_elements=settings.SERVICE_MAX_ELEMENTS, inline_elements=None):
+    """Results of a parsed request to /v1/<op>: a dict of arrays, or of such dicts for a batch."""
+    if not isinstance(body, dict):
+        raise ServiceError(400, "The request body must be a JSON object")
+    if op != "batch":
+        return _compute(op, body, max_elements, inline_elements)
+    requests = body.get("requests")
+    if not isinstance(requests, list) or set(body) != {"requests"}:
+        raise ServiceError(400, "A batch body is {\"requests\": [{\"op\": ..., ...}, ...]}")
+    results = []
+    budget = max_elements
+    for request in requests:
+        try:
+            if not isinstance(request, dict):
+                raise ServiceError(400, "Each batch request must be a JSON object")
+            request = dict(request)
+            result = _compute(request.pop("op", None), request, budget, inline_elements)
+            budget -= sum(int(np.size(v)) for v in result.values())
+            results.append(result)
+        except ServiceError as e:
+            if e.status == 413:
+                raise  # the batch as a whole is over the limit
+            results.append({"error": str(e), "status": int(e.status)})
+        if inline_elements is not None:
+            inline_elements -= sum(int(np.size(v)) for v in results[-1].values())
+            if inline_elements < 0:
+                raise _Offload()
+    return {"results": results}
+
+
+def parse_body(body, content_type):
+    """The request parameters from a JSON or .npz body."""
+    if not body:
+        return {}
+    if content_type.startswith(NPZ_TYPE):
+        try:
+            with np.load(io.BytesIO(body), allow_pickle=False) as archive:
+                return {name: archive[name] for name in archive.files}
+        except Exception:
+            raise ServiceError(400, "The body is not a valid .npz archive") from None
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise ServiceError(400, f"The body is not valid JSON: {e}") from None
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {name: _jsonable(v) for name, v in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int)):
+        return value
+    array = np.asarray(value)
+    if array.dtype.kind == "f" and not np.isfinite(array).all():
+        array = np.where(np.isfinite(array), array, None)
+    return array.tolist()
+
+
+def _flatten(results, prefix=""):
+    for name, value in results.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{name}/")
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                yield from _flatten(item, f"{prefix}{name}/{i}/")
+        else:
+            yield prefix + name, np.asarray(value)
+
+
+def encode_results(results, accept=JSON_TYPE):
+    """(content type, body) of results in the format the Accept header asks for.
+
+    .npz archives name nested results by their path, e.g. "results/0/y".
+    """
+    if NPZ_TYPE in accept:
+        buf = io.BytesIO()
+        np.savez(buf, **dict(_flatten(results)))
+        return NPZ_TYPE, buf.getvalue()
+    return JSON_TYPE, json.dumps(_jsonable(results), separators=(",", ":")).encode()
+
+
+def handle(op, body, content_type, accept, max_elements=settings.SERVICE_MAX_ELEMENTS):
+    """(content type, body) answering a request; runs in the worker processes."""
+    results = compute_request(op, parse_body(body, content_type), max_elements)
+    return encode_results(results, accept)
+
+
+def _error_body(status, message):
+    return JSON_TYPE, json.dumps({"error": message, "status": int(status)}).encode()
+
+
+class Service:
+    """The HTTP server and its worker pool; start() and stop() run on an asyncio loop."""
+
+    def __init__(self, host="127.0.0.1", port=0, workers=None, limits=None):
+        self.host = host
+        self.port = port
+        self.workers = workers or settings.SERVICE_WORKERS or os.cpu_count() or 1
+        self.limits = limits or Limits()
+        self.pending = 0
+        self.requests = 0
+        self._pool = None
+        self._server = None
+
+    async def start(self):
+        # spawn: forking a threaded server process is unsafe
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._pool.shutdown(cancel_futures=True)
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = await self._exchange(reader, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _exchange(self, reader, writer):
+        """Read one request and write its response; returns whether the connection stays open."""
+        line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+        if not line:
+            return False
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, *_error_body(400, "Malformed request line"), False)
+            return False
+        headers = {}
+        try:
+            for _ in range(MAX_HEADER_LINES):
+                line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                    *_error_body(431, "Too many headers"), False)
+                return False
+        except asyncio.TimeoutError:
+            await self._respond(writer, HTTPStatus.REQUEST_TIMEOUT, *_error_body(408, "Headers not received in time"),
+                                False)
+            return False
+        keep_alive = self._keep_alive(version, headers)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            await self._respond(writer, HTTPStatus.LENGTH_REQUIRED,
+                                *_error_body(411, "Send the body with a Content-Length"), False)
+            return False
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, *_error_body(400, "Invalid Content-Length"), False)
+            return False
+        expect_continue = headers.get("expect", "").lower() == "100-continue"
+        if length > self.limits.max_body_bytes:
+            await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, *_error_body(
+                413, f"Body of {length} bytes; the limit is {self.limits.max_body_bytes}"), False)
+            if not expect_continue:
+                # Discarded without being held, so the client reads the 413 instead of a reset
+                while length > 0:
+                    chunk = await asyncio.wait_for(reader.read(min(length, 1 << 16)), READ_TIMEOUT)
+                    if not chunk:
+                        break
+                    length -= len(chunk)
+            return False
+        if expect_continue and length:
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT) if length else b""
+        except asyncio.TimeoutError:
+            await self._respond(writer, HTTPStatus.REQUEST_TIMEOUT, *_error_body(408, "Body not received in time"),
+                                False)
+            return False
+
+        status, content_type, payload = await self._dispatch(method, target, headers, body)
+        await self._respond(writer, status, content_type, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _keep_alive(version, headers):
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+    async def _dispatch(self, method, target, headers, body):
+        self.requests += 1
+        path = target.split("?", 1)[0].rstrip("/")
+        if path == "/v1/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, *_error_body(405, "Use GET")
+            return HTTPStatus.OK, JSON_TYPE, json.dumps({
+                "status": "ok", "workers": self.workers, "pending": self.pending,
+                "operations": [*OPERATIONS, "batch"], "limits": self.limits._asdict()}).encode()
+        op = path[len("/v1/"):] if path.startswith("/v1/") else None
+        if op not in (*OPERATIONS, "batch"):
+            return HTTPStatus.NOT_FOUND, *_error_body(404, f"No endpoint {path!r}")
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, *_error_body(405, "Use POST")
+
+        content_type = headers.get("content-type", JSON_TYPE)
+        accept = headers.get("accept", JSON_TYPE)
+        try:
+            if len(body) <= INLINE_BODY_BYTES:
+                try:
+                    results = compute_request(op, parse_body(body, content_type), self.limits.max_elements,
+                                              INLINE_ELEMENTS)
+                    return HTTPStatus.OK, *encode_results(results, accept)
+                except _Offload:
+                    pass
+            return HTTPStatus.OK, *await self._offload(op, body, content_type, accept)
+        except ServiceError as e:
+            return e.status, *_error_body(e.status, str(e))
+        except Exception as e:
+            # Still an answer, so a request that breaks the service never just drops its connection
+            traceback.print_exc()
+            return HTTPStatus.INTERNAL_SERVER_ERROR, *_error_body(500, f"Internal error: {type(e).__name__}")
+
+    async def _offload(self, op, body, content_type, accept):
+        if self.pending >= self.limits.max_pending:
+            raise ServiceError(503, "All workers are busy; retry later")
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, handle, op, body, content_type, accept, self.limits.max_elements)
+        finally:
+            self.pending -= 1
+
+    async def _respond(self, writer, status, content_type, payload, keep_alive):
+        status = HTTPStatus(status)
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        await writer.drain()
+
+
+def serve_in_background(port, host="127.0.0.1", workers=None, limits=None):
+    """Start a Service on its own event loop in a daemon thread; returns it once it is listening."""
+    service = Service(host, port, workers, limits)
+    started = threading.Event()
+    errors = []
+
+    def run():
+        async def main():
+            try:
+                await service.start()
+            except BaseException as e:
+                errors.append(e)
+                raise
+            finally:
+                started.set()
+            await service.serve_forever()
+
+        try:
+            asyncio.run(main())
+        except BaseException:
+            pass  # reported through errors when starting; the app runs without the service
+
+    threading.Thread(target=run, name="trig-service", daemon=True).start()
+    started.wait()
+    if errors:
+        raise errors[0]
+    return service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=settings.SERVICE_PORT or 8765)
+    parser.add_argument("--workers", type=int, help="worker processes (default: TRIG_SERVICE_WORKERS or one per CPU)")
+    args = parser.parse_args(argv)
+
+    async def run():
+        service = await Service(args.host, args.port, args.workers).start()
+        print(f"Serving on http://{service.host}:{service.port}/v1/ with {service.workers} workers", file=sys.stderr)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
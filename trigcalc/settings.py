@@ -0,0 +1,131 @@
+"""Deployment settings, read once from environment variables."""
+
+import os
+
+
+def env_float(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+# Memory budget for the per-process rendered figure cache
+RENDER_CACHE_MB = env_float("TRIG_RENDER_CACHE_MB", 64.0)
+
+# Idle figures kept for reuse per page layout
+FIGURE_POOL_SIZE = env_int("TRIG_FIGURE_POOL_SIZE", 2)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# Pages whose charts are drawn in the browser from Vega-Lite specs instead
+# of server-rendered PNGs: page module names (e.g. "waves,inverse") or "all"
+CLIENT_CHART_PAGES = env_list("TRIG_CLIENT_CHARTS")
+
+# Overall width of client-side charts; curves are downsampled to about two
+# points per pixel of each panel
+CLIENT_CHART_WIDTH_PX = env_int("TRIG_CLIENT_CHART_WIDTH_PX", 900)
+
+# Show per-rerun stage timings in a sidebar panel
+DEBUG_PANEL = env_bool("TRIG_DEBUG_PANEL")
+
+# JSON-lines file every rerun's timings are appended to (unset: no log)
+TIMINGS_LOG = os.environ.get("TRIG_TIMINGS_LOG") or None
+
+# Local port serving aggregated timings in Prometheus text format at
+# /metrics (0: disabled)
+METRICS_PORT = env_int("TRIG_METRICS_PORT", 0)
+
+# Run each page as an st.fragment so its widgets rerun only the page
+PAGE_FRAGMENTS = env_bool("TRIG_PAGE_FRAGMENTS", True)
+
+# Directory of the persistent render cache shared by server processes and
+# filled by the warm-up (unset: memory cache only)
+RENDER_CACHE_DIR = os.environ.get("TRIG_RENDER_CACHE_DIR") or None
+
+# Size budget of RENDER_CACHE_DIR; least recently used entries are evicted
+RENDER_CACHE_DIR_MB = env_float("TRIG_RENDER_CACHE_DIR_MB", 1024.0)
+
+# Pre-render the finite page states into RENDER_CACHE_DIR in the background
+# after startup
+WARMUP = env_bool("TRIG_WARMUP")
+
+# Fraction of the CPUs the warm-up workers may use
+WARMUP_CPU_BUDGET = env_float("TRIG_WARMUP_CPU_BUDGET", 0.5)
+
+
+def _image_formats(items):
+    formats = {}
+    for item in items:
+        page, _, fmt = item.rpartition("=")
+        fmt = fmt.strip().lower()
+        if fmt == "jpg":
+            fmt = "jpeg"
+        if fmt not in ("png", "jpeg", "svg"):
+            raise ValueError(f"TRIG_IMAGE_FORMAT: unknown image format {fmt!r}")
+        formats[page.strip() or "default"] = fmt
+    return formats
+
+
+# Encoding of server-rendered figures: a default format and per-page
+# overrides, e.g. "png,waves=svg,inverse=jpeg"
+IMAGE_FORMATS = _image_formats(env_list("TRIG_IMAGE_FORMAT", ["png"]))
+
+# Pixel width raster figures are drawn at when the client sends no viewport
+# hints (1460 is the widest st.image shows without resizing)
+IMAGE_WIDTH_PX = env_int("TRIG_IMAGE_WIDTH_PX", 1460)
+
+# Fixed raster DPI, overriding the width (0: derive from the width)
+IMAGE_DPI = env_float("TRIG_IMAGE_DPI", 0.0)
+
+# Quality of JPEG figures
+JPEG_QUALITY = env_int("TRIG_JPEG_QUALITY", 85)
+
+# Payload budget per figure; larger renders are downscaled (0: no budget)
+IMAGE_MAX_KB = env_float("TRIG_IMAGE_MAX_KB", 0.0)
+
+# The special-angle table holds every multiple of π/n for these n
+# (12: every 15°)
+SPECIAL_ANGLE_DIVISORS = [int(n) for n in env_list("TRIG_SPECIAL_ANGLE_DIVISORS", ["12"])]
+
+# Pixel width of angle-sweep animation frames
+ANIMATION_WIDTH_PX = env_int("TRIG_ANIMATION_WIDTH_PX", 640)
+
+# Processes rendering animation frames (0: one per CPU)
+ANIMATION_WORKERS = env_int("TRIG_ANIMATION_WORKERS", 0)
+
+# Local port of the headless JSON computation service started next to the
+# app (0: disabled; see trigcalc.service)
+SERVICE_PORT = env_int("TRIG_SERVICE_PORT", 0)
+
+# Processes computing the service's large requests (0: one per CPU)
+SERVICE_WORKERS = env_int("TRIG_SERVICE_WORKERS", 0)
+
+# Largest request body the service reads
+SERVICE_MAX_BODY_MB = env_float("TRIG_SERVICE_MAX_BODY_MB", 32.0)
+
+# Most array elements one service request may compute
+SERVICE_MAX_ELEMENTS = env_int("TRIG_SERVICE_MAX_ELEMENTS", 2_000_000)
+
+# Large requests waiting for a worker before the service answers 503
+SERVICE_MAX_PENDING = env_int("TRIG_SERVICE_MAX_PENDING", 32)
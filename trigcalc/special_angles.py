@@ -0,0 +1,218 @@
+"""Exact values of the trig functions at special angles.
+
+The table holds every multiple of π/n in [0°, 360°) for the divisors n in
+settings.SPECIAL_ANGLE_DIVISORS (by default 12, i.e. every 15°), with the
+exact form of sin, cos and tan (such as √3/2) and its float value. It is
+built once per process (see table()).
+
+Lookups are binary searches over sorted arrays, so they take O(log n) per
+value and accept NumPy arrays as well as scalars: nearest_angle() for an
+angle, nearest_value() for the input of an inverse function.
+"""
+
+import math
+from fractions import Fraction
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from . import settings
+
+_R2, _R3, _R5, _R6 = math.sqrt(2), math.sqrt(3), math.sqrt(5), math.sqrt(6)
+
+# Reference angle (degrees) -> exact sin and tan in the first quadrant;
+# cos(r) is sin(90° - r). tan(90°) is undefined.
+_FIRST_QUADRANT = {
+    Fraction(0): (("0", 0.0), ("0", 0.0)),
+    Fraction(15): (("(√6 − √2)/4", (_R6 - _R2) / 4), ("2 − √3", 2 - _R3)),
+    Fraction(18): (("(√5 − 1)/4", (_R5 - 1) / 4), ("√(25 − 10√5)/5", math.sqrt(25 - 10 * _R5) / 5)),
+    Fraction(45, 2): (("√(2 − √2)/2", math.sqrt(2 - _R2) / 2), ("√2 − 1", _R2 - 1)),
+    Fraction(30): (("1/2", 0.5), ("√3/3", _R3 / 3)),
+    Fraction(36): (("√(10 − 2√5)/4", math.sqrt(10 - 2 * _R5) / 4), ("√(5 − 2√5)", math.sqrt(5 - 2 * _R5))),
+    Fraction(45): (("√2/2", _R2 / 2), ("1", 1.0)),
+    Fraction(54): (("(√5 + 1)/4", (_R5 + 1) / 4), ("√(25 + 10√5)/5", math.sqrt(25 + 10 * _R5) / 5)),
+    Fraction(60): (("√3/2", _R3 / 2), ("√3", _R3)),
+    Fraction(135, 2): (("√(2 + √2)/2", math.sqrt(2 + _R2) / 2), ("√2 + 1", _R2 + 1)),
+    Fraction(72): (("√(10 + 2√5)/4", math.sqrt(10 + 2 * _R5) / 4), ("√(5 + 2√5)", math.sqrt(5 + 2 * _R5))),
+    Fraction(75): (("(√6 + √2)/4", (_R6 + _R2) / 4), ("2 + √3", 2 + _R3)),
+    Fraction(90): (("1", 1.0), None),
+}
+
+# Divisors n of the reference table on the Inverse Functions page (multiples
+# of 30° and 45°)
+REFERENCE_DIVISORS = (4, 6)
+
+# Inputs within this distance of a reference table row highlight it
+REFERENCE_TOLERANCE = 0.1
+
+
+class Exact(NamedTuple):
+    text: str     # exact form, e.g. "√3/2"; a rounded decimal when there is none
+    value: float
+    exact: bool = True
+
+
+class SpecialAngle(NamedTuple):
+    degrees: float
+    radians: str  # e.g. "5π/6"
+    sin: Exact
+    cos: Exact
+    tan: Optional[Exact]  # None where tan is undefined
+
+
+class InverseRow(NamedTuple):
+    """A special input x of an inverse function and its principal value."""
+    x: Exact
+    degrees: float
+    radians: str
+
+
+def _pi_text(degrees):
+    turns = Fraction(degrees) / 180
+    if turns == 0:
+        return "0"
+    sign = "−" if turns < 0 else ""
+    num, den = abs(turns.numerator), turns.denominator
+    text = f"{'' if num == 1 else num}π"
+    return sign + (text if den == 1 else f"{text}/{den}")
+
+
+def degrees_text(degrees):
+    """Degrees without a trailing .0, e.g. "60°", "22.5°" or "−45°"."""
+    return f"{degrees:g}°".replace("-", "−")
+
+
+def _signed(sign, magnitude):
+    text, value = magnitude
+    if value == 0 or sign > 0:
+        return Exact(text, value)
+    if " " in text and not text.startswith(("(", "√(")):
+        text = f"({text})"  # a sum such as 2 + √3
+    return Exact(f"−{text}", -value)
+
+
+def _magnitudes(ref):
+    """(sin, cos, tan) magnitudes at a reference angle in [0°, 90°], tan None at 90°."""
+    sin_tan = _FIRST_QUADRANT.get(ref)
+    cos_tan = _FIRST_QUADRANT.get(90 - ref)
+    if sin_tan and cos_tan:
+        return sin_tan[0], cos_tan[0], sin_tan[1]
+    # No closed form in the table: rounded decimals
+    rad = math.radians(ref)
+    sin, cos = math.sin(rad), math.cos(rad)
+    tan = None if ref == 90 else (f"{math.tan(rad):.4f}", math.tan(rad))
+    return (f"{sin:.4f}", sin), (f"{cos:.4f}", cos), tan
+
+
+def special_angle(degrees):
+    """The SpecialAngle at degrees (a Fraction or int in [0, 360))."""
+    degrees = Fraction(degrees)
+    ref = degrees % 180
+    if ref > 90:
+        ref = 180 - ref
+    sin, cos, tan = _magnitudes(ref)
+    exact = ref in _FIRST_QUADRANT and (90 - ref) in _FIRST_QUADRANT
+    sin_sign = 1 if degrees <= 180 else -1
+    cos_sign = 1 if degrees <= 90 or degrees >= 270 else -1
+    sin, cos = _signed(sin_sign, sin), _signed(cos_sign, cos)
+    if tan is not None:
+        tan = _signed(sin_sign * cos_sign, tan)
+    if not exact:
+        sin, cos = sin._replace(exact=False), cos._replace(exact=False)
+        tan = tan and tan._replace(exact=False)
+    return SpecialAngle(float(degrees), _pi_text(degrees), sin, cos, tan)
+
+
+class Table:
+    """Special angles at multiples of π/n for the given divisors n, with sorted lookup arrays."""
+
+    def __init__(self, divisors):
+        self.divisors = tuple(sorted(set(divisors)))
+        steps = sorted({Fraction(180 * k, n) for n in self.divisors for k in range(2 * n)})
+        self.angles = tuple(special_angle(d) for d in steps)
+        self._degrees = np.array([a.degrees for a in self.angles])
+        self._inverse = {}
+        for function_type in ("arcsin", "arccos", "arctan"):
+            rows = sorted(self._inverse_rows(function_type, steps), key=lambda row: row.x.value)
+            self._inverse[function_type] = (np.array([row.x.value for row in rows]), tuple(rows))
+
+    def _inverse_rows(self, function_type, steps):
+        for angle, d in zip(self.angles, steps):
+            if function_type == "arccos":
+                if d <= 180:
+                    yield InverseRow(angle.cos, angle.degrees, angle.radians)
+                continue
+            principal = d if d <= 90 else d - 360
+            if not -90 <= principal <= 90 or (function_type == "arctan" and angle.tan is None):
+                continue
+            x = angle.sin if function_type == "arcsin" else angle.tan
+            yield InverseRow(x, float(principal), _pi_text(principal))
+
+    def nearest_angle(self, angle_deg):
+        """Index into angles of the special angle nearest to angle_deg (any real angle, or an array)."""
+        a = np.mod(np.asarray(angle_deg, dtype=float), 360.0)
+        n = len(self._degrees)
+        upper = np.searchsorted(self._degrees, a) % n
+        lower = (upper - 1) % n
+        # Circular distances, so 359° is next to 0°
+        d_upper = np.abs((self._degrees[upper] - a + 180) % 360 - 180)
+        d_lower = np.abs((self._degrees[lower] - a + 180) % 360 - 180)
+        return np.where(d_lower < d_upper, lower, upper)[()]
+
+    def match_angle(self, angle_deg, tolerance=1e-9):
+        """The SpecialAngle at angle_deg (a scalar, within tolerance degrees), or None."""
+        angle = self.angles[int(self.nearest_angle(angle_deg))]
+        distance = abs((angle.degrees - angle_deg + 180) % 360 - 180)
+        return angle if distance <= tolerance else None
+
+    def inverse_rows(self, function_type):
+        """The InverseRows of an inverse function, sorted by x."""
+        return self._inverse[function_type][1]
+
+    def nearest_value(self, function_type, x):
+        """Index into inverse_rows(function_type) of the row whose x is nearest to x (scalar or array)."""
+        xs = self._inverse[function_type][0]
+        x = np.asarray(x, dtype=float)
+        upper = np.clip(np.searchsorted(xs, x), 1, len(xs) - 1)
+        lower = upper - 1
+        return np.where(np.abs(x - xs[lower]) <= np.abs(xs[upper] - x), lower, upper)[()]
+
+    def match_value(self, function_type, x, tolerance):
+        """The InverseRow nearest to the scalar x if it is within tolerance, or None."""
+        row = self.inverse_rows(function_type)[int(self.nearest_value(function_type, x))]
+        return row if abs(row.x.value - x) <= tolerance else None
+
+
+_tables = {}
+
+
+def table(divisors=None):
+    """The Table for divisors (default: settings.SPECIAL_ANGLE_DIVISORS), built on first use."""
+    key = tuple(sorted(set(divisors or settings.SPECIAL_ANGLE_DIVISORS)))
+    if key not in _tables:
+        _tables[key] = Table(key)
+    return _tables[key]
+
+
+def nearest_angle(angle_deg):
+    """The SpecialAngle nearest to a scalar angle in degrees."""
+    t = table()
+    return t.angles[int(t.nearest_angle(angle_deg))]
+
+
+def nearest_value(function_type, x):
+    """The InverseRow of arcsin, arccos or arctan whose input is nearest to the scalar x."""
+    t = table()
+    return t.inverse_rows(function_type)[int(t.nearest_value(function_type, x))]
+
+
+def reference_rows(function_type):
+    """The rows of the Inverse Functions reference table, sorted by x."""
+    return table(REFERENCE_DIVISORS).inverse_rows(function_type)
+
+
+def reference_match(function_type, x):
+    """Index into reference_rows() of the row highlighted for input x, or None."""
+    t = table(REFERENCE_DIVISORS)
+    i = int(t.nearest_value(function_type, x))
+    return i if abs(t.inverse_rows(function_type)[i].x.value - x) <= REFERENCE_TOLERANCE else None
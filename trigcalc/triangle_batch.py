@@ -0,0 +1,312 @@
+"""Streaming triangle solver for CSV and Parquet files.
+
+Solves the same modes as the Triangle Calculator page over files of
+any size: the input is read in fixed-size chunks, each chunk is solved with
+the vectorized compute core and appended to the output, so memory use is
+bounded by the chunk size (times the number of chunks in flight when
+running with several worker processes).
+
+Input columns: ``angle`` (degrees), ``hypotenuse``, ``opposite``,
+``adjacent`` as the mode requires, plus an optional ``mode`` column holding
+one of the TRIANGLE_MODES per row. Rows that cannot be solved, including
+rows with cells that are not numbers, are kept and flagged in the
+``status`` column instead of stopping the run. Numeric input and result
+columns are written as floats in every chunk.
+
+General triangles are solved when the mode is one of the OBLIQUE_CASES, or
+per row from a ``case`` column: inputs ``a``, ``b``, ``c``, ``angle_a``,
+``angle_b``, ``angle_c`` as the case requires. Each row gets a
+``solutions`` count (0, 1 or 2); the second triangle of an ambiguous SSA row
+goes in the columns suffixed ``_2``.
+
+Usage::
+
+    python -m trigcalc.triangle_batch triangles.csv solved.parquet --mode "Two Sides" --workers 4
+    python -m trigcalc.triangle_batch general.csv solved.csv --mode SSA
+"""
+
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .compute import OBLIQUE_CASES, OBLIQUE_INPUTS, TRIANGLE_MODES, solve_oblique_triangle, solve_right_triangle
+
+INPUT_COLUMNS = ["angle", "hypotenuse", "opposite", "adjacent"]
+RESULT_COLUMNS = ["angle_a", "angle_b", "opposite", "adjacent", "hypotenuse", "area", "perimeter"]
+
+# mode -> input columns it reads
+MODE_INPUTS = {
+    "Angle and Hypotenuse": ["angle", "hypotenuse"],
+    "Two Sides": ["opposite", "adjacent"],
+    "Angle and Adjacent": ["angle", "adjacent"],
+    "Angle and Opposite": ["angle", "opposite"],
+}
+
+OBLIQUE_INPUT_COLUMNS = ["a", "b", "c", "angle_a", "angle_b", "angle_c"]
+OBLIQUE_FIELDS = OBLIQUE_INPUT_COLUMNS + ["area", "perimeter"]
+# First solution under the field names, the second suffixed _2
+OBLIQUE_RESULT_COLUMNS = OBLIQUE_FIELDS + [f"{name}_2" for name in OBLIQUE_FIELDS]
+
+STATUS_OK = "ok"
+STATUS_UNKNOWN_MODE = "unknown_mode"
+STATUS_MISSING_INPUT = "missing_input"
+STATUS_INVALID_INPUT = "invalid_input"
+STATUS_BAD_ANGLE = "angle_out_of_range"
+STATUS_BAD_SIDE = "non_positive_side"
+STATUS_NO_SOLUTION = "no_solution"
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+# Numeric columns of the output, always written as float64 so that the
+# format of a column does not depend on which chunk a row was read in
+NUMERIC_COLUMNS = list(dict.fromkeys(INPUT_COLUMNS + RESULT_COLUMNS + OBLIQUE_RESULT_COLUMNS))
+
+
+def _numeric_inputs(chunk, columns):
+    """(values, malformed) per input column: floats, NaN where empty or not a number, and the mask of the latter."""
+    n = len(chunk)
+    values, malformed = {}, {}
+    for name in columns:
+        if name in chunk:
+            numbers = pd.to_numeric(chunk[name], errors="coerce")
+            values[name] = numbers.to_numpy(dtype=float)
+            malformed[name] = (numbers.isna() & chunk[name].notna()).to_numpy()
+        else:
+            values[name] = np.full(n, np.nan)
+            malformed[name] = np.zeros(n, dtype=bool)
+    return values, malformed
+
+
+def _row_status(used, angle_limit, malformed):
+    """Status per row of the used input columns; angles must lie in (0, angle_limit)."""
+    n = len(next(iter(used.values())))
+    row_status = np.full(n, STATUS_OK, dtype=object)
+    for name, values in used.items():
+        if name.startswith("angle"):
+            row_status[~((values > 0) & (values < angle_limit))] = STATUS_BAD_ANGLE
+        else:
+            row_status[~(values > 0) | np.isinf(values)] = STATUS_BAD_SIDE
+    # NaN fails both range checks above; report it as missing instead
+    missing = np.zeros(n, dtype=bool)
+    for values in used.values():
+        missing |= np.isnan(values)
+    row_status[missing] = STATUS_MISSING_INPUT
+    invalid = np.zeros(n, dtype=bool)
+    for mask in malformed.values():
+        invalid |= mask
+    row_status[invalid] = STATUS_INVALID_INPUT
+    return row_status
+
+
+def solve_oblique_chunk(chunk, case=None):
+    """Solve one DataFrame chunk of general triangles; returns a frame of case, status, solutions and result columns."""
+    n = len(chunk)
+    if case is not None:
+        cases = np.full(n, case, dtype=object)
+    elif "case" in chunk:
+        cases = chunk["case"].to_numpy(dtype=object)
+    else:
+        raise ValueError("No triangle case given: pass case= or include a 'case' column")
+
+    inputs, malformed = _numeric_inputs(chunk, OBLIQUE_INPUT_COLUMNS)
+    results = {name: np.full(n, np.nan) for name in OBLIQUE_RESULT_COLUMNS}
+    solutions = np.zeros(n, dtype=np.int8)
+    status = np.full(n, STATUS_UNKNOWN_MODE, dtype=object)
+
+    for case_name in OBLIQUE_CASES:
+        rows = cases == case_name
+        if not rows.any():
+            continue
+        used = {name: inputs[name][rows] for name in OBLIQUE_INPUTS[case_name]}
+        row_status = _row_status(used, 180, {name: malformed[name][rows] for name in used})
+
+        valid = row_status == STATUS_OK
+        solved = solve_oblique_triangle(case_name, **{name: values[valid] for name, values in used.items()})
+        # Valid inputs that no triangle satisfies (triangle inequality, angle sum, short SSA side)
+        row_status[np.flatnonzero(valid)[solved.solutions == 0]] = STATUS_NO_SOLUTION
+        status[rows] = row_status
+
+        targets = np.flatnonzero(rows)[valid]
+        solutions[targets] = solved.solutions
+        for name in OBLIQUE_FIELDS:
+            values = getattr(solved, name)
+            results[name][targets] = values[:, 0]
+            results[f"{name}_2"][targets] = values[:, 1]
+
+    out = pd.DataFrame({"case": cases, "status": status, "solutions": solutions}, index=chunk.index)
+    for name in OBLIQUE_RESULT_COLUMNS:
+        out[name] = results[name]
+    return out
+
+
+def solve_chunk(chunk, mode=None):
+    """Solve one DataFrame chunk; returns a frame of mode, status and result columns.
+
+    A mode from OBLIQUE_CASES, or no mode and a 'case' column, solves
+    general triangles with solve_oblique_chunk instead.
+    """
+    if mode in OBLIQUE_CASES or (mode is None and "case" in chunk):
+        return solve_oblique_chunk(chunk, mode)
+    n = len(chunk)
+    if mode is not None:
+        modes = np.full(n, mode, dtype=object)
+    elif "mode" in chunk:
+        modes = chunk["mode"].to_numpy(dtype=object)
+    else:
+        raise ValueError("No triangle mode given: pass mode= or include a 'mode' column")
+
+    inputs, malformed = _numeric_inputs(chunk, INPUT_COLUMNS)
+    results = {name: np.full(n, np.nan) for name in RESULT_COLUMNS}
+    status = np.full(n, STATUS_UNKNOWN_MODE, dtype=object)
+
+    for mode_name in TRIANGLE_MODES:
+        rows = modes == mode_name
+        if not rows.any():
+            continue
+        used = {name: inputs[name][rows] for name in MODE_INPUTS[mode_name]}
+        row_status = _row_status(used, 90, {name: malformed[name][rows] for name in used})
+        status[rows] = row_status
+
+        valid = row_status == STATUS_OK
+        solved = solve_right_triangle(mode_name, **{name: values[valid] for name, values in used.items()})
+        targets = np.flatnonzero(rows)[valid]
+        for name in RESULT_COLUMNS:
+            results[name][targets] = getattr(solved, name)
+
+    out = pd.DataFrame({"mode": modes, "status": status}, index=chunk.index)
+    for name in RESULT_COLUMNS:
+        out[name] = results[name]
+    return out
+
+
+def _file_format(path, explicit=None):
+    if explicit:
+        return explicit
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".csv", ".txt", ".gz"):
+        return "csv"
+    raise ValueError(f"Cannot infer file format of {path!r}; pass it explicitly")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None):
+    """Yield DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if _file_format(path, file_format) == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+    pa = _import_pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+class ChunkWriter:
+    """Appends solved chunks to a CSV or Parquet file."""
+
+    def __init__(self, path, file_format=None):
+        self.path = path
+        self.format = _file_format(path, file_format)
+        self._parquet = None
+        self._wrote_header = False
+
+    def write(self, frame):
+        if self.format == "csv":
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+            return
+        pa = _import_pyarrow()
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pa.parquet.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table.cast(self._parquet.schema))
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+def _solve_and_join(chunk, mode):
+    solved = solve_chunk(chunk, mode)
+    # Input columns as the solver read them; cells that are not numbers
+    # become empty, and their rows are flagged invalid_input
+    chunk = chunk.assign(**{name: pd.to_numeric(chunk[name], errors="coerce").astype(float)
+                            for name in NUMERIC_COLUMNS if name in chunk})
+    # Recomputed side columns replace the inputs, except on flagged rows,
+    # which keep their original values for inspection
+    overlap = [c for c in chunk.columns if c in solved.columns]
+    for name in overlap:
+        if name in RESULT_COLUMNS or name in OBLIQUE_RESULT_COLUMNS:
+            solved[name] = solved[name].fillna(chunk[name])
+    return pd.concat([chunk.drop(columns=overlap), solved], axis=1)
+
+
+def solve_file(input_path, output_path, mode=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+               input_format=None, output_format=None):
+    """Solve every row of input_path into output_path; returns a summary dict.
+
+    With workers > 1 chunks are solved in a process pool; at most 2 * workers
+    chunks are in flight, and output order matches input order.
+    """
+    writer = ChunkWriter(output_path, output_format)
+    summary = {"rows": 0, "invalid": 0, "chunks": 0}
+
+    def record(frame):
+        writer.write(frame)
+        summary["rows"] += len(frame)
+        summary["invalid"] += int((frame["status"] != STATUS_OK).sum())
+        summary["chunks"] += 1
+
+    chunks = read_chunks(input_path, chunk_size, input_format)
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                record(_solve_and_join(chunk, mode))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_solve_and_join, chunk, mode))
+                    if len(pending) >= 2 * workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        writer.close()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve right or general triangles from a CSV or Parquet file.")
+    parser.add_argument("input", help="input .csv or .parquet file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--mode", choices=TRIANGLE_MODES + OBLIQUE_CASES,
+                        help="mode or general-triangle case for every row "
+                             "(default: read the per-row 'mode' or 'case' column)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    summary = solve_file(args.input, args.output, mode=args.mode,
+                         chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Solved {summary['rows']} rows in {summary['chunks']} chunks "
+          f"({summary['invalid']} flagged invalid)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Pre-render every state of the pages with small, finite inputs.
+
+The Basic Trig (49 angles), Unit Circle (73 angles × 2 × 2 checkboxes) and
+Inverse Functions (201 slider positions per function) pages have few enough
+widget states to render them all ahead of time. warm() renders the states
+that are not yet in the disk cache across a process pool and writes each
+one as soon as it is done, so an interrupted warm-up resumes where it
+stopped and a new server process starts with every state on disk.
+
+Workers are limited to a fraction of the CPUs and run at a lower priority,
+so a warm-up running next to a live server does not starve its sessions.
+
+Usage::
+
+    python -m trigcalc.warmup --cache-dir /var/cache/trigcalc --cpu-budget 0.5
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import encoding, page_states, settings
+from .render_cache import make_key, open_disk_cache
+
+# Sidebar titles of the pages warm() covers -> their page modules
+PAGES = {"Basic Trig Functions": "basic_trig", "Unit Circle Explorer": "unit_circle",
+         "Inverse Functions": "inverse"}
+
+# States rendered per task, so each worker reuses its figures for a while
+CHUNK_SIZE = 16
+
+
+def states(pages=None):
+    """(page title, params) for every widget state of pages, with params as the pages key the render cache."""
+    return [(page, params) for page in pages or list(PAGES) for params in page_states.states(page)]
+
+
+def state_encoding(page):
+    """The Encoding a page uses for clients without viewport hints, which the warm-up renders."""
+    return encoding.for_page(PAGES[page])
+
+
+def state_key(page, params):
+    """Render-cache key of a page state, as the page's render_figure() forms it."""
+    return make_key(page, {**params, **state_encoding(page).key()})
+
+
+def render_state(page, params):
+    """Encoded figure of one page state, drawn exactly as the page draws it."""
+    from . import plots
+
+    if page == "Basic Trig Functions":
+        return plots.render_basic_trig(params["angle_deg"])
+    if page == "Unit Circle Explorer":
+        return plots.render_unit_circle(params["angle_deg"], params["show_reference"], params["show_quadrants"])
+    if page == "Inverse Functions":
+        return plots.render_inverse(params["function_type"], params["input_val"])
+    raise ValueError(f"Page {page!r} has no finite state space to warm")
+
+
+_disk = None
+
+
+def _init_worker(directory, niceness):
+    global _disk
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    _disk = open_disk_cache(directory, settings.RENDER_CACHE_DIR_MB * 1024 * 1024)
+
+
+def _render_chunk(chunk):
+    for page, params in chunk:
+        with encoding.use(state_encoding(page)):
+            _disk.put(state_key(page, params), render_state(page, params))
+    return len(chunk)
+
+
+def workers_for_budget(cpu_budget):
+    """Worker processes allowed by cpu_budget, a fraction of this machine's CPUs."""
+    return max(1, int((os.cpu_count() or 1) * cpu_budget))
+
+
+class Progress:
+    """States done out of the total, readable from other threads while warm() runs."""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.skipped = 0
+        self.running = False
+        self.error = None
+
+
+def warm(directory, pages=None, cpu_budget=0.5, workers=None, niceness=10, progress=None, report=None):
+    """Render the missing states of pages into the disk cache at directory; returns a summary dict.
+
+    report(progress), if given, is called after every finished chunk.
+    """
+    progress = progress or Progress()
+    disk = open_disk_cache(directory)
+    todo = [state for state in states(pages) if state_key(*state) not in disk]
+    progress.total = len(states(pages))
+    progress.skipped = progress.done = progress.total - len(todo)
+    progress.running = True
+    workers = workers or workers_for_budget(cpu_budget)
+    start = time.perf_counter()
+    try:
+        if todo:
+            chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+            # spawn: forking a threaded server process is unsafe
+            with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker, initargs=(directory, niceness)) as pool:
+                for future in as_completed([pool.submit(_render_chunk, chunk) for chunk in chunks]):
+                    progress.done += future.result()
+                    if report:
+                        report(progress)
+    except BaseException as e:
+        progress.error = repr(e)
+        raise
+    finally:
+        progress.running = False
+    return {"total": progress.total, "rendered": len(todo), "skipped": progress.skipped,
+            "workers": workers, "seconds": time.perf_counter() - start, "directory": disk.directory}
+
+
+def warm_in_background(directory, cpu_budget=0.5, pages=None):
+    """Run warm() in a daemon thread; returns its Progress."""
+    progress = Progress()
+
+    def run():
+        try:
+            warm(directory, pages, cpu_budget, progress=progress)
+        except Exception:
+            pass  # recorded in progress.error; the app keeps rendering on demand
+
+    threading.Thread(target=run, name="trig-warmup", daemon=True).start()
+    return progress
+
+
+def _print_progress(progress):
+    print(f"\r{progress.done:5}/{progress.total} states", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", default=settings.RENDER_CACHE_DIR, required=settings.RENDER_CACHE_DIR is None,
+                        help="disk cache directory (default: TRIG_RENDER_CACHE_DIR)")
+    parser.add_argument("--page", action="append", choices=PAGES,
+                        help="page to warm (repeatable; default: all pages listed above)")
+    parser.add_argument("--cpu-budget", type=float, default=settings.WARMUP_CPU_BUDGET,
+                        help="fraction of the CPUs to use for workers (default: TRIG_WARMUP_CPU_BUDGET)")
+    parser.add_argument("--workers", type=int, help="worker processes (overrides --cpu-budget)")
+    parser.add_argument("--niceness", type=int, default=10, help="priority decrease of the workers (default: 10)")
+    args = parser.parse_args(argv)
+
+    summary = warm(args.cache_dir, args.page, args.cpu_budget, args.workers, args.niceness,
+                   report=_print_progress)
+    print(file=sys.stderr)
+    print(f"{summary['rendered']} states rendered, {summary['skipped']} already cached, "
+          f"{summary['workers']} workers, {summary['seconds']:.1f}s -> {summary['directory']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())